@@ -0,0 +1,111 @@
+"""
+Benchmark of the cascade mode against plain character-level Faerie.
+
+Reports the time of the region filter alone, of the cascade (filter and
+Faerie on the regions) and of Faerie on the whole documents, the share of
+tokens kept by the filter, and whether both return the same matches, on
+three kinds of synthetic text:
+
+    - sparse: words of other letters than the entities, q = 2. Few tokens hit
+      the dictionary, and Faerie skips the others at no cost anyway.
+    - scattered: words of the entity letters, longer entities, q = 3. Many
+      tokens hit the dictionary, but too few per window for a candidate.
+    - dense: as scattered, but q = 2, so that almost every window qualifies.
+
+    python benchmarks/cascade.py --entities 5000 --docs 20 --doc-len 2000
+
+"""
+
+import time
+import random
+import string
+import argparse
+import logging
+
+from nemex import Nemex
+
+
+SCENARIOS = {
+    # entity letters, entity lengths, filler letters, q
+    "sparse": (string.ascii_lowercase[13:], (4, 9), string.ascii_lowercase[:13], 2),
+    "scattered": (string.ascii_lowercase, (10, 20), string.ascii_lowercase, 3),
+    "dense": (string.ascii_lowercase, (10, 20), string.ascii_lowercase, 2),
+}
+
+
+def make_data(n_entities: int, n_docs: int, doc_len: int, scenario: str, seed: int):
+    rng = random.Random(seed)
+    letters, (min_len, max_len), filler, q = SCENARIOS[scenario]
+
+    entities = ["".join(rng.choices(letters, k=rng.randint(min_len, max_len))) for _ in range(n_entities)]
+
+    docs = list()
+    for _ in range(n_docs):
+        words = ["".join(rng.choices(filler, k=rng.randint(2, 8))) for _ in range(doc_len // 5)]
+
+        # plant (noisy) entities
+        for _ in range(doc_len // 200):
+            entity = list(rng.choice(entities))
+            if rng.random() < 0.5:
+                entity[rng.randrange(len(entity))] = rng.choice(string.ascii_lowercase)
+            words.insert(rng.randrange(len(words)), "".join(entity))
+
+        docs.append(" ".join(words)[:doc_len])
+
+    return entities, docs, q
+
+
+def run(nemex: Nemex, docs: list):
+    T = time.perf_counter()
+    matches = [sorted((m["entity"][1], m["span"][0], m["span"][1]) for m in nemex(doc)["matches"]) for doc in docs]
+
+    return matches, time.perf_counter() - T
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entities", type=int, default=5000)
+    parser.add_argument("--docs", type=int, default=20)
+    parser.add_argument("--doc-len", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    settings = [
+        ("edit_sim", dict(similarity="edit_sim", t=0.9)),
+        ("edit_dist", dict(similarity="edit_dist", t=1)),
+    ]
+
+    print("{:>9} {:>10} {:>8} {:>10} {:>10} {:>10} {:>8} {:>6}".format(
+        "text", "similarity", "kept", "filter(s)", "cascade(s)", "faerie(s)", "speedup", "same"
+    ))
+
+    for scenario in SCENARIOS:
+        entities, docs, q = make_data(args.entities, args.docs, args.doc_len, scenario, args.seed)
+
+        for name, kwargs in settings:
+            faerie = Nemex(entities, q=q, **kwargs)
+            cascade = Nemex(entities, q=q, cascade=True, **kwargs)
+
+            doc_tokens = [cascade.tokenizer.tokenize(doc) for doc in docs]
+
+            T = time.perf_counter()
+            regions = [cascade.region_filter(tokens) for tokens in doc_tokens]
+            filter_time = time.perf_counter() - T
+
+            kept = sum(end - start for r in regions for start, end in r) / max(sum(map(len, doc_tokens)), 1)
+
+            expected, faerie_time = run(faerie, docs)
+            computed, cascade_time = run(cascade, docs)
+
+            print("{:>9} {:>10} {:>8.1%} {:>10.3f} {:>10.3f} {:>10.3f} {:>7.2f}x {:>6}".format(
+                scenario, name, kept, filter_time, cascade_time, faerie_time,
+                faerie_time / cascade_time, str(expected == computed)
+            ))
+
+    return
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,133 @@
+"""
+Load generator for the extraction server (nemex/server.py).
+
+Keeps a number of concurrent keep-alive connections busy with extraction
+requests for a fixed duration, and reports the throughput and the latency
+percentiles of successful requests as well as the rejected (503) ones:
+
+    python -m nemex.server entities.txt --port 8000 --processes 4
+    python benchmarks/load_generator.py --port 8000 --concurrency 64 --duration 10
+
+Documents are read from a file (one per line) or generated at random.
+
+"""
+
+import json
+import time
+import random
+import asyncio
+import argparse
+
+
+def make_documents(n_docs: int, doc_len: int, seed: int) -> list:
+    rng = random.Random(seed)
+    words = ["".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(2, 9))) for _ in range(2000)]
+
+    return [" ".join(rng.choices(words, k=doc_len)) for _ in range(n_docs)]
+
+
+async def request(reader, writer, body: bytes) -> int:
+    writer.write(
+        "POST /extract HTTP/1.1\r\nContent-Type: application/json\r\nContent-Length: {}\r\n\r\n".format(
+            len(body)
+        ).encode("latin-1") + body
+    )
+    await writer.drain()
+
+    status = int((await reader.readline()).split()[1])
+    length = 0
+
+    while True:
+        line = await reader.readline()
+
+        if line in (b"\r\n", b"\n", b""):
+            break
+
+        key, value = line.decode("latin-1").split(":", 1)
+        if key.strip().lower() == "content-length":
+            length = int(value)
+
+    await reader.readexactly(length)
+
+    return status
+
+
+async def client(args, documents: list, deadline: float, latencies: list, statuses: dict, seed: int):
+    rng = random.Random(seed)
+
+    if args.unix:
+        reader, writer = await asyncio.open_unix_connection(args.unix)
+    else:
+        reader, writer = await asyncio.open_connection(args.host, args.port)
+
+    while time.perf_counter() < deadline:
+        body = json.dumps({"document": rng.choice(documents)}).encode("utf-8")
+
+        T = time.perf_counter()
+        status = await request(reader, writer, body)
+        T = time.perf_counter() - T
+
+        statuses[status] = statuses.get(status, 0) + 1
+        if status == 200:
+            latencies.append(T)
+
+    writer.close()
+
+    return
+
+
+def percentile(values: list, p: float) -> float:
+    values = sorted(values)
+
+    return values[min(int(len(values) * p / 100), len(values) - 1)]
+
+
+async def run(args):
+    if args.documents:
+        with open(args.documents, encoding="utf-8") as rf:
+            documents = [line.strip() for line in rf if line.strip()]
+    else:
+        documents = make_documents(args.n_docs, args.doc_len, args.seed)
+
+    latencies = list()
+    statuses = dict()
+    deadline = time.perf_counter() + args.duration
+
+    T = time.perf_counter()
+    await asyncio.gather(*(
+        client(args, documents, deadline, latencies, statuses, args.seed + k) for k in range(args.concurrency)
+    ))
+    T = time.perf_counter() - T
+
+    print("requests: {} in {:.1f}s ({:.1f} req/s), status codes: {}".format(
+        sum(statuses.values()), T, len(latencies) / T, statuses
+    ))
+
+    if latencies:
+        print("latency ms: p50 {:.2f}  p95 {:.2f}  p99 {:.2f}  max {:.2f}".format(
+            *(1000 * percentile(latencies, p) for p in (50, 95, 99, 100))
+        ))
+
+    return
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--unix", default=None, help="Unix socket path (instead of TCP).")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--documents", default=None, help="File with one document per line.")
+    parser.add_argument("--n-docs", type=int, default=200)
+    parser.add_argument("--doc-len", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    asyncio.run(run(args))
+
+    return
+
+
+if __name__ == "__main__":
+    main()
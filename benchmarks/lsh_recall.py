@@ -0,0 +1,87 @@
+"""
+Benchmark of the MinHash-LSH engine against exact Faerie.
+
+Reports, for several (bands, rows) settings, the recall of valid matches
+and the throughput of the "lsh" engine compared to Faerie on a synthetic
+Zipf-distributed vocabulary:
+
+    python benchmarks/lsh_recall.py --entities 20000 --docs 50 --t 0.7
+
+"""
+
+import time
+import random
+import argparse
+import logging
+
+from nemex import Nemex, Pruner
+
+
+def make_data(n_entities: int, n_docs: int, doc_len: int, vocab_size: int, seed: int):
+    rng = random.Random(seed)
+    vocab = ["w{}".format(i) for i in range(vocab_size)]
+    weights = [1 / (i + 1) for i in range(vocab_size)]
+
+    entities = [" ".join(rng.choices(vocab, weights, k=rng.randint(2, 6))) for _ in range(n_entities)]
+
+    docs = list()
+    for _ in range(n_docs):
+        words = rng.choices(vocab, weights, k=doc_len)
+
+        # plant (noisy) entities
+        for _ in range(doc_len // 20):
+            entity = rng.choice(entities).split()
+            if rng.random() < 0.5:
+                entity[rng.randrange(len(entity))] = rng.choice(vocab)
+            pos = rng.randrange(doc_len)
+            words[pos:pos] = entity
+
+        docs.append(" ".join(words))
+
+    return entities, docs
+
+
+def run(nemex: Nemex, docs: list):
+    T = time.time()
+    matches = set()
+
+    for d, doc in enumerate(docs):
+        for m in nemex(doc)["matches"]:
+            matches.add((d, m["entity"][1], m["span"][0], m["span"][1]))
+
+    return matches, time.time() - T
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entities", type=int, default=5000)
+    parser.add_argument("--docs", type=int, default=20)
+    parser.add_argument("--doc-len", type=int, default=200)
+    parser.add_argument("--vocab", type=int, default=20000)
+    parser.add_argument("--similarity", default="jaccard")
+    parser.add_argument("--t", type=float, default=0.7)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--settings", default="8x4,16x4,32x4,16x2,32x8")
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+
+    entities, docs = make_data(args.entities, args.docs, args.doc_len, args.vocab, args.seed)
+    kwargs = dict(char=False, similarity=args.similarity, t=args.t)
+
+    # lazy count pruning reports all valid matches
+    expected, T = run(Nemex(entities, pruner=Pruner.LAZY_COUNT, **kwargs), docs)
+    print("{:>10} {:>8} {:>10} {:>10}".format("engine", "recall", "docs/s", "matches"))
+    print("{:>10} {:>8.3f} {:>10.1f} {:>10}".format("faerie", 1.0, len(docs) / T, len(expected)))
+
+    for setting in args.settings.split(","):
+        bands, rows = map(int, setting.split("x"))
+        computed, T = run(Nemex(entities, engine="lsh", bands=bands, rows=rows, **kwargs), docs)
+        recall = len(computed & expected) / max(len(expected), 1)
+        print("{:>10} {:>8.3f} {:>10.1f} {:>10}".format(setting, recall, len(docs) / T, len(computed)))
+
+    return
+
+
+if __name__ == '__main__':
+    main()
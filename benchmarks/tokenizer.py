@@ -0,0 +1,101 @@
+"""
+Benchmark of the tokenizer throughput.
+
+Reports the throughput (MB/s of input) of Tokenizer.normalize, tokenize and
+tokenize_offsets on an ASCII and on a mixed corpus (mostly ASCII, with some
+accented, Greek and Cyrillic words), next to the reference of lower casing,
+replacing spaces and slicing q-grams one by one, and of tokenize with accent
+stripping and whitespace collapsing ("folding"):
+
+    python benchmarks/tokenizer.py --docs 200 --doc-len 1000 --q 2
+
+"""
+
+import time
+import random
+import argparse
+
+from nemex import Tokenizer
+
+
+def make_corpus(n_docs: int, doc_len: int, mixed: float, seed: int) -> list:
+    rng = random.Random(seed)
+    words = ["".join(rng.choices("abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ", k=rng.randint(2, 9)))
+             for _ in range(5000)]
+    others = ["Café", "Müller", "Ångström", "naïve", "Straße", "Ελλάδα", "Москва", "İstanbul", "Łódź", "résumé"]
+
+    docs = list()
+    for _ in range(n_docs):
+        doc = [rng.choice(others) if rng.random() < mixed else rng.choice(words) for _ in range(doc_len)]
+        docs.append(" ".join(doc))
+
+    return docs
+
+
+def reference(tokenizer: Tokenizer):
+    def tokenize(string: str) -> list:
+        string = string.lower()
+
+        if tokenizer.char:
+            string = string.replace(" ", tokenizer.special_char)
+            return [string[i:i+tokenizer.q] for i in range(len(string) - tokenizer.q + 1)]
+
+        return string.split()
+
+    return tokenize
+
+
+def throughput(function, docs: list, repeat: int) -> float:
+    size = sum(len(doc.encode("utf-8")) for doc in docs) / 2 ** 20
+    best = float("inf")
+
+    for _ in range(repeat):
+        T = time.perf_counter()
+        for doc in docs:
+            function(doc)
+        best = min(best, time.perf_counter() - T)
+
+    return size / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=200)
+    parser.add_argument("--doc-len", type=int, default=1000)
+    parser.add_argument("--q", type=int, default=2)
+    parser.add_argument("--mixed", type=float, default=0.05, help="share of non-ASCII words of the mixed corpus")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    corpora = {
+        "ascii": make_corpus(args.docs, args.doc_len, 0.0, args.seed),
+        "mixed": make_corpus(args.docs, args.doc_len, args.mixed, args.seed),
+    }
+
+    print("{:>8} {:>6} {:>20} {:>10}".format("corpus", "level", "function", "MB/s"))
+
+    for name, docs in corpora.items():
+        for char in (True, False):
+            tokenizer = Tokenizer(char=char, q=args.q)
+            folding = Tokenizer(char=char, q=args.q, strip_accents=True, collapse_whitespace=True)
+            level = "char" if char else "token"
+
+            functions = [
+                ("reference", reference(tokenizer)),
+                ("normalize", tokenizer.normalize),
+                ("tokenize", tokenizer.tokenize),
+                ("tokenize_offsets", tokenizer.tokenize_offsets),
+                ("tokenize (folding)", folding.tokenize),
+            ]
+
+            for label, function in functions:
+                print("{:>8} {:>6} {:>20} {:>10.1f}".format(
+                    name, level, label, throughput(function, docs, args.repeat)
+                ))
+
+    return
+
+
+if __name__ == '__main__':
+    main()
@@ -10,9 +10,21 @@ from .pruning import (
     BucketCountPruning, BatchCountPruning
 )
 
-from .utils import Tokenizer, Pruner, Sim
+from .utils import Tokenizer, Pruner, Sim, Engine
 from .similarities import Similarity, Verify
 from .defaults import Default
 
 from .faerie import Faerie
+from .sharding import ShardedFaerie
+from .deletion import DeletionNeighborhood
+from .segment import SegmentIndex
+from .trie import TrieIndex
+from .exact import AhoCorasick
+from .lsh import MinHashLSH
+from .cascade import RegionFilter
+from .join import similarity_join
+from .corpus import CorpusIndex
+from .cache import ResultCache
+from .columns import MatchColumns
 from .nemex import Nemex
+from .stream import NemexStream
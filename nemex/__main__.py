@@ -0,0 +1,27 @@
+"""
+Command line entry point.
+
+    python -m nemex run entities.txt corpus/ --out results/
+
+"""
+
+import sys
+
+from nemex import runner
+
+
+COMMANDS = {"run": runner.main}
+
+
+def main(argv: list = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+
+    if not argv or argv[0] not in COMMANDS:
+        print("usage: python -m nemex {{{}}} ...".format(",".join(sorted(COMMANDS))), file=sys.stderr)
+        return 2
+
+    return COMMANDS[argv[0]](argv[1:])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,272 @@
+"""
+Cache module.
+
+Classes:
+    - ResultCache
+
+Functions:
+    - sentence_spans
+
+"""
+
+import re
+import sys
+import hashlib
+import logging
+import collections
+
+from nemex import Default
+
+
+logger = logging.getLogger(__name__)
+
+# sentence boundaries: whitespace after sentence punctuation, or line breaks
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+|\s*\n\s*")
+
+
+def sentence_spans(text: str) -> list:
+    """Splits a text into sentences.
+
+    Parameters
+    ----------
+    text : str
+        Text.
+
+    Returns
+    -------
+    List of (start, end) character offsets of the sentences.
+
+    """
+
+    spans = list()
+    start = 0
+
+    for boundary in SENTENCE_BOUNDARY.finditer(text):
+        if boundary.start() > start:
+            spans.append((start, boundary.start()))
+        start = boundary.end()
+
+    if start < len(text):
+        spans.append((start, len(text)))
+
+    return spans
+
+
+class ResultCache:
+    """Size-bounded cache of match lists, keyed by a hash of the model
+    configuration and the normalized document (see :meth:`~nemex.nemex.Nemex.__call__`).
+
+    With "sentence" granularity, documents are extracted and cached sentence by
+    sentence, so that documents sharing only some sentences benefit as well.
+    Then, matches spanning a sentence boundary are not found.
+
+    Parameters
+    ----------
+    max_entries : int, optional
+        Maximal number of entries.
+    max_bytes : int, optional
+        Maximal (estimated) size of the cached match lists in bytes.
+    policy : str, optional
+        Eviction policy, "lru" (least recently used) or "fifo" (first in, first out).
+    granularity : str, optional
+        Unit of caching, "document" or "sentence".
+
+    """
+
+    POLICIES = ("lru", "fifo")
+    GRANULARITIES = ("document", "sentence")
+
+    def __init__(self,
+                 max_entries: int = Default.CACHE_ENTRIES,
+                 max_bytes: int = Default.CACHE_BYTES,
+                 policy: str = "lru",
+                 granularity: str = "document"
+                 ) -> None:
+
+        if policy not in self.POLICIES:
+            raise ValueError("Unknown eviction policy '{}', use one of {}.".format(policy, self.POLICIES))
+
+        if granularity not in self.GRANULARITIES:
+            raise ValueError("Unknown granularity '{}', use one of {}.".format(granularity, self.GRANULARITIES))
+
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.granularity = granularity
+
+        # key -> (match list, size)
+        self.entries = collections.OrderedDict()
+        self.nbytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        return
+
+    @staticmethod
+    def key(fingerprint: bytes, text: str, valid_only: bool) -> bytes:
+        """Hashes a normalized text for a model.
+
+        Parameters
+        ----------
+        fingerprint : bytes
+            Fingerprint of the model configuration and dictionary.
+        text : str
+            Normalized text.
+        valid_only : bool
+            Output option.
+
+        Returns
+        -------
+        Cache key.
+
+        """
+
+        digest = hashlib.blake2b(text.encode("utf-8", "surrogatepass"), digest_size=16, key=fingerprint[:64])
+        digest.update(b"\x01" if valid_only else b"\x00")
+
+        return digest.digest()
+
+    @staticmethod
+    def sizeof(obj) -> int:
+        """Estimates the memory of a match list.
+
+        Parameters
+        ----------
+        obj :
+            Match list, or one of its values.
+
+        Returns
+        -------
+        Size in bytes.
+
+        """
+
+        size = sys.getsizeof(obj)
+
+        if isinstance(obj, dict):
+            size += sum(ResultCache.sizeof(value) for value in obj.values())
+        elif isinstance(obj, (list, tuple)):
+            size += sum(ResultCache.sizeof(value) for value in obj)
+
+        return size
+
+    @staticmethod
+    def copy(matches: list, offset: int = 0) -> list:
+        """Copies a match list, optionally shifting its spans.
+
+        Parameters
+        ----------
+        matches : list
+            Match list.
+        offset : int
+            Offset added to spans.
+
+        Returns
+        -------
+        Match list.
+
+        """
+
+        return [
+            dict(match, entity=list(match["entity"]), span=[match["span"][0] + offset, match["span"][1] + offset])
+            for match in matches
+        ]
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, key: bytes) -> bool:
+        return key in self.entries
+
+    def get(self, key: bytes):
+        """Looks a match list up.
+
+        Parameters
+        ----------
+        key : bytes
+            Cache key.
+
+        Returns
+        -------
+        Match list, or None if not cached.
+
+        """
+
+        entry = self.entries.get(key)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+
+        if self.policy == "lru":
+            self.entries.move_to_end(key)
+
+        return entry[0]
+
+    def put(self, key: bytes, matches: list):
+        """Caches a match list, evicting entries beyond the size bounds.
+
+        Parameters
+        ----------
+        key : bytes
+            Cache key.
+        matches : list
+            Match list (not copied).
+
+        """
+
+        size = self.sizeof(matches) + sys.getsizeof(key)
+
+        # larger than the whole cache
+        if size > self.max_bytes:
+            return
+
+        if key in self.entries:
+            self.nbytes -= self.entries.pop(key)[1]
+
+        self.entries[key] = (matches, size)
+        self.nbytes += size
+
+        while len(self.entries) > self.max_entries or self.nbytes > self.max_bytes:
+            _, (_, evicted_size) = self.entries.popitem(last=False)
+            self.nbytes -= evicted_size
+            self.evictions += 1
+
+        return
+
+    def clear(self):
+        """Removes all entries (statistics are kept)."""
+
+        self.entries.clear()
+        self.nbytes = 0
+
+        return
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+
+        return self.hits / lookups if lookups else 0.0
+
+    @property
+    def stats(self) -> dict:
+        """Returns the cache statistics.
+
+        Returns
+        -------
+        Dictionary with hits, misses, hit rate, evictions, entries and bytes.
+
+        """
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hit_rate,
+            "evictions": self.evictions,
+            "entries": len(self.entries),
+            "bytes": self.nbytes,
+        }
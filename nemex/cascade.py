@@ -0,0 +1,216 @@
+"""
+Cascade module.
+
+Classes:
+    - RegionFilter
+
+"""
+
+import logging
+import collections
+
+from nemex import EntitiesDictionary, InvertedIndex
+
+
+logger = logging.getLogger(__name__)
+
+
+class RegionFilter:
+    """Coarse filter of the document regions that can hold Faerie candidates.
+
+    A candidate of entity e is at most Te tokens long and holds at least Tl
+    tokens of e, one of which is in the prefix of e (see
+    :class:`~nemex.data.InvertedIndex`). So, the window of Te tokens starting
+    with the candidate holds at least Tl dictionary tokens and a prefix token,
+    and the union of all such windows holds all candidates.
+
+    Entities are grouped by length, and each group checks windows with its
+    own maximal Te, minimal Tl, tokens and prefix tokens, which is much
+    tighter than global bounds. A document is scanned once for the positions
+    of dictionary tokens, and each group then derives its qualifying windows
+    from runs of Tl hit positions and from its prefix hit positions, so the
+    cost follows the number of hits instead of the document length.
+
+    Parameters
+    ----------
+    entities_dict : :class:`~nemex.data.EntitiesDictionary`
+        Instance of entities dictionary with computed bounds.
+
+    """
+
+    def __init__(self, entities_dict: EntitiesDictionary) -> None:
+
+        buckets = collections.defaultdict(list)
+
+        for e_idx in entities_dict:
+            buckets[len(entities_dict[e_idx])].append(e_idx)
+
+        # list of (max Te, min Tl)
+        self.groups = list()
+
+        # mapping from token to the groups holding it, and to those holding it in a prefix
+        self.token2groups = collections.defaultdict(list)
+        self.prefix2groups = collections.defaultdict(list)
+
+        for g, bucket in enumerate(sorted(buckets)):
+            members = entities_dict.subset(buckets[bucket])
+            prefix_index = InvertedIndex.from_entities_dict(members, prefix_filter=True)
+
+            # (a prefix hit is a hit, so at least one hit is needed)
+            self.groups.append((
+                max(members[e_idx].Te for e_idx in members),
+                max(min(members[e_idx].Tl for e_idx in members), 1)
+            ))
+
+            for token in {token for e_idx in members for token in members[e_idx].tokens}:
+                self.token2groups[token].append(g)
+
+            for token in prefix_index.token2entities:
+                self.prefix2groups[token].append(g)
+
+        self.token2groups = dict(self.token2groups)
+        self.prefix2groups = dict(self.prefix2groups)
+
+        logger.info("Cascade filter with {} entity length groups".format(len(self.groups)))
+
+        return
+
+    @staticmethod
+    def intersect(a: list, b: list) -> list:
+        """Intersects two sorted lists of disjoint closed intervals.
+
+        Parameters
+        ----------
+        a : list
+            Sorted [start, end] intervals.
+        b : list
+            Sorted [start, end] intervals.
+
+        Returns
+        -------
+        Sorted list of [start, end] intervals.
+
+        """
+
+        intervals = list()
+        i = k = 0
+
+        while i < len(a) and k < len(b):
+            start = a[i][0] if a[i][0] > b[k][0] else b[k][0]
+            end = a[i][1] if a[i][1] < b[k][1] else b[k][1]
+
+            if start <= end:
+                intervals.append((start, end))
+
+            if a[i][1] < b[k][1]:
+                i += 1
+            else:
+                k += 1
+
+        return intervals
+
+    def windows(self, hits: list, prefix_hits: list, window: int, min_hits: int, n: int) -> list:
+        """Finds the starts of the windows of a group that hold at least min_hits
+        hits and a prefix hit.
+
+        Parameters
+        ----------
+        hits : list
+            Sorted positions of group tokens.
+        prefix_hits : list
+            Sorted positions of group prefix tokens.
+        window : int
+            Window length (maximal Te).
+        min_hits : int
+            Minimal number of hits (minimal Tl).
+        n : int
+            Number of document tokens.
+
+        Returns
+        -------
+        Sorted list of [start, end] intervals of window starts.
+
+        """
+
+        # windows start up to n - window (or at 0 in shorter documents)
+        last = max(n - window, 0)
+
+        # starts of windows holding min_hits consecutive hits
+        starts = list()
+        for a in range(len(hits) - min_hits + 1):
+            first, final = hits[a], hits[a + min_hits - 1]
+
+            if final - first < window:
+                start, end = max(final - window + 1, 0), min(first, last)
+
+                if starts and start <= starts[-1][1] + 1:
+                    starts[-1][1] = max(starts[-1][1], end)
+                elif start <= end:
+                    starts.append([start, end])
+
+        # starts of windows holding a prefix hit
+        prefixed = list()
+        for position in prefix_hits:
+            start, end = max(position - window + 1, 0), min(position, last)
+
+            if prefixed and start <= prefixed[-1][1] + 1:
+                prefixed[-1][1] = max(prefixed[-1][1], end)
+            elif start <= end:
+                prefixed.append([start, end])
+
+        return self.intersect(starts, prefixed)
+
+    def __call__(self, doc_tokens: list) -> list:
+        """Finds the document regions that can hold candidates.
+
+        Parameters
+        ----------
+        doc_tokens : list
+            Document tokens.
+
+        Returns
+        -------
+        Sorted list of disjoint [start, end) token ranges.
+
+        """
+
+        n = len(doc_tokens)
+
+        # positions of the tokens and prefix tokens of each group
+        hits = [list() for _ in self.groups]
+        prefix_hits = [list() for _ in self.groups]
+
+        for position, token in enumerate(doc_tokens):
+            groups = self.token2groups.get(token)
+
+            if groups is None:
+                continue
+
+            for g in groups:
+                hits[g].append(position)
+
+            for g in self.prefix2groups.get(token, ()):
+                prefix_hits[g].append(position)
+
+        # union of the windows of all groups
+        ranges = list()
+
+        for g, (window, min_hits) in enumerate(self.groups):
+            # no window can qualify
+            if len(hits[g]) < min_hits or not prefix_hits[g]:
+                continue
+
+            for first, final in self.windows(hits[g], prefix_hits[g], window, min_hits, n):
+                ranges.append((first, min(final + window, n)))
+
+        ranges.sort()
+        regions = list()
+
+        for start, end in ranges:
+            if regions and start <= regions[-1][1]:
+                if end > regions[-1][1]:
+                    regions[-1] = (regions[-1][0], end)
+            else:
+                regions.append((start, end))
+
+        return regions
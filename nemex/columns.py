@@ -0,0 +1,206 @@
+"""
+Columns module.
+
+Classes:
+    - MatchColumns
+
+"""
+
+import logging
+
+
+logger = logging.getLogger(__name__)
+
+
+class MatchColumns:
+    """Match list of a document as parallel columns.
+
+    Instead of a dictionary per match (see :meth:`~nemex.nemex.Nemex.output`),
+    matches are kept in parallel lists of entity indexes, entity ids, character
+    spans in the document string, scores and validity. Match strings and entity
+    texts are materialized on demand (see :meth:`match` and :meth:`entity_text`),
+    and indexing or iterating yields the dictionaries of the default output.
+
+    Parameters
+    ----------
+    document : str
+        Document string of the output, which spans refer to.
+    entity_repr : callable
+        Maps an entity index to its text (see :meth:`~nemex.nemex.Nemex.entity_repr`).
+
+    """
+
+    def __init__(self, document: str, entity_repr) -> None:
+        self.document = document
+        self.entity_repr = entity_repr
+
+        self.entity = list()
+        self.uid = list()
+        self.start = list()
+        self.end = list()
+        self.score = list()
+        self.valid = list()
+
+        return
+
+    @classmethod
+    def from_output(cls, output: dict, entity_repr, uid2idx: dict):
+        """Builds the columns of an output of dictionaries.
+
+        Parameters
+        ----------
+        output : dict
+            Dictionary with document and match list.
+        entity_repr : callable
+            Maps an entity index to its text.
+        uid2idx : dict
+            Mapping from entity id to entity index.
+
+        Returns
+        -------
+        Match columns.
+
+        """
+
+        columns = cls(output["document"], entity_repr)
+
+        for match in output["matches"]:
+            columns.append(
+                uid2idx[match["entity"][1]], match["entity"][1], match["span"][0], match["span"][1],
+                match["score"], match["valid"]
+            )
+
+        return columns
+
+    def append(self, e: int, uid: int, start: int, end: int, score, valid):
+        """Appends a match.
+
+        Parameters
+        ----------
+        e : int
+            Entity index.
+        uid : int
+            Entity id.
+        start : int
+            Start of the match in the document string.
+        end : int
+            End (exclusive) of the match in the document string.
+        score : {int, float}
+            Similarity score, None if not verified.
+        valid : bool
+            Validity, None if not verified.
+
+        """
+
+        self.entity.append(e)
+        self.uid.append(uid)
+        self.start.append(start)
+        self.end.append(end)
+        self.score.append(score)
+        self.valid.append(valid)
+
+        return
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    def match(self, k: int) -> str:
+        """Returns the matched substring of the k-th match.
+
+        Parameters
+        ----------
+        k : int
+            Match position.
+
+        Returns
+        -------
+        Substring of the document string.
+
+        """
+
+        return self.document[self.start[k]:self.end[k]]
+
+    def entity_text(self, k: int) -> str:
+        """Returns the entity text of the k-th match.
+
+        Parameters
+        ----------
+        k : int
+            Match position.
+
+        Returns
+        -------
+        Entity text.
+
+        """
+
+        return self.entity_repr(self.entity[k])
+
+    def __getitem__(self, k: int) -> dict:
+        """Returns the k-th match as in the default output.
+
+        Parameters
+        ----------
+        k : int
+            Match position.
+
+        Returns
+        -------
+        Match dictionary.
+
+        """
+
+        return {
+            "entity": [self.entity_text(k), self.uid[k]],
+            "span": [self.start[k], self.end[k]],
+            "match": self.match(k),
+            "score": self.score[k],
+            "valid": self.valid[k]
+        }
+
+    def __iter__(self):
+        return (self[k] for k in range(len(self)))
+
+    def to_dict(self) -> dict:
+        """Returns the default output (see :meth:`~nemex.nemex.Nemex.__call__`).
+
+        Returns
+        -------
+        Dictionary with document and match list.
+
+        """
+
+        return {"document": self.document, "matches": list(self)}
+
+    def to_numpy(self):
+        """Returns the columns as a NumPy structured array, with NaN scores and
+        -1 validity for matches not verified. Entity ids other than integers
+        (e.g. of TSV files) are kept as objects.
+
+        Returns
+        -------
+        Structured array with fields entity, uid, start, end, score and valid.
+
+        """
+
+        try:
+            import numpy
+        except ImportError:
+            raise ImportError("Structured array output requires numpy.")
+
+        uid_type = numpy.int64 if all(isinstance(uid, int) for uid in self.uid) else object
+
+        dtype = numpy.dtype([
+            ("entity", numpy.int64), ("uid", uid_type), ("start", numpy.int64), ("end", numpy.int64),
+            ("score", numpy.float64), ("valid", numpy.int8)
+        ])
+
+        array = numpy.empty(len(self), dtype=dtype)
+        array["entity"] = self.entity
+        array["uid"] = self.uid
+        array["start"] = self.start
+        array["end"] = self.end
+        array["score"] = [numpy.nan if score is None else score for score in self.score]
+        array["valid"] = [-1 if valid is None else valid for valid in self.valid]
+
+        return array
@@ -0,0 +1,211 @@
+"""
+Corpus module.
+
+Classes:
+    - CorpusIndex
+
+"""
+
+import pickle
+import logging
+import collections
+
+from nemex.faerie import Faerie
+from nemex.utils import Tokenizer
+
+
+logger = logging.getLogger(__name__)
+
+
+class CorpusIndex:
+    """Inverted index of a document corpus for reverse extraction.
+
+    The corpus is tokenized once, and each token keeps the list of documents it
+    occurs in with its sorted positions there. A dictionary is then matched
+    entity by entity: the postings of the entity's tokens give its position
+    list Pe in each document sharing a token with it, and Faerie's pruning and
+    candidate search (:meth:`~nemex.faerie.Faerie.process_entity`) run on that
+    position list. Thus, the work is proportional to the hits of the dictionary
+    tokens in the corpus, and documents without hits are never touched.
+
+    Parameters
+    ----------
+    documents : {list, dict}, optional
+        List of documents (ids are positions) or mapping from document id to document.
+    tokenizer : :class:`~nemex.utils.Tokenizer`, optional
+        Tokenizer of the documents, which must match the tokenizer of the dictionaries.
+
+    """
+
+    def __init__(self, documents=None, tokenizer: Tokenizer = None) -> None:
+        self.tokenizer = Tokenizer() if tokenizer is None else tokenizer
+
+        # document id -> tokens
+        self.doc2tokens = dict()
+
+        # token -> list of (document id, sorted positions)
+        self.token2postings = collections.defaultdict(list)
+
+        if documents is not None:
+            items = documents.items() if isinstance(documents, dict) else enumerate(documents)
+
+            for doc_id, document in items:
+                self.add(document, doc_id)
+
+            logger.info("Indexed {} documents with {} distinct tokens".format(len(self), len(self.token2postings)))
+
+        return
+
+    def __len__(self) -> int:
+        """Returns the number of documents.
+
+        Returns
+        -------
+        Number of documents.
+
+        """
+
+        return len(self.doc2tokens)
+
+    def __getitem__(self, doc_id) -> list:
+        """Returns the tokens of the document with the given id.
+
+        Parameters
+        ----------
+        doc_id :
+            Document id.
+
+        Returns
+        -------
+        Document tokens.
+
+        """
+
+        return self.doc2tokens[doc_id]
+
+    def add(self, document: str, doc_id=None):
+        """Tokenizes a document and adds its tokens to the index.
+
+        Parameters
+        ----------
+        document : str
+            Document.
+        doc_id : optional
+            Document id. If none provided, the number of documents is used.
+
+        """
+
+        if doc_id is None:
+            doc_id = len(self.doc2tokens)
+
+        if doc_id in self.doc2tokens:
+            raise ValueError("Document id '{}' is already indexed.".format(doc_id))
+
+        tokens = self.tokenizer.tokenize(document)
+        self.doc2tokens[doc_id] = tokens
+
+        token2positions = collections.OrderedDict()
+
+        for position, token in enumerate(tokens):
+            token2positions.setdefault(token, list()).append(position)
+
+        for token, positions in token2positions.items():
+            self.token2postings[token].append((doc_id, positions))
+
+        return
+
+    def position_lists(self, tokens: list) -> dict:
+        """Collects the position lists of the given (entity) tokens in all documents.
+
+        As in :meth:`~nemex.faerie.Faerie.__call__`, a token occurring several times
+        in the entity contributes its positions once per occurrence.
+
+        Parameters
+        ----------
+        tokens : list
+            Entity tokens.
+
+        Returns
+        -------
+        Mapping from document id to sorted position list Pe.
+
+        """
+
+        doc2lists = collections.defaultdict(list)
+
+        for token in tokens:
+            for doc_id, positions in self.token2postings.get(token, ()):
+                doc2lists[doc_id].append(positions)
+
+        return {doc_id: Faerie.merge_positions(lists) for doc_id, lists in doc2lists.items()}
+
+    def search(self, faerie: Faerie, entities=None):
+        """Finds the candidates of the entities of a Faerie model in the corpus.
+
+        Parameters
+        ----------
+        faerie : :class:`~nemex.faerie.Faerie`
+            Faerie model of the dictionary (bounds and pruner).
+        entities : iterable, optional
+            Entity ids to search. If none provided, all entities are searched.
+
+        Yields
+        -------
+        Document id, entity and its start and end position (in tokens).
+
+        """
+
+        entities_dict = faerie.entities_dict
+        entities = entities_dict if entities is None else entities
+
+        for e in sorted(entities):
+            if e not in entities_dict.idx2ent:
+                continue
+
+            entity = entities_dict[e]
+
+            for doc_id, Pe in self.position_lists(entity.tokens).items():
+
+                # fewer hits than the overlap lower bound
+                if len(Pe) < entity.Tl:
+                    continue
+
+                for i, j in faerie.process_entity(e, Pe):
+                    yield doc_id, e, (i, j)
+
+        return
+
+    def save(self, filename: str):
+        """Saves the corpus index to file.
+
+        Parameters
+        ----------
+        filename : str
+            Filename for saving data.
+
+        """
+
+        with open(filename, "wb") as wf:
+            pickle.dump(self, wf)
+
+        return
+
+    @classmethod
+    def load_from_file(cls, filename: str):
+        """Loads the corpus index from file.
+
+        Parameters
+        ----------
+        filename : str
+            Filename for loading data.
+
+        Returns
+        -------
+        Corpus index.
+
+        """
+
+        with open(filename, "rb") as rf:
+            corpus = pickle.load(rf)
+
+        return corpus
@@ -9,7 +9,10 @@ Classes:
 
 """
 
+import bisect
 import collections
+import functools
+import itertools
 import pickle
 import heapq
 import logging
@@ -24,6 +27,9 @@ class Entity:
     This class models a dictionary entity.
     An entity has a unique id and its textual representation.
     Each entity might have a list of associated tokens (see utils.Tokenizer).
+    Entities with identical tokens can be collapsed into one entity, in which
+    case ``uids`` holds the unique identifiers of all aliases (see
+    :meth:`~nemex.data.EntitiesDictionary.add`).
 
     Parameters
     ----------
@@ -37,6 +43,7 @@ class Entity:
 
     def __init__(self, uid: int, text: str, tokens: list = None):
         self.id = uid
+        self.uids = [uid]
         self.entity = text
         self.tokens = tokens
 
@@ -105,22 +112,35 @@ class EntitiesDictionary:
     1. idx2ent: maps dictionary id to entity.
     2. uid2idx: maps entities unique identifier to dictionary id.
 
+    If ``collapse`` is true, entities with identical token sequences are
+    stored only once and a third dictionary is kept:
+    3. tokens2idx: maps token sequence to dictionary id.
+
     Parameters
     ----------
     tokenizer : utils.Tokenizer
         Tokenizer instance.
+    collapse : bool
+        If true, collapses entities with identical tokens into one entity.
     """
 
-    def __init__(self, tokenizer=None):
+    def __init__(self, tokenizer=None, collapse: bool = False):
         self.idx2ent = dict()
         self.uid2idx = dict()
+        self.tokens2idx = dict()
         self.tokenizer = tokenizer
+        self.collapse = collapse
+
+        # next entity id (entity ids of removed entities are not reused)
+        self.next_idx = 0
 
         return
 
     def add(self, string: str, uid: int = None):
         """Creates an entity from the given string and adds it to the end of the dictionary (idx2ent).
         The unique identifier points to the entities position in the dictionary (uid2idx).
+        When collapsing, a string whose tokens are already in the dictionary is only
+        registered as an alias (uid) of the existing entity.
 
         Parameters
         ----------
@@ -129,6 +149,10 @@ class EntitiesDictionary:
         uid : int
             Unique identifier.
 
+        Returns
+        -------
+        Entity id.
+
         """
 
         # check for tokenizer
@@ -137,21 +161,40 @@ class EntitiesDictionary:
         else:
             tokens = self.tokenizer(string)
 
-        # last position
-        idx = len(self.idx2ent)
-
-        # check if uid exists
+        # check if uid exists (number of added strings, which also counts aliases)
         if uid is None:
-            uid = idx
+            uid = len(self.uid2idx)
+
+            # after removals, the number may be taken
+            if uid in self.uid2idx:
+                uid = max(self.uid2idx) + 1
+
+        # alias of an already indexed entity
+        if self.collapse:
+            key = tuple(tokens)
+
+            if key in self.tokens2idx:
+                idx = self.tokens2idx[key]
+                self.idx2ent[idx].uids.append(uid)
+                self.uid2idx[uid] = idx
+
+                return idx
+
+        # last position
+        idx = self.next_idx
+        self.next_idx += 1
 
         # dicts
         self.uid2idx[uid] = idx
         self.idx2ent[idx] = Entity(uid, string, tokens)
 
-        return
+        if self.collapse:
+            self.tokens2idx[key] = idx
+
+        return idx
 
     @staticmethod
-    def from_tsv_file(filename: str, tokenizer=None):
+    def from_tsv_file(filename: str, tokenizer=None, collapse: bool = False):
         """Creates an entity dictionary from a tsv file.
 
         Parameters
@@ -162,13 +205,16 @@ class EntitiesDictionary:
         tokenizer : utils.Tokenizer
             Tokenizer instance.
 
+        collapse : bool
+            If true, collapses entities with identical tokens into one entity.
+
         Returns
         -------
         Entity dictionary.
 
         """
 
-        entity_dict = EntitiesDictionary(tokenizer)
+        entity_dict = EntitiesDictionary(tokenizer, collapse)
 
         # each line is tab separated id and string value
         with open(filename, encoding='utf-8', errors='ignore') as rf:
@@ -192,7 +238,7 @@ class EntitiesDictionary:
         return entity_dict
 
     @staticmethod
-    def from_list(list_strings: list, tokenizer=None):
+    def from_list(list_strings: list, tokenizer=None, collapse: bool = False):
         """Creates an entity dictionary from a list.
 
         Parameters
@@ -203,13 +249,16 @@ class EntitiesDictionary:
         tokenizer : utils.Tokenizer
             Tokenizer instance.
 
+        collapse : bool
+            If true, collapses entities with identical tokens into one entity.
+
         Returns
         -------
         Entity dictionary.
 
         """
 
-        entity_dict = EntitiesDictionary(tokenizer)
+        entity_dict = EntitiesDictionary(tokenizer, collapse)
 
         for string in list_strings:
             entity_dict.add(string, None)
@@ -244,7 +293,7 @@ class EntitiesDictionary:
         return self.idx2ent[idx]
 
     def __delitem__(self, idx):
-        """Deletes the entity corresponding to the given entity id.
+        """Deletes the entity corresponding to the given entity id, including all its aliases.
 
         Parameters
         ----------
@@ -253,12 +302,45 @@ class EntitiesDictionary:
 
         """
 
-        uid = self[idx].id
-        del self.uid2idx[uid]
+        entity = self[idx]
+
+        for uid in entity.uids:
+            del self.uid2idx[uid]
+
+        if self.collapse:
+            del self.tokens2idx[tuple(entity.tokens)]
+
         del self.idx2ent[idx]
 
         return
 
+    def remove(self, uid):
+        """Removes an entity by its unique identifier. An alias of a collapsed
+        entity is only unregistered, while the entity stays with its other aliases.
+
+        Parameters
+        ----------
+        uid : int
+            Unique identifier.
+
+        Returns
+        -------
+        True, if the entity was deleted.
+
+        """
+
+        idx = self.uid2idx[uid]
+        entity = self.idx2ent[idx]
+
+        if len(entity.uids) == 1:
+            del self[idx]
+            return True
+
+        entity.uids.remove(uid)
+        del self.uid2idx[uid]
+
+        return False
+
     def __iter__(self):
         """Iterates over the dictionary.
 
@@ -271,6 +353,57 @@ class EntitiesDictionary:
         for eidx in self.idx2ent:
             yield eidx
 
+    def subset(self, indexes):
+        """Creates a dictionary holding only the entities with the given entity ids.
+        Entities keep their entity ids and are shared with this dictionary, and
+        entities added to it get ids after those of this dictionary.
+
+        Parameters
+        ----------
+        indexes : iterable
+            Entity ids.
+
+        Returns
+        -------
+        Entity dictionary.
+
+        """
+
+        entity_dict = EntitiesDictionary(self.tokenizer, self.collapse)
+
+        for idx in indexes:
+            entity = self.idx2ent[idx]
+            entity_dict.idx2ent[idx] = entity
+
+            for uid in entity.uids:
+                entity_dict.uid2idx[uid] = idx
+
+            if self.collapse:
+                entity_dict.tokens2idx[tuple(entity.tokens)] = idx
+
+        entity_dict.next_idx = self.next_idx
+
+        return entity_dict
+
+    def shard(self, n: int) -> list:
+        """Splits the dictionary into shards by entity id range.
+
+        Parameters
+        ----------
+        n : int
+            Number of shards.
+
+        Returns
+        -------
+        List of entity dictionaries, in ascending order of entity ids.
+
+        """
+
+        indexes = sorted(self.idx2ent)
+        size = max(1, -(-len(indexes) // n))
+
+        return [self.subset(indexes[i:i+size]) for i in range(0, len(indexes), size)]
+
     def get_item_by_uid(self, uid: int) -> Entity:
         """Returns entity for the given uid.
 
@@ -301,7 +434,10 @@ class EntitiesDictionary:
             dump = {
                 "idx2ent": self.idx2ent,
                 "uid2idx": self.uid2idx,
-                "tokenizer": self.tokenizer
+                "tokens2idx": self.tokens2idx,
+                "tokenizer": self.tokenizer,
+                "collapse": self.collapse,
+                "next_idx": self.next_idx
             }
             pickle.dump(dump, wf)
 
@@ -329,6 +465,9 @@ class EntitiesDictionary:
             entity_dict.idx2ent = dump["idx2ent"]
             entity_dict.uid2idx = dump["uid2idx"]
             entity_dict.tokenizer = dump["tokenizer"]
+            entity_dict.tokens2idx = dump.get("tokens2idx", dict())
+            entity_dict.collapse = dump.get("collapse", False)
+            entity_dict.next_idx = dump.get("next_idx", max(entity_dict.idx2ent, default=-1) + 1)
 
         return entity_dict
 
@@ -338,19 +477,60 @@ class InvertedIndex:
 
     This class models the Inverted Index data structure.
 
+    In prefix-filter mode, each entity is indexed only by the prefix of its tokens
+    ordered by global rarity, which is long enough to guarantee that every substring
+    sharing at least Tl tokens with the entity also shares a prefix token with it
+    (prefix filtering). Lookups then first find the entities hit by a prefix token
+    and complete their inverted lists from the entity tokens in a second step.
+
+    Inverted lists holding entities of different lengths can additionally be
+    partitioned by entity length. Each partition keeps the bounds of its entities,
+    so that a lookup skips whole partitions whose entities cannot fit the document.
+
     Parameters
     ----------
     token2entities : dict
+        Mapping from token to sorted list of entity ids.
+    entities_dict : EntitiesDictionary
+        Entities dictionary, only required in prefix-filter mode.
+    token2partitions : dict
+        Mapping from token to list of length partitions (⊥e, Te, Tl, entity ids).
 
     """
 
-    def __init__(self, token2entities: dict):
+    def __init__(self,
+                 token2entities: dict,
+                 entities_dict: EntitiesDictionary = None,
+                 token2partitions: dict = None
+                 ):
         self.token2entities = token2entities
+        self.entities_dict = entities_dict
+        self.length_partition = token2partitions is not None
+        self.token2partitions = dict() if token2partitions is None else token2partitions
+
+        # global token frequencies of the prefix order (fixed at creation)
+        self.token2freq = collections.Counter()
 
         return
 
+    @property
+    def prefix_filter(self) -> bool:
+        """Returns whether the index only holds prefix tokens.
+
+        Returns
+        -------
+        True, if in prefix-filter mode.
+
+        """
+
+        return self.entities_dict is not None
+
     @classmethod
-    def from_entities_dict(cls, entities_dict: EntitiesDictionary):
+    def from_entities_dict(cls,
+                           entities_dict: EntitiesDictionary,
+                           prefix_filter: bool = False,
+                           length_partition: bool = False
+                           ):
         """Creates an inverted index from the given entity dictionary.
 
         Parameters
@@ -358,6 +538,15 @@ class InvertedIndex:
         entities_dict : EntitiesDictionary
             Entities dictionary.
 
+        prefix_filter : bool
+            If true, indexes only the rarest |e| - Tl + 1 tokens of each entity.
+            Requires overlap lower bounds (Tl) of entities (see
+            :meth:`~nemex.faerie.Faerie.init_bounds`).
+
+        length_partition : bool
+            If true, partitions inverted lists by entity length. Requires length
+            and overlap bounds (⊥e, Te, Tl) of entities.
+
         Returns
         -------
         Inverted index.
@@ -366,36 +555,424 @@ class InvertedIndex:
 
         token2entities = collections.defaultdict(list)
 
-        # for each entity in dictionary
-        for eidx, entity in entities_dict.idx2ent.items():
+        if not prefix_filter:
+
+            # for each entity in dictionary
+            for eidx, entity in entities_dict.idx2ent.items():
 
-            # for each token / q-gram of entity
-            for token in entity.tokens:
+                # for each token / q-gram of entity
+                for token in entity.tokens:
+                    token2entities[token].append(eidx)
+
+            if length_partition:
+                return cls(token2entities, token2partitions=cls.partition(token2entities, entities_dict))
+
+            return cls(token2entities)
+
+        token2freq = cls.token_frequencies(entities_dict)
+
+        for eidx, entity in entities_dict.idx2ent.items():
+            for token in cls.prefix(entity.tokens, entity.Tl, token2freq):
                 token2entities[token].append(eidx)
 
-        return cls(token2entities)
+        if length_partition:
+            inv_index = cls(token2entities, entities_dict, cls.partition(token2entities, entities_dict))
+        else:
+            inv_index = cls(token2entities, entities_dict)
+
+        inv_index.token2freq = token2freq
+
+        return inv_index
+
+    @staticmethod
+    def token_frequencies(entities_dict: EntitiesDictionary) -> collections.Counter:
+        """Counts the global token frequencies, i.e. the number of entities
+        containing each token.
+
+        Parameters
+        ----------
+        entities_dict : EntitiesDictionary
+            Entities dictionary.
+
+        Returns
+        -------
+        Mapping from token to frequency.
+
+        """
+
+        token2freq = collections.Counter()
+
+        for entity in entities_dict.idx2ent.values():
+            token2freq.update(set(entity.tokens))
+
+        return token2freq
+
+    @staticmethod
+    def prefix(tokens: list, Tl: int, token2freq: dict) -> set:
+        """Computes the prefix tokens of a token list with overlap lower bound Tl.
+
+        Tokens are ordered by global rarity, ties broken by token. Sharing
+        Tl tokens implies sharing one of the first |e| - Tl + 1 tokens.
+
+        Parameters
+        ----------
+        tokens : list
+            Tokens.
+        Tl : int
+            Overlap lower bound.
+        token2freq : dict
+            Global token frequencies (tokens not in it are the rarest).
+
+        Returns
+        -------
+        Set of prefix tokens.
+
+        """
+
+        tokens = sorted(tokens, key=lambda token: (token2freq.get(token, 0), token))
+
+        return set(tokens[:len(tokens) - Tl + 1])
+
+    @staticmethod
+    def partition(token2entities: dict, entities_dict: EntitiesDictionary) -> dict:
+        """Partitions inverted lists by entity length.
+
+        Entities are bucketed by powers of two of their length. Only inverted lists
+        spanning more than one bucket are partitioned.
+
+        Parameters
+        ----------
+        token2entities : dict
+            Mapping from token to sorted list of entity ids.
+        entities_dict : EntitiesDictionary
+            Entities dictionary with computed bounds.
+
+        Returns
+        -------
+        Mapping from token to list of partitions (min ⊥e, max Te, min Tl, entity ids).
+
+        """
+
+        token2partitions = dict()
+
+        for token, entities in token2entities.items():
+            buckets = collections.defaultdict(list)
+
+            # ids stay sorted within each bucket
+            for eidx in entities:
+                buckets[len(entities_dict[eidx]).bit_length()].append(eidx)
+
+            if len(buckets) == 1:
+                continue
+
+            partitions = list()
 
-    def __getitem__(self, tokens: dict):
-        """Returns the inverted lists for the given tokens.
+            for bucket in sorted(buckets):
+                members = [entities_dict[eidx] for eidx in set(buckets[bucket])]
+                partitions.append((
+                    min(entity.Le for entity in members),
+                    max(entity.Te for entity in members),
+                    min(entity.Tl for entity in members),
+                    buckets[bucket]
+                ))
+
+            token2partitions[token] = partitions
+
+        return token2partitions
+
+    def indexed_tokens(self, entity: Entity) -> list:
+        """Returns the tokens by which an entity is indexed.
 
         Parameters
         ----------
-        tokens : dict
-            Token dictionary.
+        entity : Entity
+            Entity (with overlap lower bound Tl in prefix-filter mode).
 
         Returns
         -------
-        Inverted sub-dict.
+        Tokens, in prefix-filter mode the prefix tokens only.
 
         """
 
+        if self.prefix_filter:
+            return list(self.prefix(entity.tokens, entity.Tl, self.token2freq))
+
+        return entity.tokens
+
+    def add(self, eidx: int, entities_dict: EntitiesDictionary):
+        """Adds an entity to the inverted lists, keeping them sorted.
+
+        In prefix-filter mode, the prefix follows the token order of the creation
+        of the index, which needs not reflect the current token frequencies.
+
+        Parameters
+        ----------
+        eidx : int
+            Entity id.
+        entities_dict : EntitiesDictionary
+            Entities dictionary holding the entity with computed bounds.
+
+        """
+
+        tokens = self.indexed_tokens(entities_dict[eidx])
+
+        for token in tokens:
+            inv_list = self.token2entities.setdefault(token, list())
+            bisect.insort(inv_list, eidx)
+
+        self._refresh_partitions(set(tokens), entities_dict)
+
+        return
+
+    def remove(self, eidx: int, entities_dict: EntitiesDictionary):
+        """Removes an entity from the inverted lists.
+
+        Parameters
+        ----------
+        eidx : int
+            Entity id.
+        entities_dict : EntitiesDictionary
+            Entities dictionary still holding the entity.
+
+        """
+
+        tokens = set(self.indexed_tokens(entities_dict[eidx]))
+
+        for token in tokens:
+            inv_list = [e for e in self.token2entities.get(token, ()) if e != eidx]
+
+            if inv_list:
+                self.token2entities[token] = inv_list
+            else:
+                self.token2entities.pop(token, None)
+
+        self._refresh_partitions(tokens, entities_dict)
+
+        return
+
+    def _refresh_partitions(self, tokens: set, entities_dict: EntitiesDictionary):
+        """Recomputes the length partitions of the given tokens' inverted lists.
+
+        Parameters
+        ----------
+        tokens : set
+            Tokens.
+        entities_dict : EntitiesDictionary
+            Entities dictionary.
+
+        """
+
+        if not self.length_partition:
+            return
+
+        for token in tokens:
+            self.token2partitions.pop(token, None)
+
+        token2entities = {token: self.token2entities[token] for token in tokens if token in self.token2entities}
+        self.token2partitions.update(self.partition(token2entities, entities_dict))
+
+        return
+
+    def __getitem__(self, tokens: list):
+        """Returns the inverted lists for the given tokens, grouped by distinct token.
+
+        Each distinct document token is looked up once, and the sorted list of its
+        positions in the document is attached to its inverted list.
+
+        Parameters
+        ----------
+        tokens : list
+            Token list.
+
+        Returns
+        -------
+        Mapping from token to tuple of sorted positions and inverted list, in
+        order of first occurrence.
+
+        """
+
+        if self.prefix_filter:
+            return self._complete_prefix_lists(tokens)
+
+        token2positions = collections.OrderedDict()
+
+        for position, token in enumerate(tokens):
+
+            if token in self.token2entities:
+
+                if token not in token2positions:
+                    token2positions[token] = list()
+
+                token2positions[token].append(position)
+
         # order preserving mapping
         inv_lists = collections.OrderedDict()
 
+        if self.token2partitions:
+            hit_positions = sorted(
+                position for positions in token2positions.values() for position in positions
+            )
+
+            # maximal window hits by window size, shared by all tokens and partitions
+            window_hits = dict()
+
+            for token, positions in token2positions.items():
+                entities = self.get_inv_list(token, len(tokens), hit_positions, window_hits)
+
+                if entities:
+                    inv_lists[token] = (positions, entities)
+
+            return inv_lists
+
+        for token, positions in token2positions.items():
+            inv_lists[token] = (positions, self.token2entities[token])
+
+        return inv_lists
+
+    def get_inv_list(self, token, doc_len: int, hit_positions: list, window_hits: dict = None) -> list:
+        """Returns the inverted list of a token without the length partitions
+        whose entities cannot fit the document.
+
+        A partition is skipped if its shortest valid substring (⊥e) is longer than
+        the document, or if no window of Te tokens holds Tl tokens of the index.
+
+        Parameters
+        ----------
+        token :
+            Token.
+        doc_len : int
+            Number of document tokens.
+        hit_positions : list
+            Sorted positions of document tokens which are in the index.
+        window_hits : dict, optional
+            Maximal window hits by window size of the document, filled and reused
+            across calls of the same lookup.
+
+        Returns
+        -------
+        Sorted list of entity ids.
+
+        """
+
+        partitions = self.token2partitions.get(token)
+
+        if partitions is None:
+            return self.token2entities[token]
+
+        if window_hits is None:
+            window_hits = dict()
+
+        kept = list()
+
+        for Le, Te, Tl, entities in partitions:
+            if Le > doc_len or Tl > len(hit_positions):
+                continue
+
+            if Te not in window_hits:
+                window_hits[Te] = self.max_window_hits(hit_positions, Te)
+
+            if Tl <= window_hits[Te]:
+                kept.append(entities)
+
+        if len(kept) == len(partitions):
+            return self.token2entities[token]
+
+        if len(kept) == 1:
+            return kept[0]
+
+        return list(heapq.merge(*kept))
+
+    @staticmethod
+    def max_window_hits(hit_positions: list, window: int) -> int:
+        """Returns the maximal number of hit positions in any window of the given size.
+
+        Parameters
+        ----------
+        hit_positions : list
+            Sorted positions.
+        window : int
+            Window size.
+
+        Returns
+        -------
+        Maximal number of positions in a window.
+
+        """
+
+        if not hit_positions:
+            return 0
+
+        span = hit_positions[-1] - hit_positions[0] + 1
+
+        # the window holds all positions, or positions are consecutive
+        if window >= span:
+            return len(hit_positions)
+        if len(hit_positions) == span:
+            return window
+
+        max_hits = 0
+        i = 0
+
+        for j, pj in enumerate(hit_positions):
+
+            while pj - hit_positions[i] + 1 > window:
+                i += 1
+
+            max_hits = max(max_hits, j - i + 1)
+
+        return max_hits
+
+    def _complete_prefix_lists(self, tokens: list):
+        """Returns the full inverted lists of entities sharing a prefix token with the given tokens.
+
+        Parameters
+        ----------
+        tokens : list
+            Token list.
+
+        Returns
+        -------
+        Mapping from token to tuple of sorted positions and inverted list restricted
+        to the surviving entities.
+
+        """
+
+        token2positions = collections.OrderedDict()
+
         for position, token in enumerate(tokens):
 
+            if token not in token2positions:
+                token2positions[token] = list()
+
+            token2positions[token].append(position)
+
+        # first step: entities sharing at least one prefix token (every document
+        # position counts as a hit, since the index does not hold all tokens)
+        survivors = set()
+        window_hits = dict()
+
+        for token in token2positions:
+
             if token in self.token2entities:
-                inv_lists[position] = self.token2entities[token]
+                survivors.update(self.get_inv_list(token, len(tokens), range(len(tokens)), window_hits))
+
+        # second step: complete inverted lists of the survivors' tokens; each entity
+        # is appended once per occurrence of the token in it, same as in the full index
+        token2entities = collections.defaultdict(list)
+
+        for eidx in sorted(survivors):
+
+            for token in self.entities_dict[eidx].tokens:
+
+                if token in token2positions:
+                    token2entities[token].append(eidx)
+
+        inv_lists = collections.OrderedDict()
+
+        for token, positions in token2positions.items():
+
+            if token in token2entities:
+                inv_lists[token] = (positions, token2entities[token])
 
         return inv_lists
 
@@ -406,91 +983,75 @@ class FaerieDataStructure:
     
     Notes
     -----
-    A single min-heap is created from the top elements of each inverted 
-    list. As an example, take fig. 5 from paper:
+    The inverted lists are retrieved once per distinct document token and carry
+    the sorted positions of that token in the document (see
+    :meth:`~nemex.data.InvertedIndex.__getitem__`). As an example, take fig. 5
+    from paper, where the tokens at positions 3, 8, 13 and 18 are the same:
     ```
-    inverted_lists = [[4], [4], [4], [1, 4], [1, 4], [1, 4], [1, 4], [1]]
-                       ^    ^    ^    ^       ^       ^       ^       ^
-    sub_indexes:       0    0    0    0  1    0   1   0  1    0  1    0
-    token_index:       0    1    2      3       8      13      18     19    
+    inv_lists = [[4], [4], [4], [1, 4], [1]]
+                  ^    ^    ^    ^       ^
+    positions:   [0]  [1]  [2]  [3, 8,  [19]
+                                 13, 18]
     ```
-    then, heap will be made of all entity ids marked with ^ for
-    initialization.
-    
-    Next, we also need to maintain pointers to first elements' index
-    in each (sub)-list. At initialization it will be all 0's (because
-    ^ points to first positions in each list).
+    A single min-heap is created from the top elements of each inverted list
+    (marked with ^ for initialization), together with the index of the list
+    they came from.
     
-    At pop of first "1", the picture will look like
+    Next, we also need to maintain pointers to the current top element of each
+    list. At initialization it will be all 0's (because ^ points to the first
+    element of each list). At pop of first "1", the picture will look like
     ```
-    inverted_lists = [[4], [4], [4], [x, 4], [1, 4], [1, 4], [1, 4], [1]]
-                       ^    ^    ^       ^    ^       ^       ^       ^
-    sub_indexes:       0    0    0    0  1    0   1   0  1    0  1    0
-    token_index:       0    1    2      3       8      13      18     19 
+    inv_lists = [[4], [4], [4], [x, 4], [1]]
+                  ^    ^    ^       ^    ^
     ```
-    We can see that the pointer ^ of fourth sublist moved to position
-    1 of sublist. Note, in implementation, the poped entity is never
-    removed from actual inverted list so, `x` here is only for visualization
-    purposes.
+    We can see that the pointer ^ of fourth list moved to position 1 of the list.
+    Note, in implementation, the popped entity is never removed from actual
+    inverted list so, `x` here is only for visualization purposes.
     
-    However, we **CAN** create a mapping from entity index to position lists.
+    Every pop yields an entity together with all positions of one of its tokens.
+    Since min-heap is generated from top-elements, we will see smallest indexed
+    entity in heap until all its occurrences exhaust e.g. after full cycle of
+    heap-pop+push, we will have popped elements as [1, 1, 4, 4, 4, 4]. The
+    position list of an entity is produced by merging the position lists popped
+    for it:
     ```
-    ent2positions = { 1 : [3, 8, 13, 18, 19], 4 : [0, 1, 2, 3, 8, 13, 18] }
+    Pe(1) = merge([3, 8, 13, 18], [19]) = [3, 8, 13, 18, 19]
     ```
-    We create dictionaries and retrieve inverted lists in such a manner that
-    all position lists are pre-computed and positions sorted. Since min-heap
-    is generated from top-elements, we will see smallest indexed entity in heap
-    until all its occurrences exhaust e.g. after full cycle of heap-pop+push,
-    we will have popped elements as [0, 0, 0, 0, 0, 4, 4, 4, 4, 4, 4, 4].
-    This effectively allows to keep one active count occurrence array only.
-    The local pointer per entity list is just an integer ``self.current_e_indptr``.
-    Lastly, we need to keep top pointers per position. This we do it with a
-    simple dictionary in ``self.position2topidx``.
-    
-    Important note for possible improvement: because we already know the position 
-    sizes (|Pe|) we **CAN** apply lazy-count pruning during initialization. This will
-    eliminate all the unnecessary entities from being added in heap in first place.
-    Thus the heap adjustment costs from these entities will be eliminated. However, 
-    this will come at cost of space complexity as we are pre-computing all the 
-    position lists.
+    This effectively allows to keep one active count occurrence array only. A
+    token occurring many times in the document is thus looked up once, and its
+    inverted list is walked once instead of once per position.
     
     """
 
     def __init__(self, entities_dict: EntitiesDictionary):
         self.entities_dict = entities_dict
-        self.inv_lists = None
+        self.inv_lists = list()
+        self.positions = list()
         self._heap = list()
-        self.current_e_index_ptr = 0
         self.V = collections.defaultdict(list)
 
-        # mapping from entity index to sorted list of token positions
-        self.ent2positions = collections.defaultdict(list)
-
-        # mapping from non-empty sublist token positions to the index of current
-        # top element (the element currently in heap) in inverted list
-        self.position2topidx = dict()
+        # index of current top element (the element currently in heap) of each inverted list
+        self.list2topidx = list()
 
         return
 
-    def init_from_inv_lists(self, inv_lists: InvertedIndex):
+    def init_from_inv_lists(self, inv_lists: collections.OrderedDict):
         """Faerie data-structures initialization.
         
-        Creates min-heap from top elements of inverted lists. Record
-        positions, maintains top pointers and count array per entity.
+        Creates min-heap from top elements of inverted lists, maintains top
+        pointers and count array per entity.
         
         Parameters
         ----------
-        inv_lists : dict of [int, list]
-            A mapping from token position in document, where the sublist is non-empty, 
-            to the inverted list. Where each list is sorted in ascending order.
+        inv_lists : dict of [str, tuple]
+            A mapping from distinct document token to tuple of its sorted positions
+            in document and its inverted list. Where each list is sorted in ascending order.
         
         """
 
-        self.heap = inv_lists
         self.init_position_data(inv_lists)
-        self.inv_lists = inv_lists
+        self.heap = self.inv_lists
         self.reset_count()
-        self.current_e_index_ptr = 0
 
         return
 
@@ -507,49 +1068,68 @@ class FaerieDataStructure:
         return self._heap
 
     @heap.setter
-    def heap(self, inv_lists: InvertedIndex):
+    def heap(self, inv_lists: list):
         """Inserts the inverted lists into the heap.
 
         Parameters
         ----------
-        inv_lists : data.InvertedIndex
-            Inverted Index lists.
+        inv_lists : list
+            Inverted lists.
 
         """
 
-        self._heap = [inv_lists[position][0] for position in inv_lists]
+        self._heap = [(inv_list[0], k) for k, inv_list in enumerate(inv_lists)]
 
         # generate inplace min-heap from list
         heapq.heapify(self._heap)
 
         return
 
-    def init_position_data(self, inv_lists: InvertedIndex):
+    def init_position_data(self, inv_lists: collections.OrderedDict):
         """Initialises the position data.
-        The entity-position list - keeps for each entity, its position in the document.
-        The position-topId list - keeps for each position, the top element index.
+        The inverted lists and positions are stored side by side, so that the k-th
+        inverted list belongs to the token at the k-th positions.
+        The list-topId list - keeps for each inverted list, the top element index.
 
         Parameters
         ----------
-        inv_lists : InvertedIndex
-            Inverted index lists.
+        inv_lists : dict of [str, tuple]
+            Mapping from distinct document token to tuple of positions and inverted list.
 
         """
 
-        # since we used ``OrderedDict`` in :meth:`~nemex.data.InvertedIndex.__getitem__`, 
-        # looping over it will return keys in ascending order
-        for position in inv_lists:
+        self.positions = list()
+        self.inv_lists = list()
 
-            # since we used enumeration in :meth:`~nemex.data.InvertedIndex.__getitem__`, 
-            # looping over each sublist will return token positions in ascending order
-            for eidx in inv_lists[position]:
-                self.ent2positions[eidx].append(position)
+        for positions, inv_list in inv_lists.values():
+            self.positions.append(positions)
+            self.inv_lists.append(inv_list)
 
-            # set each sub-lists' pointer where the top element index is (initially at 0)
-            self.position2topidx[position] = 0
+        # set each lists' pointer where the top element index is (initially at 0)
+        self.list2topidx = [0] * len(self.inv_lists)
 
         return
 
+    @staticmethod
+    def merge_positions(position_lists: list) -> list:
+        """Merges the sorted position lists popped for an entity.
+
+        Parameters
+        ----------
+        position_lists : list
+            List of sorted position lists.
+
+        Returns
+        -------
+        Sorted position list of entity (Pe).
+
+        """
+
+        if len(position_lists) == 1:
+            return position_lists[0]
+
+        return sorted(itertools.chain.from_iterable(position_lists))
+
     def reset_count(self):
         """Initialize or clear a counter for current entity being processed.
         
@@ -564,7 +1144,7 @@ class FaerieDataStructure:
         
         """
 
-        self.V = collections.defaultdict(lambda: collections.defaultdict(int))
+        self.V = collections.defaultdict(functools.partial(collections.defaultdict, int))
 
         return
 
@@ -607,19 +1187,16 @@ class FaerieDataStructure:
 
         return
 
-    def step(self, e: Entity):
+    def step(self):
         """A Faerie step to update its data structures.
         
         Steps involved:
             1. Pop element from heap.
             2. If heap is empty raise stop flag
-            3. Else, if popped entity is different than last entity,
-               reset the running sub-list pointer.
-            4. Get the position from which this element came from.
-            5. Update pointers.
-            6. If current position inverted list still has element,
-               push it to the heap.
-            7. Return popped entity, its position and stop flag.
+            3. Get the inverted list from which this element came from.
+            4. Update pointers.
+            5. If this inverted list still has element, push it to the heap.
+            6. Return popped entity, the positions of its list and stop flag.
         
         """
 
@@ -627,23 +1204,19 @@ class FaerieDataStructure:
 
         try:
             # pop the top element from heap
-            ei = heapq.heappop(self.heap)
+            ei, k = heapq.heappop(self.heap)
         except IndexError:
             stop = True
             ei = None
-            pi = None
+            positions = None
         else:
-            if ei != e:
-                self.current_e_index_ptr = 0
-
-            pi = self.ent2positions[ei][self.current_e_index_ptr]
-            self.position2topidx[pi] += 1  # increment top pointer of sublist at position pi
-            self.current_e_index_ptr += 1
+            positions = self.positions[k]
+            self.list2topidx[k] += 1  # increment top pointer of list k
 
-            pi_top_pointer = self.position2topidx[pi]
+            top_pointer = self.list2topidx[k]
 
-            if pi_top_pointer < len(self.inv_lists[pi]):
-                ej = self.inv_lists[pi][pi_top_pointer]
-                heapq.heappush(self.heap, ej)
+            if top_pointer < len(self.inv_lists[k]):
+                ej = self.inv_lists[k][top_pointer]
+                heapq.heappush(self.heap, (ej, k))
 
-        return ei, pi, stop
+        return ei, positions, stop
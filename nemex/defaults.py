@@ -6,7 +6,7 @@ Classes:
 
 """
 
-from nemex import Pruner, Sim, Tokenizer
+from nemex import Pruner, Sim, Engine, Tokenizer
 
 
 class Default:
@@ -22,4 +22,27 @@ class Default:
     SPECIAL_CHAR: str = "_"
     TOKENIZER = Tokenizer(CHAR, TOKEN_THRESH, SPECIAL_CHAR, UNIQUE).tokenize
     LOWER: bool = True
+    STRIP_ACCENTS: bool = False
+    COLLAPSE_WHITESPACE: bool = False
     VALID_ONLY: bool = True
+    COLLAPSE: bool = True
+    PREFIX_FILTER: bool = False
+    LENGTH_PARTITION: bool = False
+    SHARDS: int = 1
+    SHARD_PROCESSES: bool = False
+    SHORT_MAX_LEN: int = 0
+    ENGINE: str = Engine.FAERIE
+    EXACT_FIRST: bool = False
+    LSH_BANDS: int = 16
+    LSH_ROWS: int = 4
+    CASCADE: bool = False
+    GATE: bool = True
+    CACHE_ENTRIES: int = 100000
+    CACHE_BYTES: int = 256 * 2 ** 20
+    OUTPUT: str = "dicts"
+    SPANS: str = "normalized"
+    BATCH_WINDOW: float = 0.002
+    MAX_BATCH: int = 32
+    MAX_QUEUE: int = 1024
+    RUN_SHARD_SIZE: int = 64 * 2 ** 20
+    RUN_PREFETCH: int = 256
@@ -0,0 +1,180 @@
+"""
+Deletion module.
+
+Classes:
+    - DeletionNeighborhood
+
+"""
+
+import math
+import logging
+import collections
+
+from nemex import EntitiesDictionary, Default
+from nemex.utils import Sim, qgrams_to_char
+
+
+logger = logging.getLogger(__name__)
+
+
+class DeletionNeighborhood:
+    """Deletion-neighborhood index for short entities.
+
+    Faerie cannot match entities that are too short for its q-gram bounds (e.g.
+    acronyms with ``edit_dist``, ``q=2`` and ``t=2``). This index handles them in
+    the manner of SymSpell [1]_: every entity string is indexed by all strings
+    obtained by deleting up to k of its characters, and every document window
+    of a length that can match an entity is probed with its own deletion
+    variants. If the edit distance of two strings is at most k, they share a
+    variant, so the index finds all candidates, which are verified afterwards.
+    Matches are required to keep at least one character of the entity, i.e.
+    the empty variant is not indexed.
+
+    Parameters
+    ----------
+    entities_dict : :class:`~nemex.data.EntitiesDictionary`
+        Instance of entities dictionary (of short entities).
+
+    similarity : str, {"edit_dist", "edit_sim"}, optional
+        Similarity function.
+
+    t : float, optional
+        Threshold value for the similarity function.
+
+    q : int, optional
+        Value of q-gram of the tokens.
+
+    References
+    ----------
+    .. [1] Garbe, W. (2012). SymSpell: 1 million times faster spelling correction
+       through symmetric delete spelling correction algorithm.
+
+    """
+
+    def __init__(self,
+                 entities_dict: EntitiesDictionary,
+                 similarity: str = Default.SIMILARITY,
+                 t: float = Default.SIM_THRESH_CHAR,
+                 q: int = Default.TOKEN_THRESH
+                 ) -> None:
+
+        if similarity not in Sim.CHAR_BASED:
+            raise ValueError("Deletion neighborhood requires 'edit_dist' or 'edit_sim' similarity.")
+
+        self.entities_dict = entities_dict
+        self.similarity = similarity
+        self.t = t
+        self.q = q
+
+        # variant -> list of (entity id, entity length, max edits)
+        index = collections.defaultdict(list)
+
+        # window length -> max number of deletions
+        self.window2edits = dict()
+
+        for e_idx, entity in entities_dict.idx2ent.items():
+
+            # entities shorter than q have no tokens and cannot be located
+            if len(entity) == 0:
+                continue
+
+            string = qgrams_to_char(entity.tokens)
+            k = self.max_edits(len(string))
+
+            for variant in self.deletions(string, k):
+                if variant:
+                    index[variant].append((e_idx, len(string), k))
+
+            for length in range(max(len(string) - k, self.q), len(string) + k + 1):
+                self.window2edits[length] = max(k, self.window2edits.get(length, 0))
+
+        self.index = dict(index)
+
+        logger.info("Indexed {} deletion variants of {} short entities".format(len(self.index), len(entities_dict)))
+
+        return
+
+    def max_edits(self, length: int) -> int:
+        """Computes the maximum edit distance of a valid match of an entity.
+
+        Parameters
+        ----------
+        length : int
+            Entity length.
+
+        Returns
+        -------
+        Maximum number of edits.
+
+        """
+
+        if self.similarity == Sim.EDIT_DIST:
+            return int(self.t)
+
+        # ED <= (1 - t) * max(|e|, |s|), where |s| <= |e| / t
+        return int(math.floor((1 - self.t) * length / self.t))
+
+    @staticmethod
+    def deletions(string: str, k: int) -> set:
+        """Generates all strings obtained by deleting up to k characters.
+
+        Parameters
+        ----------
+        string : str
+            Input string.
+        k : int
+            Maximum number of deletions.
+
+        Returns
+        -------
+        Set of deletion variants, including the string itself.
+
+        """
+
+        variants = {string}
+        level = {string}
+
+        for _ in range(min(k, len(string))):
+            level = {s[:i] + s[i+1:] for s in level for i in range(len(s))}
+            variants |= level
+
+        return variants
+
+    def __call__(self, doc_tokens):
+        """Probes the index with all document windows of matching lengths.
+
+        Yields
+        -------
+        Entity with its start and end position (in tokens).
+
+        """
+
+        if not self.index or not doc_tokens:
+            return
+
+        doc = qgrams_to_char(doc_tokens)
+        index = self.index
+        candidates = set()
+
+        # window -> inverted lists of its indexed variants
+        window2lists = dict()
+
+        for length, k in sorted(self.window2edits.items()):
+            for start in range(len(doc) - length + 1):
+                window = doc[start:start+length]
+                inv_lists = window2lists.get(window)
+
+                if inv_lists is None:
+                    inv_lists = [index[variant] for variant in self.deletions(window, k) if variant in index]
+                    window2lists[window] = inv_lists
+
+                for inv_list in inv_lists:
+                    for e_idx, e_length, e_k in inv_list:
+                        if abs(e_length - length) <= e_k:
+                            candidates.add((e_idx, start, length))
+
+        # q-gram at position i starts at character i
+        for e_idx, start, length in sorted(candidates):
+            yield e_idx, (start, start + length - self.q)
+
+        return
@@ -0,0 +1,178 @@
+"""
+Exact module.
+
+Classes:
+    - AhoCorasick
+
+"""
+
+import logging
+import collections
+
+from nemex import EntitiesDictionary, Default
+from nemex.utils import qgrams_to_char
+
+
+logger = logging.getLogger(__name__)
+
+
+class AhoCorasick:
+    """Exact matching of all entities in one scan with Aho-Corasick.
+
+    The normalized entities (strings in character mode, token sequences
+    otherwise) are compiled into an Aho-Corasick automaton [1]_, i.e. a trie
+    with failure links, which reports all exact occurrences of all entities
+    in a single linear scan of the document.
+
+    Parameters
+    ----------
+    entities_dict : :class:`~nemex.data.EntitiesDictionary`
+        Instance of entities dictionary.
+
+    char : bool, optional
+        If true, entities are matched character-wise, otherwise token-wise.
+
+    q : int, optional
+        Value of q-gram of the tokens (in character mode).
+
+    References
+    ----------
+    .. [1] Aho, A. V., & Corasick, M. J. (1975). Efficient string matching: an aid to
+       bibliographic search. Communications of the ACM, 18(6), 333-340.
+
+    """
+
+    def __init__(self,
+                 entities_dict: EntitiesDictionary,
+                 char: bool = Default.CHAR,
+                 q: int = Default.TOKEN_THRESH
+                 ) -> None:
+
+        self.entities_dict = entities_dict
+        self.char = char
+        self.q = q
+
+        # state -> {symbol: state}, failure state and (entity id, length) outputs
+        self.goto = [dict()]
+        self.fail = [0]
+        self.out = [list()]
+
+        for e_idx, entity in entities_dict.idx2ent.items():
+
+            # entities shorter than q have no tokens and cannot be located
+            if len(entity) == 0:
+                continue
+
+            self.add(self.symbols(entity.tokens), e_idx)
+
+        self.init_failure_links()
+
+        logger.info("Compiled {} entities into an automaton of {} states".format(len(entities_dict), len(self.goto)))
+
+        return
+
+    def symbols(self, tokens: list):
+        """Converts tokens to the sequence of matched symbols.
+
+        Parameters
+        ----------
+        tokens : list
+            Tokens.
+
+        Returns
+        -------
+        String in character mode, otherwise tokens.
+
+        """
+
+        if self.char:
+            return qgrams_to_char(tokens)
+
+        return tokens
+
+    def add(self, symbols, e_idx: int):
+        """Adds a sequence of symbols of an entity to the trie.
+
+        Parameters
+        ----------
+        symbols : {str, list}
+            Symbols of entity.
+        e_idx : int
+            Entity id.
+
+        """
+
+        state = 0
+
+        for symbol in symbols:
+            next_state = self.goto[state].get(symbol)
+
+            if next_state is None:
+                next_state = len(self.goto)
+                self.goto.append(dict())
+                self.fail.append(0)
+                self.out.append(list())
+                self.goto[state][symbol] = next_state
+
+            state = next_state
+
+        self.out[state].append((e_idx, len(symbols)))
+
+        return
+
+    def init_failure_links(self):
+        """Computes the failure links in breadth-first order and merges the
+        outputs of each state with the outputs of its failure state.
+
+        """
+
+        queue = collections.deque(self.goto[0].values())
+
+        while queue:
+            state = queue.popleft()
+
+            for symbol, next_state in self.goto[state].items():
+                queue.append(next_state)
+
+                fail = self.fail[state]
+                while fail and symbol not in self.goto[fail]:
+                    fail = self.fail[fail]
+
+                fail = self.goto[fail].get(symbol, 0)
+                self.fail[next_state] = fail
+                self.out[next_state] = self.out[next_state] + self.out[fail]
+
+        return
+
+    def __call__(self, doc_tokens):
+        """Scans the document once.
+
+        Yields
+        -------
+        Entity with its start and end position (in tokens).
+
+        """
+
+        if len(self.goto[0]) == 0 or not doc_tokens:
+            return
+
+        goto, fail, out = self.goto, self.fail, self.out
+        hits = list()
+        state = 0
+
+        for end, symbol in enumerate(self.symbols(doc_tokens)):
+            while state and symbol not in goto[state]:
+                state = fail[state]
+
+            state = goto[state].get(symbol, 0)
+
+            for e_idx, length in out[state]:
+                hits.append((e_idx, end - length + 1, end))
+
+        # q-gram at position i starts at character i
+        offset = self.q - 1 if self.char else 0
+
+        for e_idx, start, end in sorted(hits):
+            yield e_idx, (start, end - offset)
+
+        return
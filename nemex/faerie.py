@@ -7,7 +7,9 @@ Classes:
 """
 
 import math
+import pickle
 import logging
+import collections
 
 from nemex import FaerieDataStructure, InvertedIndex, Similarity, EntitiesDictionary, Default
 from nemex import pruning
@@ -45,6 +47,15 @@ class Faerie(FaerieDataStructure, Similarity):
         Pruning method to apply before counting. If none provided, no pruning
         will be applied.
 
+    prefix_filter : bool, optional
+        If true, the inverted index holds only the prefix of each entity's tokens,
+        ordered by global rarity, that is required by the overlap bound Tl
+        (see :class:`~nemex.data.InvertedIndex`).
+
+    length_partition : bool, optional
+        If true, inverted lists are partitioned by entity length, so that
+        entities which cannot fit a (short) document are skipped at lookup.
+
     See Also
     --------
     :class:`~nemex.data.FaerieDataStructure`
@@ -66,7 +77,9 @@ class Faerie(FaerieDataStructure, Similarity):
                  similarity: str = Default.SIMILARITY,
                  t: float = Default.SIM_THRESH_TOKEN,
                  q: int = Default.TOKEN_THRESH,
-                 pruner: str = Default.PRUNER
+                 pruner: str = Default.PRUNER,
+                 prefix_filter: bool = Default.PREFIX_FILTER,
+                 length_partition: bool = Default.LENGTH_PARTITION
                  ) -> None:
 
         FaerieDataStructure.__init__(self, entities_dict)
@@ -99,14 +112,22 @@ class Faerie(FaerieDataStructure, Similarity):
 
         self.prune_method = pruner
         
+        self.min_Le = 0
+        self.max_Te = 0
+        self.min_Tl = 0
+
         # pre-compute length bounds
         self.init_bounds()
 
-        self.min_Le = 0
-        self.max_Te = 0
+        # document-level gate
+        self.gate_tokens = set()
+        self.gate_multiplicity = 0
+        self.update_gate(self.entities_dict)
 
         # create inverted index
-        self.inv_index = InvertedIndex.from_entities_dict(entities_dict)
+        self.prefix_filter = prefix_filter
+        self.length_partition = length_partition
+        self.inv_index = InvertedIndex.from_entities_dict(entities_dict, prefix_filter, length_partition)
 
         return
     
@@ -176,29 +197,195 @@ class Faerie(FaerieDataStructure, Similarity):
 
         """
 
-        all_Le = list()
-        all_Te = list()
-        del_ents = list()
+        kept, del_ents = self._init_entity_bounds(self.entities_dict)
+
+        self.min_Le = min((self.entities_dict[e_idx].Le for e_idx in kept), default=0)  # T_E
+        self.max_Te = max((self.entities_dict[e_idx].Te for e_idx in kept), default=0)  # ⊥_E
+        self.min_Tl = min((self.entities_dict[e_idx].Tl for e_idx in kept), default=0)
         
-        for e_idx in self.entities_dict:
-            Le, Te = self._compute_upper_lower_bounds(e_idx)
-            Tl = self._compute_overlap_lower_bound(e_idx)
+        logger.info("Global length constraints with this dictionary : {} <= |s| <= {}".format(self.min_Le, self.max_Te))
+
+        return
+
+    def _init_entity_bounds(self, indexes) -> (list, list):
+        """Computes the bounds (⊥e, Te, Tl) of the given entities and drops the
+        entities too short for them from the dictionary.
+
+        Parameters
+        ----------
+        indexes : iterable
+            Entity ids.
+
+        Returns
+        -------
+        Lists of ids of kept and of dropped entities.
+
+        """
+
+        kept = list()
+        del_ents = list()
+
+        for e_idx in indexes:
+            try:
+                Le, Te = self._compute_upper_lower_bounds(e_idx)
+                Tl = self._compute_overlap_lower_bound(e_idx)
+            except ValueError:
+                # entity shorter than q or threshold
+                del_ents.append(e_idx)
+                continue
+
             if any(i < 0 for i in (Le, Te, Tl)):
                 del_ents.append(e_idx)
             else:
-                all_Le.append(Le)
-                all_Te.append(Te)
-        
+                # entities are only reached through a shared token, so at least one
+                # is required (Tl = 0 also breaks the batch-count window search)
+                self.entities_dict[e_idx].Tl = max(Tl, 1)
+                kept.append(e_idx)
+
         for e_idx in del_ents:
             del self.entities_dict[e_idx]
 
-        self.min_Le = min(all_Le)  # T_E
-        self.max_Te = max(all_Te)  # ⊥_E
-        
-        logger.info("Global length constraints with this dictionary : {} <= |s| <= {}".format(self.min_Le, self.max_Te))
+        if del_ents:
+            logger.info("Dropped {} entities too short for the length bounds".format(len(del_ents)))
+
+        return kept, del_ents
+
+    def add_entities(self, indexes) -> list:
+        """Indexes entities added to the dictionary after the model was built.
+        The global bounds are widened to cover them.
+
+        Parameters
+        ----------
+        indexes : iterable
+            Ids of entities in the dictionary.
+
+        Returns
+        -------
+        Ids of indexed entities (entities too short for the bounds are dropped).
+
+        """
+
+        kept, _ = self._init_entity_bounds(list(indexes))
+
+        for e_idx in kept:
+            entity = self.entities_dict[e_idx]
+
+            if self.min_Le == self.max_Te == 0:
+                self.min_Le, self.max_Te, self.min_Tl = entity.Le, entity.Te, entity.Tl
+            else:
+                self.min_Le = min(self.min_Le, entity.Le)
+                self.max_Te = max(self.max_Te, entity.Te)
+                self.min_Tl = min(self.min_Tl, entity.Tl)
+
+            self.inv_index.add(e_idx, self.entities_dict)
+
+        self.update_gate(kept)
+
+        return kept
+
+    def update_gate(self, indexes):
+        """Adds the tokens of entities to the document-level gate (see :meth:`can_match`).
+
+        Parameters
+        ----------
+        indexes : iterable
+            Entity ids.
+
+        """
+
+        for e_idx in indexes:
+            tokens = self.entities_dict[e_idx].tokens
+            self.gate_tokens.update(tokens)
+            self.gate_multiplicity = max([self.gate_multiplicity] + list(collections.Counter(tokens).values()))
+
+        return
+
+    def can_match(self, doc_tokens: list) -> bool:
+        """Checks cheaply whether a document may hold any candidate.
+
+        A candidate of an entity e holds at least Tl positions of its position
+        list Pe, where a document position counts once per occurrence of its
+        token in e. Thus, a document needs at least min(Tl) / m positions with
+        dictionary tokens, where m is the highest multiplicity of a token in an
+        entity. The check needs no Faerie state, and set lookups only.
+
+        Parameters
+        ----------
+        doc_tokens : list
+            Document tokens.
+
+        Returns
+        -------
+        False if the document cannot hold any candidate.
+
+        """
+
+        # no gate (e.g. models on a shared index)
+        if self.gate_tokens is None:
+            return True
+
+        if self.gate_tokens.isdisjoint(doc_tokens):
+            return False
+
+        if self.min_Tl <= self.gate_multiplicity:
+            return True
+
+        hits = sum(map(self.gate_tokens.__contains__, doc_tokens))
+
+        return hits * self.gate_multiplicity >= self.min_Tl
+
+    def remove_entities(self, indexes):
+        """Removes entities from the inverted index and the dictionary. The
+        global bounds are kept, as they still cover the remaining entities.
+
+        Parameters
+        ----------
+        indexes : iterable
+            Entity ids.
+
+        """
+
+        for e_idx in indexes:
+            self.inv_index.remove(e_idx, self.entities_dict)
+            del self.entities_dict[e_idx]
 
         return
     
+    def save(self, filename: str):
+        """Saves the model (dictionary, bounds and inverted index) to file.
+
+        Parameters
+        ----------
+        filename : str
+            Filename for saving data.
+
+        """
+
+        with open(filename, "wb") as wf:
+            pickle.dump(self, wf)
+
+        return
+
+    @classmethod
+    def load_from_file(cls, filename: str):
+        """Loads the model from file.
+
+        Parameters
+        ----------
+        filename : str
+            Filename for loading data.
+
+        Returns
+        -------
+        Faerie model.
+
+        """
+
+        with open(filename, "rb") as rf:
+            faerie = pickle.load(rf)
+
+        return faerie
+
     def find_candidates(self,
                         Pe: list,
                         Le: int,
@@ -326,6 +513,114 @@ class Faerie(FaerieDataStructure, Similarity):
         
         return count_overlap >= T
     
+    def process_entity(self, e: int, Pe: list):
+        """Applies pruning and candidate search to the position list of an entity.
+
+        Parameters
+        ----------
+        e : int
+            Entity id.
+
+        Pe : list
+            Sorted position list of entity in document.
+
+        Yields
+        -------
+        Candidate start and end position in document.
+
+        """
+
+        # reset count array
+        self.reset_count()
+
+        # get entity specific attributes
+        # note: len of entity is also pre-computed
+        entity = self.entities_dict[e]
+        entity_len = len(entity)
+        Le, Te, Tl = entity.Le, entity.Te, entity.Tl
+        logger.debug("Analyzing e={} (id={}) Pe={} ⊥e={} Te={} Tl={}".format(entity, e, Pe, Le, Te, Tl))
+
+        # here we set pruning arguments
+        # first common args
+        pruner_args = (Pe, Le, Te, Tl,)
+
+        # "batch_count" has tighter upper bounds on window size for jaccard,
+        # dice and cosine which needs to be taken care of (cf. last lines pg. 534)
+        if self.prune_method == Pruner.BATCH_COUNT:
+            pruner_args = pruner_args + (self.tighter_upper_window_size, entity_len, self.t)
+
+        # "bucket_count" has tighter neighbor difference bounds for edit distance
+        # and similarity which needs to be taken care of (cf. pg. 534 first column 5th para)
+        elif self.prune_method == Pruner.BUCKET_COUNT:
+
+            if self.similarity == Sim.EDIT_SIM:
+                bound_args = (entity_len, self.t, self.q)
+
+            elif self.similarity == Sim.EDIT_DIST:
+                bound_args = (self.t, self.q)
+
+            else:
+                bound_args = ()
+
+            pruner_args = pruner_args + (self.tighter_neighbor_bound, *bound_args)
+
+        # apply pruning techniques to count entity's occurrence in filtered candidates only
+        count_spans = self.pruner.filter(*pruner_args)
+
+        # further prune to get final candidates
+        candidate_spans = self.find_candidates(Pe, Le, Te, count_spans, entity_len)
+
+        for start, length in candidate_spans:
+            yield start, start + length - 1
+
+        return
+
+    def position_lists(self, doc_tokens: list) -> collections.OrderedDict:
+        """Collects the position lists of all entities hitting a document at once,
+        as :meth:`__call__` does entity by entity with its heap.
+
+        Parameters
+        ----------
+        doc_tokens : list
+            Document tokens.
+
+        Returns
+        -------
+        Mapping from entity id to sorted position list Pe, in ascending order of
+        entity ids.
+
+        """
+
+        entity2lists = collections.defaultdict(list)
+
+        for positions, inv_list in self.inv_index[doc_tokens].values():
+            for e in inv_list:
+                entity2lists[e].append(positions)
+
+        return collections.OrderedDict(
+            (e, self.merge_positions(entity2lists[e])) for e in sorted(entity2lists)
+        )
+
+    def process_entities(self, items):
+        """Applies :meth:`process_entity` to several entities.
+
+        Parameters
+        ----------
+        items : iterable
+            Pairs of entity id and sorted position list Pe.
+
+        Yields
+        -------
+        Minimal entity with its start and end position.
+
+        """
+
+        for e, Pe in items:
+            for i_start, j_end in self.process_entity(e, Pe):
+                yield e, (i_start, j_end)
+
+        return
+
     def __call__(self, doc_tokens):
         """Main Faerie algorithm (cf. Algorithm 2. in [1]_).
         
@@ -334,26 +629,31 @@ class Faerie(FaerieDataStructure, Similarity):
         :meth:`~nemex.data.FaerieDataStructure.step`
             A convenience method around single Faerie update.
 
+        :meth:`~nemex.faerie.Faerie.process_entity`
+            Pruning and candidate search for a single entity.
+
         Yields
         -------
         Minimal entity with its start and end position.
         
         """
 
-        # get inverted lists of doc tokens
+        # get inverted lists of distinct doc tokens
         inv_lists = self.inv_index[doc_tokens]
         
         # if we don't match any token of document to any of entities'
         if len(inv_lists) == 0:
             logger.info("No matching tokens found!")
-            return dict()
+            return
         
         # initialize faerie data-structures
         self.init_from_inv_lists(inv_lists)
 
         # initial minimal entity
-        e = self.heap[0]
-        Pe = list()
+        e = self.heap[0][0]
+
+        # position lists popped for current entity
+        position_lists = list()
 
         # counter for number of iterations (should be equal to sum(length of inv. lists))
         i = 0
@@ -368,73 +668,27 @@ class Faerie(FaerieDataStructure, Similarity):
             we use ``stop`` as flag to break the loop because
             while len(self.heap) > 0 does not process last entity
             '''
-            ei, pi, stop = self.step(e)
+            ei, positions, stop = self.step()
             
             pop_sequence.append(ei)
             
             '''
-            while we have same entity, we keep popping it to build position list
+            while we have same entity, we keep popping it to collect its position lists
             cf. pg 535 first column, first paragraph on Complexity
             '''
             if ei == e:
-                Pe.append(pi)
+                position_lists.append(positions)
 
             # else we see a new entity
             else:
+                Pe = self.merge_positions(position_lists)
 
-                # this should be equal to pre-computed list
-                assert Pe == self.ent2positions[e], \
-                    "Invalid position list, expected `{}` but collected `{}`".format(self.ent2positions[e], Pe)
-                
-                '''
-                get entity specific attributes
-                note: len of entity is also pre-computed
-                '''
-                entity = self.entities_dict[e]
-                entity_len = len(entity)
-                Le, Te, Tl = entity.Le, entity.Te, entity.Tl
-                logger.debug("Analyzing e={} (id={}) Pe={} ⊥e={} Te={} Tl={}".format(entity, e, Pe, Le, Te, Tl))
-                
-                # here we set pruning arguments
-                # first common args
-                pruner_args = (Pe, Le, Te, Tl,)
-                
-                # "batch_count" has tighter upper bounds on window size for jaccard,
-                # dice and cosine which needs to be taken care of (cf. last lines pg. 534)
-                if self.prune_method == Pruner.BATCH_COUNT:
-                    pruner_args = pruner_args + (self.tighter_upper_window_size, entity_len, self.t)
-
-                # "bucket_count" has tighter neighbor difference bounds for edit distance
-                # and similarity which needs to be taken care of (cf. pg. 534 first column 5th para)
-                elif self.prune_method == Pruner.BUCKET_COUNT:
-
-                    if self.similarity == Sim.EDIT_SIM:
-                        bound_args = (entity_len, self.t, self.q)
-
-                    elif self.similarity == Sim.EDIT_DIST:
-                        bound_args = (self.t, self.q)
-
-                    else:
-                        bound_args = ()
-
-                    pruner_args = pruner_args + (self.tighter_neighbor_bound, *bound_args)
-                
-                # apply pruning techniques to count entity's occurrence in filtered candidates only
-                count_spans = self.pruner.filter(*pruner_args)
-
-                # further prune to get final candidates
-                candidate_spans = self.find_candidates(Pe, Le, Te, count_spans, entity_len)
-                
-                for start, length in candidate_spans:
-                    i, j = start, start + length - 1
-                    yield e, (i, j)
+                for i_start, j_end in self.process_entity(e, Pe):
+                    yield e, (i_start, j_end)
                 
                 # make new (different) entity as current entity
                 e = ei
-                Pe = [pi]
-
-                # reset count array as well
-                self.reset_count()
+                position_lists = [positions]
             
             i += 1
             if stop:
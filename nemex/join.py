@@ -0,0 +1,273 @@
+"""
+Join module.
+
+Functions:
+    - similarity_join
+
+"""
+
+import bisect
+import logging
+import collections
+import itertools
+import multiprocessing
+
+from nemex import EntitiesDictionary, InvertedIndex, Similarity, Verify, Default
+from nemex.utils import Sim, qgrams_to_char
+
+
+logger = logging.getLogger(__name__)
+
+# join state of worker processes
+_state = None
+
+
+def init_bounds(sim: Similarity, entities_dict: EntitiesDictionary, t: float, q: int) -> dict:
+    """Computes the length bounds (⊥e, Te) and the overlap lower bound (Tl) of
+    all entities, as in :meth:`~nemex.faerie.Faerie.init_bounds`. The bounds
+    are returned instead of set on the entities, which may be shared with a
+    model using other bounds.
+
+    Parameters
+    ----------
+    sim : Similarity
+        Similarity interface.
+    entities_dict : EntitiesDictionary
+        Entities dictionary.
+    t : float
+        Similarity threshold.
+    q : int
+        Token size.
+
+    Returns
+    -------
+    Mapping from id of entities with valid bounds to (⊥e, Te, Tl), in ascending
+    order of ids.
+
+    """
+
+    bounds = dict()
+
+    for e_idx in sorted(entities_dict.idx2ent):
+        length = len(entities_dict[e_idx])
+
+        try:
+            if sim.similarity == Sim.EDIT_SIM:
+                Le, Te = sim.find_min_size(length, t, q), sim.find_max_size(length, t, q)
+            else:
+                Le, Te = sim.find_min_size(length, t), sim.find_max_size(length, t)
+
+            if sim.similarity in Sim.CHAR_BASED:
+                Tl = sim.find_lower_bound_of_entity(length, t, q)
+            else:
+                Tl = sim.find_lower_bound_of_entity(length, t)
+
+        except ValueError:
+            continue
+
+        if any(i < 0 for i in (Le, Te, Tl)):
+            continue
+
+        # entities are only reached through a shared token, so at least one is required
+        bounds[e_idx] = (Le, Te, max(Tl, 1))
+
+    return bounds
+
+
+def representation(entity, similarity: str):
+    """Returns the representation of an entity for verification.
+
+    Parameters
+    ----------
+    entity : Entity
+        Entity.
+    similarity : str
+        Similarity method.
+
+    Returns
+    -------
+    String for character-based similarity, tokens otherwise.
+
+    """
+
+    if similarity in Sim.CHAR_BASED:
+        return qgrams_to_char(entity.tokens)
+
+    return entity.tokens
+
+
+def init_worker(state: dict):
+    """Sets the join state of a worker process."""
+
+    global _state
+    _state = state
+
+    return
+
+
+def probe(s_ids: list, state: dict = None) -> list:
+    """Probes the prefix index of R with entities of S.
+
+    Parameters
+    ----------
+    s_ids : list
+        Entity ids of S.
+    state : dict, optional
+        Join state. The state of the worker process is used if none provided.
+
+    Returns
+    -------
+    List of (r_idx, s_idx, score) of similar pairs.
+
+    """
+
+    state = _state if state is None else state
+
+    R, S, self_join = state["R"], state["S"], state["self_join"]
+    R_bounds, S_bounds = state["R_bounds"], state["S_bounds"]
+    token2entities, token2lengths = state["token2entities"], state["token2lengths"]
+    similarity, t = state["similarity"], state["t"]
+
+    pairs = list()
+
+    for s_idx in s_ids:
+        s = S[s_idx]
+        s_len = len(s)
+        s_repr = representation(s, similarity)
+        s_Le, s_Te, s_Tl = S_bounds[s_idx]
+        candidates = set()
+
+        for token in InvertedIndex.prefix(s.tokens, s_Tl, state["token2freq"]):
+            if token not in token2entities:
+                continue
+
+            entities, lengths = token2entities[token], token2lengths[token]
+
+            # inverted lists are sorted by length: skip too short, stop at too long
+            for k in range(bisect.bisect_left(lengths, s_Le), len(entities)):
+                r_idx = entities[k]
+
+                if lengths[k] > s_Te:
+                    break
+
+                # in a self-join, each pair is found from its longer (or later) entity
+                if self_join and (lengths[k], r_idx) >= (s_len, s_idx):
+                    break
+
+                candidates.add(r_idx)
+
+        for r_idx in candidates:
+            r_Le, r_Te, _ = R_bounds[r_idx]
+
+            if not (r_Le <= s_len <= r_Te):
+                continue
+
+            valid, score = Verify.check(representation(R[r_idx], similarity), s_repr, similarity, t)
+
+            if valid:
+                pairs.append((r_idx, s_idx, score))
+
+    return pairs
+
+
+def similarity_join(R: EntitiesDictionary,
+                    S: EntitiesDictionary = None,
+                    similarity: str = Default.SIMILARITY,
+                    t: float = Default.SIM_THRESH_CHAR,
+                    q: int = Default.TOKEN_THRESH,
+                    processes: int = 1,
+                    chunk_size: int = 1000
+                    ) -> list:
+    """Finds all similar pairs of entities of two dictionaries, or of one.
+
+    The rarest |r| - Tl + 1 tokens (prefix) of each entity of R are indexed, and
+    each entity s of S probes the index with its own prefix, since a similar
+    pair shares at least Tl tokens and so a prefix token. Inverted lists are
+    sorted by entity length, so that entities outside the length bounds
+    [⊥s, Ts] are skipped by binary search and early stopping, and in a
+    self-join each pair is only probed from its longer entity. Candidates are
+    verified with :meth:`~nemex.similarities.Verify.check`.
+
+    Like Faerie, the join drops entities too short for the bounds of the
+    similarity and requires similar pairs to share at least one token.
+
+    Parameters
+    ----------
+    R : EntitiesDictionary
+        Entities dictionary.
+    S : EntitiesDictionary, optional
+        Entities dictionary, tokenized like R. If none provided, R is joined
+        with itself.
+    similarity : str
+        Similarity method (matching the tokenization of the dictionaries).
+    t : float
+        Similarity threshold.
+    q : int
+        Size of q-grams (for character-based similarities).
+    processes : int
+        Number of processes probing chunks of S.
+    chunk_size : int
+        Number of entities of S per chunk.
+
+    Returns
+    -------
+    Sorted list of (uid of R, uid of S, score) of similar pairs. In a self-join,
+    the first uid is the smaller, and aliases of collapsed entities are pairs.
+
+    """
+
+    self_join = S is None
+    S = R if self_join else S
+
+    sim = Similarity()
+    sim.similarity = similarity
+
+    R_bounds = init_bounds(sim, R, t, q)
+    S_bounds = R_bounds if self_join else init_bounds(sim, S, t, q)
+
+    logger.info("Joining {} x {} entities".format(len(R_bounds), len(S_bounds)))
+
+    # prefix index of R, with inverted lists sorted by length
+    token2freq = InvertedIndex.token_frequencies(R.subset(R_bounds))
+    token2entities = collections.defaultdict(list)
+
+    for e_idx, (_, _, Tl) in R_bounds.items():
+        for token in InvertedIndex.prefix(R[e_idx].tokens, Tl, token2freq):
+            token2entities[token].append(e_idx)
+
+    token2lengths = dict()
+
+    for token, entities in token2entities.items():
+        entities.sort(key=lambda e_idx: (len(R[e_idx]), e_idx))
+        token2lengths[token] = [len(R[e_idx]) for e_idx in entities]
+
+    state = dict(
+        R=R, S=S, R_bounds=R_bounds, S_bounds=S_bounds, self_join=self_join, similarity=similarity, t=t,
+        token2freq=token2freq, token2entities=dict(token2entities), token2lengths=token2lengths
+    )
+
+    # probe sorted by length
+    S_ids = sorted(S_bounds, key=lambda e_idx: (len(S[e_idx]), e_idx))
+    chunks = [S_ids[k:k+chunk_size] for k in range(0, len(S_ids), chunk_size)]
+
+    if processes > 1:
+        with multiprocessing.Pool(processes, initializer=init_worker, initargs=(state,)) as pool:
+            pairs = list(itertools.chain.from_iterable(pool.imap_unordered(probe, chunks)))
+    else:
+        pairs = list(itertools.chain.from_iterable(probe(chunk, state) for chunk in chunks))
+
+    # pairs of aliases
+    results = list()
+
+    for r_idx, s_idx, score in pairs:
+        for r_uid, s_uid in itertools.product(R[r_idx].uids, S[s_idx].uids):
+            results.append((min(r_uid, s_uid), max(r_uid, s_uid), score) if self_join else (r_uid, s_uid, score))
+
+    if self_join:
+        perfect = 0 if similarity == Sim.EDIT_DIST else 1.0
+
+        for e_idx in R:
+            for r_uid, s_uid in itertools.combinations(sorted(R[e_idx].uids), 2):
+                results.append((r_uid, s_uid, perfect))
+
+    return sorted(results)
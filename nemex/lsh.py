@@ -0,0 +1,213 @@
+"""
+LSH module.
+
+Classes:
+    - MinHashLSH
+
+"""
+
+import zlib
+import random
+import logging
+import collections
+
+from nemex import EntitiesDictionary, Similarity, Default
+from nemex.utils import Sim
+
+
+logger = logging.getLogger(__name__)
+
+
+class MinHashLSH(Similarity):
+    """Approximate candidate generation for token-based similarities with MinHash-LSH.
+
+    Each entity's token set is signed with ``bands * rows`` MinHash values [1]_,
+    and the signature is split into ``bands`` bands of ``rows`` values, each
+    hashed into its own table. From each document position, windows are
+    extended one token at a time and signed incrementally, i.e. the signature
+    of a window is the element-wise minimum of the signature of the window
+    one token shorter and the hash values of the new token. A window is a
+    candidate for the entities it collides with in any band, if its length is
+    within their bounds [⊥e, Te].
+
+    A pair with Jaccard similarity s collides with probability
+    1 - (1 - s^rows)^bands, so more bands raise recall and more rows reduce
+    the number of candidates. Unlike Faerie, the engine may miss matches.
+
+    Parameters
+    ----------
+    entities_dict : :class:`~nemex.data.EntitiesDictionary`
+        Instance of entities dictionary.
+
+    similarity : str, {"cosine", "jaccard", "dice"}, optional
+        Similarity function.
+
+    t : float, optional
+        Threshold value for the similarity function.
+
+    bands : int, optional
+        Number of bands.
+
+    rows : int, optional
+        Number of MinHash values per band.
+
+    seed : int, optional
+        Seed of the hash functions.
+
+    References
+    ----------
+    .. [1] Broder, A. Z. (1997, June). On the resemblance and containment of documents.
+       In Proceedings. Compression and Complexity of SEQUENCES 1997 (pp. 21-29). IEEE.
+
+    """
+
+    # Mersenne prime for universal hashing
+    PRIME = (1 << 61) - 1
+
+    def __init__(self,
+                 entities_dict: EntitiesDictionary,
+                 similarity: str = Sim.JACCARD,
+                 t: float = Default.SIM_THRESH_TOKEN,
+                 bands: int = Default.LSH_BANDS,
+                 rows: int = Default.LSH_ROWS,
+                 seed: int = 1
+                 ) -> None:
+
+        Similarity.__init__(self)
+
+        if similarity not in Sim.TOKEN_BASED:
+            raise ValueError("MinHash-LSH requires 'cosine', 'dice' or 'jaccard' similarity.")
+
+        self.entities_dict = entities_dict
+        self.similarity = similarity
+        self.t = t
+        self.bands = bands
+        self.rows = rows
+
+        # random hash functions h(x) = (a * x + b) mod p
+        rng = random.Random(seed)
+        self.coeffs = [(rng.randrange(1, self.PRIME), rng.randrange(0, self.PRIME)) for _ in range(bands * rows)]
+
+        # band -> {band values: list of entity ids}
+        self.tables = [collections.defaultdict(list) for _ in range(bands)]
+
+        # entity id -> (⊥e, Te)
+        self.bounds = dict()
+
+        for e_idx, entity in entities_dict.idx2ent.items():
+            if len(entity) == 0:
+                continue
+
+            signature = self.sign(entity.tokens)
+
+            for band, key in enumerate(self.band_keys(signature)):
+                self.tables[band][key].append(e_idx)
+
+            self.bounds[e_idx] = (
+                max(self.find_min_size(len(entity), t), 1),
+                self.find_max_size(len(entity), t)
+            )
+
+        self.min_Le = min((Le for Le, Te in self.bounds.values()), default=0)
+        self.max_Te = max((Te for Le, Te in self.bounds.values()), default=0)
+
+        logger.info("Signed {} entities into {} bands of {} rows".format(len(self.bounds), bands, rows))
+
+        return
+
+    def hash_values(self, token: str) -> list:
+        """Computes the values of all hash functions for a token.
+
+        Parameters
+        ----------
+        token : str
+            Token.
+
+        Returns
+        -------
+        List of hash values.
+
+        """
+
+        x = zlib.crc32(token.encode("utf-8"))
+
+        return [(a * x + b) % self.PRIME for a, b in self.coeffs]
+
+    def sign(self, tokens: list) -> list:
+        """Computes the MinHash signature of a token set.
+
+        Parameters
+        ----------
+        tokens : list
+            Tokens.
+
+        Returns
+        -------
+        Signature.
+
+        """
+
+        signature = None
+
+        for token in set(tokens):
+            values = self.hash_values(token)
+            signature = values if signature is None else list(map(min, signature, values))
+
+        return signature
+
+    def band_keys(self, signature: list) -> list:
+        """Splits a signature into bands.
+
+        Parameters
+        ----------
+        signature : list
+            Signature.
+
+        Returns
+        -------
+        List of band values.
+
+        """
+
+        return [tuple(signature[band * self.rows:(band + 1) * self.rows]) for band in range(self.bands)]
+
+    def __call__(self, doc_tokens):
+        """Signs all document windows within the global length bounds.
+
+        Yields
+        -------
+        Entity with its start and end position.
+
+        """
+
+        if not self.bounds or not doc_tokens:
+            return
+
+        token2values = dict()
+        candidates = set()
+
+        for token in doc_tokens:
+            if token not in token2values:
+                token2values[token] = self.hash_values(token)
+
+        for start in range(len(doc_tokens)):
+            signature = None
+
+            for end in range(start, min(start + self.max_Te, len(doc_tokens))):
+                values = token2values[doc_tokens[end]]
+                signature = values if signature is None else list(map(min, signature, values))
+
+                length = end - start + 1
+                if length < self.min_Le:
+                    continue
+
+                for band, key in enumerate(self.band_keys(signature)):
+                    for e_idx in self.tables[band].get(key, ()):
+                        Le, Te = self.bounds[e_idx]
+                        if Le <= length <= Te:
+                            candidates.add((e_idx, start, end))
+
+        for e_idx, start, end in sorted(candidates):
+            yield e_idx, (start, end)
+
+        return
@@ -7,11 +7,27 @@ Classes:
 """
 
 import time
+import bisect
+import pickle
+import hashlib
+import itertools
+import collections
+import multiprocessing
 
-from .data import EntitiesDictionary
+from .data import EntitiesDictionary, InvertedIndex
 from .utils import *
-from .similarities import Verify
+from .similarities import Similarity, Verify
 from .faerie import Faerie
+from .sharding import ShardedFaerie
+from .deletion import DeletionNeighborhood
+from .segment import SegmentIndex
+from .trie import TrieIndex
+from .exact import AhoCorasick
+from .lsh import MinHashLSH
+from .cascade import RegionFilter
+from .corpus import CorpusIndex
+from .cache import ResultCache, sentence_spans
+from .columns import MatchColumns
 
 
 logging.basicConfig(format='%(asctime)s : %(levelname)s : %(message)s', level=logging.INFO)
@@ -40,11 +56,67 @@ class Nemex:
     similarity : str
         Similarity method.
     t : int
-        Similarity threshold.
+        Similarity threshold. For 'edit_dist', 0 selects the exact engine.
     pruner : str
         Pruning method.
     verify : bool
         If true, verify candidates.
+    collapse : bool
+        If true, entities with identical tokens are indexed once and their
+        matches are reported for each alias.
+    prefix_filter : bool
+        If true, indexes only the rarest tokens of each entity required by its
+        overlap bound and completes the counts for hit entities at query time.
+    shards : int
+        Number of shards (entity id ranges) with their own bounds and index.
+    shard_processes : bool
+        If true, shards are built in parallel and queried in worker processes.
+    short_max_len : int
+        Entities up to this number of characters are matched with a deletion
+        neighborhood index instead of Faerie, which drops entities too short
+        for its bounds. If 0, all entities go to Faerie.
+    engine : str
+        Extraction engine, "faerie", "exact" (Aho-Corasick), for 'edit_dist'
+        "segment" (Pass-Join) or "trie" (Levenshtein automaton over a trie), or
+        for token-level similarities "lsh" (MinHash-LSH, approximate). The
+        "segment" and "trie" engines find all substrings within the edit
+        distance threshold, a superset of the matches of "faerie".
+    exact_first : bool
+        If true, exact matches are found in a pre-pass and reported without
+        verification. Approximate candidates of an entity within its exact
+        matches are skipped before verification. The approximate engines still
+        run on the whole document, so the pre-pass deduplicates and saves
+        verifications, not candidate generation.
+    bands : int
+        Number of LSH bands (more bands raise recall of the "lsh" engine).
+    rows : int
+        Number of MinHash values per LSH band (more rows reduce candidates).
+    cascade : bool
+        If true, Faerie runs only on the regions of the document that can hold
+        candidates, found by a coarse filter on dictionary tokens. It pays off
+        for documents with many dictionary tokens too scattered for candidates
+        (see ``benchmarks/cascade.py``), and costs a few percent otherwise.
+    gate : bool
+        If true, documents with too few positions of dictionary tokens for any
+        candidate are answered without running Faerie (see
+        :meth:`~nemex.faerie.Faerie.can_match`). Only used with the Faerie
+        engine without shards, exact pre-pass or short entity matching.
+    cache : ResultCache, optional
+        Cache of match lists of documents (or sentences), keyed by the model
+        configuration and the normalized document.
+    spans : str
+        Match spans index the "normalized" document string of the output
+        (lower cased, and at token level with single spaces), or the "original"
+        document, which is then returned as is (see
+        :meth:`~nemex.utils.Tokenizer.tokenize_offsets`). Reverse extraction
+        of an indexed corpus supports normalized spans only.
+    strip_accents : bool
+        If true, strips the accents of Latin letters of documents and entities.
+    collapse_whitespace : bool
+        If true, replaces runs of whitespace with one space before tokenization.
+    length_partition : bool
+        If true, inverted lists are partitioned by entity length, so that
+        entities which cannot fit a (short) document are skipped at lookup.
     """
 
     def __init__(self,
@@ -57,7 +129,23 @@ class Nemex:
                  similarity: str = Default.SIMILARITY,
                  t: int = Default.SIM_THRESH_CHAR,
                  pruner: str = Default.PRUNER,
-                 verify: bool = Default.VERIFY
+                 verify: bool = Default.VERIFY,
+                 collapse: bool = Default.COLLAPSE,
+                 prefix_filter: bool = Default.PREFIX_FILTER,
+                 shards: int = Default.SHARDS,
+                 shard_processes: bool = Default.SHARD_PROCESSES,
+                 short_max_len: int = Default.SHORT_MAX_LEN,
+                 engine: str = Default.ENGINE,
+                 exact_first: bool = Default.EXACT_FIRST,
+                 bands: int = Default.LSH_BANDS,
+                 rows: int = Default.LSH_ROWS,
+                 cascade: bool = Default.CASCADE,
+                 gate: bool = Default.GATE,
+                 cache: ResultCache = None,
+                 spans: str = Default.SPANS,
+                 strip_accents: bool = Default.STRIP_ACCENTS,
+                 collapse_whitespace: bool = Default.COLLAPSE_WHITESPACE,
+                 length_partition: bool = Default.LENGTH_PARTITION
                  ) -> None:
 
         # character-level
@@ -67,8 +155,12 @@ class Nemex:
 
             if similarity == Sim.EDIT_DIST:
                 t = int(t)
-                if not t >= 1:
-                    raise ValueError("Edit distance threshold must be >= 1")
+                if not t >= 0:
+                    raise ValueError("Edit distance threshold must be >= 0")
+
+                # only exact matches are within distance 0
+                if t == 0:
+                    engine = Engine.EXACT
             else:
                 if not (0. < t <= 1.0):
                     raise ValueError("Similarity score should be in (0, 1]")
@@ -86,8 +178,26 @@ class Nemex:
             if not (0. < t <= 1.0):
                 raise ValueError("Similarity score should be in (0, 1]")
 
+        if engine not in (Engine.FAERIE, Engine.EXACT) + Engine.EDIT_DIST_BASED + Engine.TOKEN_BASED:
+            raise ValueError("Unknown engine '{}'.".format(engine))
+
+        if engine in Engine.EDIT_DIST_BASED and similarity != Sim.EDIT_DIST:
+            raise ValueError("Engine '{}' requires 'edit_dist' similarity.".format(engine))
+
+        if engine in Engine.TOKEN_BASED and similarity not in Sim.TOKEN_BASED:
+            raise ValueError("Engine '{}' requires a token-based similarity.".format(engine))
+
+        if engine != Engine.FAERIE and shards > 1:
+            raise ValueError("Sharding requires the Faerie engine.")
+
+        if cascade and (engine != Engine.FAERIE or shards > 1):
+            raise ValueError("Cascade requires the Faerie engine without shards.")
+
+        if spans not in ("normalized", "original"):
+            raise ValueError("Unknown spans '{}', use 'normalized' or 'original'.".format(spans))
+
         # tokenizer
-        self.tokenizer = Tokenizer(char, q, special_char, unique, lower)
+        self.tokenizer = Tokenizer(char, q, special_char, unique, lower, strip_accents, collapse_whitespace)
         self.char = char
 
         # log start
@@ -96,10 +206,10 @@ class Nemex:
 
         # create entity dictionary
         if isinstance(list_or_file_entities, list):
-            self.E = EntitiesDictionary.from_list(list_or_file_entities, self.tokenizer.tokenize)
+            self.E = EntitiesDictionary.from_list(list_or_file_entities, self.tokenizer.tokenize, collapse)
         elif isinstance(list_or_file_entities, str):
             # else it is file of tsv id\tent lines or just text of ent lines
-            self.E = EntitiesDictionary.from_tsv_file(list_or_file_entities, self.tokenizer.tokenize)
+            self.E = EntitiesDictionary.from_tsv_file(list_or_file_entities, self.tokenizer.tokenize, collapse)
         else:
             logger.error("Bad input type.")
             logger.error("Expected `list` or `str`, but got ", type(list_or_file_entities))
@@ -108,37 +218,781 @@ class Nemex:
         # caching
         self.cache_ent_repr = dict()
 
+        # worker processes of entity-partitioned extraction (started on first use)
+        self.entity_pool = None
+
+        # whole-string lookup index (built on first lookup)
+        self.lookup_postings = None
+        self.length2entities = None
+        self.lookup_sim = None
+
         # log end
         T = time.time() - T
         logger.info("Building dictionary took {} seconds.".format(int(T)))
 
+        # route short entities, keeping all of them in the (global) dictionary
+        engine_entities = self.E
+        self.short_engine = None
+
+        if short_max_len > 0:
+            if not char:
+                raise ValueError("Short entity matching requires character level.")
+
+            short_ids = {e for e in self.E if 0 < len(self.E[e]) <= short_max_len - q + 1}
+            engine_entities = self.E.subset([e for e in self.E if e not in short_ids])
+            short_ids = sorted(short_ids)
+            self.short_engine = DeletionNeighborhood(self.E.subset(short_ids), similarity, t, q)
+
         # setup model
-        self.faerie = Faerie(self.E, similarity=similarity, t=t, q=q, pruner=pruner)
+        self.faerie = None
+        self.exact = None
+
+        if engine == Engine.EXACT or exact_first:
+            self.exact = AhoCorasick(engine_entities, char, q)
+
+            # Faerie drops entities from its dictionary, which the pre-pass still matches
+            if engine_entities is self.E:
+                engine_entities = self.E.subset(self.E)
+
+        if engine == Engine.EXACT:
+            self.engine = None
+        elif engine == Engine.SEGMENT:
+            self.engine = SegmentIndex(engine_entities, t, q)
+        elif engine == Engine.TRIE:
+            self.engine = TrieIndex(engine_entities, t, q)
+        elif engine == Engine.LSH:
+            self.engine = MinHashLSH(engine_entities, similarity, t, bands, rows)
+        elif shards > 1:
+            self.faerie = ShardedFaerie(
+                engine_entities, shards, shard_processes,
+                similarity=similarity, t=t, q=q, pruner=pruner, prefix_filter=prefix_filter,
+                length_partition=length_partition
+            )
+            self.engine = self.faerie
+        else:
+            self.faerie = Faerie(
+                engine_entities, similarity=similarity, t=t, q=q, pruner=pruner, prefix_filter=prefix_filter,
+                length_partition=length_partition
+            )
+            self.engine = self.faerie
+
+        self.region_filter = RegionFilter(self.faerie.entities_dict) if cascade else None
+        self.gate = gate and type(self.engine) is Faerie and self.exact is None and self.short_engine is None
+
+        # result cache, for models of the same configuration and dictionary
+        self.cache = cache
+        self.fingerprint = None
+        self.config = dict(
+            char=char, q=q, special_char=special_char, unique=unique, lower=lower, similarity=similarity, t=t,
+            pruner=pruner, verify=verify, collapse=collapse, prefix_filter=prefix_filter, shards=shards,
+            short_max_len=short_max_len, engine=engine, exact_first=exact_first, bands=bands, rows=rows,
+            cascade=cascade, spans=spans, strip_accents=strip_accents, collapse_whitespace=collapse_whitespace,
+            length_partition=length_partition
+        )
+
+        self.similarity = similarity
+        self.t = t
         self.verify = verify
+        self.spans = spans
 
         return
+
+    def entity_repr(self, e: int) -> str:
+        """Returns the (cached) textual representation of an entity.
+
+        Parameters
+        ----------
+        e : int
+            Entity id.
+
+        Returns
+        -------
+        Entity string rebuilt from its tokens.
+
+        """
+
+        if e not in self.cache_ent_repr:
+            if self.char:
+                entity = qgrams_to_char(self.E[e].tokens).replace(self.tokenizer.special_char, " ")
+            else:
+                entity = " ".join(self.E[e].tokens)
+
+            self.cache_ent_repr[e] = entity
+
+        return self.cache_ent_repr[e]
+
+    def init_lookup(self):
+        """Builds the whole-string lookup index, i.e. the inverted lists of all
+        entities with the multiplicity of each token, sorted by entity length,
+        and the entities grouped by length.
+
+        """
+
+        self.lookup_sim = Similarity()
+        self.lookup_sim.similarity = self.similarity
+
+        inv_index = InvertedIndex.from_entities_dict(self.E)
+
+        # token -> (entity lengths, list of (entity length, entity id, multiplicity))
+        self.lookup_postings = dict()
+
+        for token, entities in inv_index.token2entities.items():
+            postings = sorted((len(self.E[e]), e, n) for e, n in collections.Counter(entities).items())
+            self.lookup_postings[token] = ([e_len for e_len, _, _ in postings], postings)
+
+        self.length2entities = collections.defaultdict(list)
+        for e in self.E:
+            self.length2entities[len(self.E[e])].append(e)
+
+        logger.info("Built lookup index of {} tokens".format(len(self.lookup_postings)))
+
+        return
+
+    def lookup_lengths(self, length: int) -> dict:
+        """Computes the entity lengths that can be similar to a query and the
+        overlap each requires.
+
+        Parameters
+        ----------
+        length : int
+            Number of query tokens.
+
+        Returns
+        -------
+        Mapping from entity length to overlap similarity threshold T.
+
+        """
+
+        sim = self.lookup_sim
+        args = (self.t, self.tokenizer.q) if self.similarity == Sim.EDIT_SIM else (self.t,)
+
+        # the bounds are symmetric, so the query bounds apply to the entity length
+        try:
+            min_len, max_len = sim.find_min_size(length, *args), sim.find_max_size(length, *args)
+        except ValueError:
+            # query shorter than q or threshold: no length filter
+            min_len, max_len = 0, max(self.length2entities, default=0)
+
+        args = (self.t, self.tokenizer.q) if self.similarity in Sim.CHAR_BASED else (self.t,)
+        lengths = dict()
+
+        for e_len in self.length2entities:
+            if not (min_len <= e_len <= max_len):
+                continue
+
+            try:
+                lengths[e_len] = sim.find_tau_min_overlap(e_len, length, *args)
+            except ValueError:
+                # no count filter
+                lengths[e_len] = 0
+
+        return lengths
+
+    def lookup(self, query: str, k: int = None) -> list:
+        """Finds the entities similar to a whole query string.
+
+        Unlike extraction, no substrings are enumerated. Entities are filtered by
+        length (⊥e, Te) and by the number of tokens shared with the query (T),
+        and only the remaining candidates are verified, most shared tokens first.
+
+        Parameters
+        ----------
+        query : str
+            Query string.
+        k : int, optional
+            If given, returns only the k best entities, and stops verifying
+            once k perfect matches are found.
+
+        Returns
+        -------
+        List of matches (entity and score), best first.
+
+        """
+
+        assert isinstance(query, str), "Expected a string as query."
+
+        if self.lookup_postings is None:
+            self.init_lookup()
+
+        tokens = self.tokenizer.tokenize(query)
+        lengths = self.lookup_lengths(len(tokens))
+
+        if not lengths:
+            return list()
+
+        min_len, max_len = min(lengths), max(lengths)
+
+        # count filtering on the part of the inverted lists within the length bounds
+        counts = collections.Counter()
+        e2len = dict()
+
+        for token, n in collections.Counter(tokens).items():
+            if token not in self.lookup_postings:
+                continue
+
+            postings_lengths, postings = self.lookup_postings[token]
+
+            for i in range(bisect.bisect_left(postings_lengths, min_len), len(postings)):
+                e_len, e, n_e = postings[i]
+
+                if e_len > max_len:
+                    break
+
+                counts[e] += min(n, n_e)
+                e2len[e] = e_len
+
+        candidates = [e for e, count in counts.items() if count >= lengths[e2len[e]]]
+
+        # entities of lengths without a positive overlap bound need not share a token
+        for e_len, tau in lengths.items():
+            if tau <= 0:
+                candidates.extend(e for e in self.length2entities[e_len] if e not in counts)
+
+        candidates.sort(key=lambda e: (-counts[e], e))
+
+        if self.char and not tokens:
+            # query shorter than q: no q-grams, only verified by length
+            query_repr = self.tokenizer.normalize(query).replace(self.tokenizer.special_char, " ")
+        elif self.char:
+            query_repr = qgrams_to_char(tokens).replace(self.tokenizer.special_char, " ")
+        else:
+            query_repr = tokens
+
+        perfect = 0 if self.similarity == Sim.EDIT_DIST else 1.0
+        matches = list()
+        n_perfect = 0
+
+        for e in candidates:
+            if self.char:
+                valid, score = Verify.check(query_repr, self.entity_repr(e), self.similarity, self.t)
+            else:
+                valid, score = Verify.check(query_repr, self.E[e].tokens, self.similarity, self.t)
+
+            if not valid:
+                continue
+
+            # one match per alias of (collapsed) entity
+            for uid in self.E[e].uids:
+                matches.append({"entity": [self.entity_repr(e), uid], "score": score})
+
+            if score == perfect:
+                n_perfect += len(self.E[e].uids)
+
+                if k is not None and n_perfect >= k:
+                    break
+
+        # distances ascending, similarities descending
+        sign = 1 if self.similarity == Sim.EDIT_DIST else -1
+        matches.sort(key=lambda match: (sign * match["score"], match["entity"][1]))
+
+        return matches if k is None else matches[:k]
     
-    def __call__(self, document: str, valid_only: bool = True) -> dict:
+    def cascade(self, doc_tokens: list):
+        """Runs Faerie on the regions that can hold candidates only.
+
+        Tokens outside the regions are masked, so they never reach the heap,
+        while positions stay those of the document.
+
+        Parameters
+        ----------
+        doc_tokens : list
+            Document tokens.
+
+        Returns
+        -------
+        Generator of entities with their start and end positions.
+
+        """
+
+        masked = [None] * len(doc_tokens)
+
+        for start, end in self.region_filter(doc_tokens):
+            masked[start:end] = doc_tokens[start:end]
+
+        return self.faerie(masked)
+
+    def skip_covered(self, candidates, exact_hits: list, n_tokens: int):
+        """Skips candidates that lie within an exact match of the same entity.
+
+        Candidates of other entities are kept even where they overlap exact
+        matches, since they are matches of their own. Candidates are filtered
+        after generation, so only their verification is saved.
+
+        Parameters
+        ----------
+        candidates : iterable
+            Pairs of entity and (start, end) token positions.
+        exact_hits : list
+            Exact matches as pairs of entity and (start, end) token positions.
+        n_tokens : int
+            Number of document tokens.
+
+        Yields
+        -------
+        Candidates not explained by an exact match of their entity.
+
+        """
+
+        hits = dict()
+        for e, span in exact_hits:
+            hits.setdefault(e, list()).append(span)
+
+        for e, (i, j) in candidates:
+            if e not in hits:
+                yield e, (i, j)
+                continue
+
+            # Faerie may extend candidates past the last token
+            end = min(j, n_tokens - 1)
+
+            if not any(start <= i and end <= stop for start, stop in hits[e]):
+                yield e, (i, j)
+
+        return
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+
+        # worker processes and the cache are not part of the model
+        state["entity_pool"] = None
+        state["cache"] = None
+
+        return state
+
+    def start_workers(self, workers: int):
+        """Starts the worker processes of entity-partitioned extraction (see
+        :meth:`__call__`). Workers attach to a shared index of the model (see
+        :class:`~nemex.shared.SharedIndex`) if the model supports it, and
+        receive a copy otherwise.
+
+        Parameters
+        ----------
+        workers : int
+            Number of worker processes.
+
+        """
+
+        if self.entity_pool is not None:
+            if self.entity_pool[1] == workers:
+                return
+
+            self.close()
+
+        from nemex import shared
+
+        try:
+            index, model = shared.SharedIndex.from_nemex(self)
+            handle = index.handle
+        except ValueError:
+            index, handle, model = None, None, pickle.dumps(self)
+
+        pool = multiprocessing.Pool(workers, initializer=shared.init_worker, initargs=(handle, model))
+        self.entity_pool = (pool, workers, index)
+
+        return
+
+    def close(self):
+        """Stops the worker processes of entity-partitioned extraction and of the
+        shards."""
+
+        if isinstance(self.faerie, ShardedFaerie):
+            self.faerie.close()
+
+        if self.entity_pool is None:
+            return
+
+        pool, _, index = self.entity_pool
+        pool.close()
+        pool.join()
+
+        if index is not None:
+            index.close()
+
+        self.entity_pool = None
+
+        return
+
+    @staticmethod
+    def partition(position_lists: collections.OrderedDict, n: int) -> list:
+        """Splits the entities hitting a document into contiguous shares of
+        about the same number of positions.
+
+        Parameters
+        ----------
+        position_lists : collections.OrderedDict
+            Mapping from entity id to position list Pe.
+        n : int
+            Maximal number of shares.
+
+        Returns
+        -------
+        List of shares, lists of (entity id, Pe) pairs.
+
+        """
+
+        total = sum(len(Pe) for Pe in position_lists.values())
+        shares = [list()]
+        size = 0
+
+        for e, Pe in position_lists.items():
+            shares[-1].append((e, Pe))
+            size += len(Pe)
+
+            if len(shares) < n and size >= total * len(shares) / n:
+                shares.append(list())
+
+        return [share for share in shares if share]
+
+    def partitioned_call(self, doc_tokens: list, exact_hits: list, valid_only: bool, workers: int) -> dict:
+        """Executes the Faerie engine with the entities hitting a document
+        partitioned across worker processes.
+
+        Parameters
+        ----------
+        doc_tokens : list
+            Document tokens.
+        exact_hits : list
+            Exact matches of the pre-pass.
+        valid_only : bool
+            If true, return only as valid verified substrings.
+        workers : int
+            Number of worker processes.
+
+        Returns
+        -------
+        Dictionary with document and match list.
+
+        """
+
+        from nemex import shared
+
+        self.start_workers(workers)
+
+        shares = self.partition(self.faerie.position_lists(doc_tokens), workers)
+        results = self.entity_pool[0].starmap_async(
+            shared.extract_entities, [(doc_tokens, share, exact_hits, valid_only) for share in shares]
+        )
+
+        # exact and short matches meanwhile
+        output = self.output(doc_tokens, ((e, span, True) for e, span in exact_hits), valid_only)
+        short_candidates = iter(()) if self.short_engine is None else self.short_engine(doc_tokens)
+
+        if exact_hits:
+            short_candidates = self.skip_covered(short_candidates, exact_hits, len(doc_tokens))
+
+        short_matches = self.output(doc_tokens, ((e, span, False) for e, span in short_candidates), valid_only)
+
+        # in the order of sequential extraction
+        for matches in results.get():
+            output["matches"].extend(matches)
+
+        output["matches"].extend(short_matches["matches"])
+
+        return output
+
+    def __call__(self, document: str, valid_only: bool = True, workers: int = 1, output: str = Default.OUTPUT):
         """Executes the Nemex algorithm.
 
+        With several workers, a (large) document is tokenized and looked up in
+        the index once, and the entities hitting it are partitioned across
+        worker processes, each running the per-entity part of Faerie (pruning,
+        candidate search and verification) on its share. The output is the
+        same as with one worker. Only the Faerie engine without shards and
+        cascade, and with normalized spans, is partitioned; otherwise,
+        ``workers`` is ignored.
+
+        With a result cache (see :class:`~nemex.cache.ResultCache`), repeated
+        documents (or sentences) are answered from the cache.
+
+        With "columns" output, matches are returned as parallel columns (see
+        :class:`~nemex.columns.MatchColumns`), without building a dictionary,
+        match string and entity text per match.
+
         Parameters
         ----------
         document : str
             Text document.
         valid_only : bool
             If true, return only as valid verified substrings.
+        workers : int
+            Number of worker processes (kept for later calls, see :meth:`close`).
+        output : str
+            Output format, "dicts" or "columns".
 
         Returns
         -------
-        Dictionary with document and match list.
+        Dictionary with document and match list, or match columns.
 
         """
 
         # check doc type
         assert isinstance(document, str), "Expected a string as document."
 
+        if output not in ("dicts", "columns"):
+            raise ValueError("Unknown output format '{}', use 'dicts' or 'columns'.".format(output))
+
+        columns = output == "columns"
+
+        if self.cache is not None:
+            result = self.cached_call(document, valid_only, workers)
+
+            return MatchColumns.from_output(result, self.entity_repr, self.E.uid2idx) if columns else result
+
+        return self.run(document, valid_only, workers, columns)
+
+    def run(self, document: str, valid_only: bool = True, workers: int = 1, columns: bool = False):
+        """Executes the Nemex algorithm without the result cache (see :meth:`__call__`).
+
+        Parameters
+        ----------
+        document : str
+            Text document.
+        valid_only : bool
+            If true, return only as valid verified substrings.
+        workers : int
+            Number of worker processes.
+        columns : bool
+            If true, return match columns.
+
+        Returns
+        -------
+        Dictionary with document and match list, or match columns.
+
+        """
+
         # tokenize
-        doc_tokens = self.tokenizer.tokenize(document)
+        if self.spans == "original":
+            doc_tokens, starts, ends = self.tokenizer.tokenize_offsets(document)
+            offsets = (starts, ends)
+        else:
+            doc_tokens = self.tokenizer.tokenize(document)
+            offsets = None
+
+        # documents without enough dictionary tokens
+        if self.gate and not self.faerie.can_match(doc_tokens):
+            if offsets is None:
+                output = self.empty_output(document, doc_tokens)
+            else:
+                output = {"document": document, "matches": list()}
+
+            return MatchColumns(output["document"], self.entity_repr) if columns else output
+
+        # exact pre-pass
+        exact_hits = list() if self.exact is None else list(self.exact(doc_tokens))
+
+        if workers > 1 and offsets is None and self.region_filter is None and type(self.engine) is Faerie:
+            output = self.partitioned_call(doc_tokens, exact_hits, valid_only, workers)
+
+            return MatchColumns.from_output(output, self.entity_repr, self.E.uid2idx) if columns else output
+
+        if columns:
+            return self.output_columns(doc_tokens, self.candidates(doc_tokens, exact_hits), valid_only, document, offsets)
+
+        return self.output(doc_tokens, self.candidates(doc_tokens, exact_hits), valid_only, document, offsets)
+
+    def candidates(self, doc_tokens: list, exact_hits: list = None):
+        """Finds the candidates of a document with the engines of the model.
+
+        Parameters
+        ----------
+        doc_tokens : list
+            Document tokens.
+        exact_hits : list, optional
+            Exact matches of the pre-pass, found if none provided.
+
+        Returns
+        -------
+        Iterable of triples of entity, (start, end) token positions and whether
+        the match is exact.
+
+        """
+
+        if exact_hits is None:
+            exact_hits = list() if self.exact is None else list(self.exact(doc_tokens))
+
+        candidates = iter(())
+
+        if self.region_filter is not None:
+            candidates = self.cascade(doc_tokens)
+        elif self.engine is not None:
+            candidates = self.engine(doc_tokens)
+
+        if self.short_engine is not None:
+            candidates = itertools.chain(candidates, self.short_engine(doc_tokens))
+
+        if exact_hits:
+            candidates = self.skip_covered(candidates, exact_hits, len(doc_tokens))
+
+        return itertools.chain(
+            ((e, span, True) for e, span in exact_hits),
+            ((e, span, False) for e, span in candidates)
+        )
+
+    def model_fingerprint(self) -> bytes:
+        """Hashes the configuration and the dictionary of the model (computed
+        once, and again after :meth:`delta`).
+
+        Returns
+        -------
+        Fingerprint.
+
+        """
+
+        if self.fingerprint is None:
+            digest = hashlib.blake2b(repr(sorted(self.config.items())).encode("utf-8"), digest_size=32)
+
+            for e in sorted(self.E.idx2ent):
+                digest.update(repr((self.E[e].uids, self.E[e].tokens)).encode("utf-8"))
+
+            self.fingerprint = digest.digest()
+
+        return self.fingerprint
+
+    def cached_call(self, document: str, valid_only: bool = True, workers: int = 1) -> dict:
+        """Executes the Nemex algorithm through the result cache.
+
+        Documents (or, with "sentence" granularity, their sentences) are looked
+        up by a hash of their normalized string (or, with original spans, of
+        their string), and only those not cached are extracted. Matches of
+        sentences are shifted to their position in the document.
+
+        Parameters
+        ----------
+        document : str
+            Text document.
+        valid_only : bool
+            If true, return only as valid verified substrings.
+        workers : int
+            Number of worker processes.
+
+        Returns
+        -------
+        Dictionary with document and match list.
+
+        """
+
+        fingerprint = self.model_fingerprint()
+        doc_tokens_str = self.document_string(self.tokenizer.normalize(document))
+
+        # documents without q-grams
+        if doc_tokens_str is None:
+            return self.run(document, valid_only, workers)
+
+        if self.cache.granularity == "document":
+            units = [(0, len(document))]
+        else:
+            units = sentence_spans(document)
+
+        original = self.spans == "original"
+        output = {"document": document if original else doc_tokens_str, "matches": list()}
+        offset = 0
+
+        # position of the unit in the normalized document, which may differ in length
+        position, shift = 0, 0
+
+        for start, end in units:
+            shift += len(self.tokenizer.normalize(document[position:start]))
+            position = start
+
+            unit = document[start:end]
+            normalized = self.tokenizer.normalize(unit)
+            unit_str = self.document_string(normalized)
+
+            # sentences too short for a q-gram, or without tokens
+            if not unit_str:
+                continue
+
+            key = ResultCache.key(fingerprint, unit if original else normalized if self.char else unit_str, valid_only)
+            matches = self.cache.get(key)
+
+            if matches is None:
+                matches = self.run(unit, valid_only, workers)["matches"]
+                self.cache.put(key, ResultCache.copy(matches))
+
+            # original spans follow the document, character spans the normalized
+            # document and token spans the joined tokens
+            output["matches"] += ResultCache.copy(matches, start if original else shift if self.char else offset)
+            offset += len(unit_str) + 1
+
+        return output
+
+    def document_string(self, normalized: str) -> str:
+        """Returns the document string of the output (see :meth:`output`) from the
+        normalized document (see :meth:`~nemex.utils.Tokenizer.normalize`).
+
+        Parameters
+        ----------
+        normalized : str
+            Normalized document.
+
+        Returns
+        -------
+        Document string, or None if the document has no q-grams (or no special
+        character stands for spaces).
+
+        """
+
+        if not self.char:
+            return " ".join(normalized.split())
+
+        # the q-grams spell the normalized document
+        if self.tokenizer.special_char and len(normalized) >= self.tokenizer.q:
+            return normalized.replace(self.tokenizer.special_char, " ")
+
+        return None
+
+    def empty_output(self, document: str, doc_tokens: list) -> dict:
+        """Builds the output of a document without matches, without the token
+        spans of :meth:`output`.
+
+        Parameters
+        ----------
+        document : str
+            Text document.
+        doc_tokens : list
+            Document tokens.
+
+        Returns
+        -------
+        Dictionary with document and empty match list.
+
+        """
+
+        doc_tokens_str = self.document_string(self.tokenizer.normalize(document))
+
+        if doc_tokens_str is None:
+            return self.output(doc_tokens, iter(()))
+
+        return {"document": doc_tokens_str, "matches": list()}
+
+    def output_strings(self, doc_tokens: list, document: str = None) -> tuple:
+        """Returns the document string of the output, which match spans refer to,
+        and the string that character-level candidates are verified on.
+
+        Parameters
+        ----------
+        doc_tokens : list
+            Document tokens.
+        document : str, optional
+            Original document, if spans refer to it.
+
+        Returns
+        -------
+        Document string and verified string.
+
+        """
+
+        # spans index the original document, and q-gram positions the normalized one
+        if document is not None:
+            if not self.char:
+                return document, None
+
+            normalized = self.tokenizer.normalize(document)
+
+            if self.tokenizer.special_char:
+                normalized = normalized.replace(self.tokenizer.special_char, " ")
+
+            return document, normalized
 
         # char-based
         if self.char:
@@ -148,81 +1002,361 @@ class Nemex:
         else:
             doc_tokens_str = " ".join(doc_tokens)
 
-        # init spans
-        spans = tokens_to_whitespace_char_spans(doc_tokens)
+        return doc_tokens_str, doc_tokens_str
+
+    def verified(self, doc_tokens: list, doc_tokens_str: str, candidates, valid_only: bool = True, offsets=None):
+        """Verifies the candidates of a document.
+
+        Parameters
+        ----------
+        doc_tokens : list
+            Document tokens.
+        doc_tokens_str : str
+            Verified string (see :meth:`output_strings`), only used for
+            character-level candidates.
+        candidates : iterable
+            Triples of entity, (start, end) token positions and whether the match is exact.
+        valid_only : bool
+            If true, return only as valid verified substrings.
+        offsets : tuple, optional
+            Start and end offsets of the tokens in the original document (see
+            :meth:`~nemex.utils.Tokenizer.tokenize_offsets`).
+
+        Returns
+        -------
+        Iterable of entity, (start, end) character positions in the document
+        string (or, with offsets, in the original document), score and validity
+        (None if not verified).
+
+        """
+
+        q = self.tokenizer.q
+        last = len(doc_tokens) - 1
+
+        # q-gram positions are offsets in the original document, unless lower casing changed lengths
+        if self.char and offsets is not None and isinstance(offsets[0], range):
+            offsets = None
+
+        # q-grams of the document string start at their position
+        spans = None if self.char or offsets is not None else tokens_to_whitespace_char_spans(doc_tokens)
 
-        # init output
-        output = {"document": doc_tokens_str, "matches": list()}
-        
         # returns pair of <entity index, (start, end) positions in doc_tokens>
-        for e, (i, j) in self.faerie(doc_tokens):
-            match_tokens = doc_tokens[i:j+1]
-            match_span = spans[i:j+1]
+        for e, (i, j), exact in candidates:
+            # candidate windows may run past the document
+            k = j if j <= last else last
 
-            if len(match_span) == 1:
-                start, end = match_span[0]
-            else:
-                start, end = match_span[0][0], match_span[-1][1]
+            score, valid = None, None
 
             # char-based
             if self.char:
-                q = self.tokenizer.q
-                start, end = start - (i * q), end - (j * q)
-                match = doc_tokens_str[start:end]
-                
-                if e not in self.cache_ent_repr:
-                    entity = qgrams_to_char(self.E[e].tokens).replace(self.tokenizer.special_char, " ")
-                    self.cache_ent_repr[e] = entity
-                else:
-                    entity = self.cache_ent_repr[e]
+                # (as the q-gram spans did, a window past the end is shortened by its overhang)
+                start, end = i, k + q - (j - k) * q
 
-                output["matches"].append({
-                    "entity": [entity, self.E[e].id],
-                    "span": [start, end],
-                    "match": match,
-                    "score": None,
-                    "valid": None
-                })
+                # exact matches need no verification
+                if exact:
+                    valid, score = True, 0 if self.similarity == Sim.EDIT_DIST else 1.0
 
                 # verify
-                if self.verify:
-                    valid, score = Verify.check(match, entity, self.faerie.similarity, self.faerie.t)
-                    output["matches"][-1]["score"] = score
-                    output["matches"][-1]["valid"] = valid
+                elif self.verify:
+                    valid, score = Verify.check(doc_tokens_str[start:end], self.entity_repr(e), self.similarity, self.t)
 
                     # return only valid matches
                     if valid_only and not valid:
-                        del output["matches"][-1]
+                        continue
+
+                # positions of the normalized string in the original document
+                if offsets is not None:
+                    start, end = offsets[0][i], offsets[1][end - q] if end - q >= i else offsets[0][i] + max(end - i, 0)
 
             # token-based
             else:
-                # end = spans[j][-1]
-                match = doc_tokens_str[start:end]
-                
-                if e not in self.cache_ent_repr:
-                    entity = " ".join(self.E[e].tokens)
-                    self.cache_ent_repr[e] = entity
+                if offsets is not None:
+                    start, end = offsets[0][i], offsets[1][k]
                 else:
-                    entity = self.cache_ent_repr[e]
-                
-                output["matches"].append({
-                    "entity": [entity, self.E[e].id],
-                    "span": [start, end],
-                    "match": match,
-                    "score": None,
-                    "valid": None
-                })
+                    start, end = spans[i][0], spans[k][1]
+
+                # exact matches need no verification
+                if exact:
+                    valid, score = True, 1.0
 
                 # verify
-                if self.verify:
-                    valid, score = Verify.check(
-                        match_tokens, self.E[e].tokens, self.faerie.similarity, self.faerie.t
-                    )
-                    output["matches"][-1]["score"] = score
-                    output["matches"][-1]["valid"] = valid
+                elif self.verify:
+                    valid, score = Verify.check(doc_tokens[i:j+1], self.E[e].tokens, self.similarity, self.t)
 
                     # return only valid matches
                     if valid_only and not valid:
-                        del output["matches"][-1]
-        
+                        continue
+
+            yield e, start, end, score, valid
+
+    def output(self, doc_tokens: list, candidates, valid_only: bool = True, document: str = None,
+               offsets: tuple = None) -> dict:
+        """Verifies the candidates of a document and builds its output.
+
+        Parameters
+        ----------
+        doc_tokens : list
+            Document tokens.
+        candidates : iterable
+            Triples of entity, (start, end) token positions and whether the match is exact.
+        valid_only : bool
+            If true, return only as valid verified substrings.
+        document : str, optional
+            Original document, which spans refer to if given with offsets.
+        offsets : tuple, optional
+            Start and end offsets of the tokens in the original document (see
+            :meth:`~nemex.utils.Tokenizer.tokenize_offsets`).
+
+        Returns
+        -------
+        Dictionary with document and match list.
+
+        """
+
+        doc_tokens_str, verified_str = self.output_strings(doc_tokens, document if offsets is not None else None)
+
+        # init output
+        output = {"document": doc_tokens_str, "matches": list()}
+
+        for e, start, end, score, valid in self.verified(doc_tokens, verified_str, candidates, valid_only, offsets):
+            match = doc_tokens_str[start:end]
+            entity = self.entity_repr(e)
+
+            # one match per alias of (collapsed) entity
+            for uid in self.E[e].uids:
+                output["matches"].append({
+                    "entity": [entity, uid],
+                    "span": [start, end],
+                    "match": match,
+                    "score": score,
+                    "valid": valid
+                })
+
         return output
+
+    def output_columns(self, doc_tokens: list, candidates, valid_only: bool = True, document: str = None,
+                       offsets: tuple = None) -> MatchColumns:
+        """Verifies the candidates of a document and builds its output as columns
+        (see :class:`~nemex.columns.MatchColumns`).
+
+        Parameters
+        ----------
+        doc_tokens : list
+            Document tokens.
+        candidates : iterable
+            Triples of entity, (start, end) token positions and whether the match is exact.
+        valid_only : bool
+            If true, return only as valid verified substrings.
+        document : str, optional
+            Original document, which spans refer to if given with offsets.
+        offsets : tuple, optional
+            Start and end offsets of the tokens in the original document.
+
+        Returns
+        -------
+        Match columns.
+
+        """
+
+        doc_tokens_str, verified_str = self.output_strings(doc_tokens, document if offsets is not None else None)
+        columns = MatchColumns(doc_tokens_str, self.entity_repr)
+
+        for e, start, end, score, valid in self.verified(doc_tokens, verified_str, candidates, valid_only, offsets):
+            for uid in self.E[e].uids:
+                columns.append(e, uid, start, end, score, valid)
+
+        return columns
+
+    def extract_corpus(self, corpus: CorpusIndex, valid_only: bool = True) -> dict:
+        """Extracts the entities from an indexed corpus (reverse mode).
+
+        Instead of scanning each document, the Faerie model of the dictionary is
+        applied entity by entity to the postings of the corpus (see
+        :meth:`~nemex.corpus.CorpusIndex.search`), so that only documents sharing
+        tokens with the dictionary are processed.
+
+        Parameters
+        ----------
+        corpus : :class:`~nemex.corpus.CorpusIndex`
+            Corpus index, tokenized like the dictionary.
+        valid_only : bool
+            If true, return only as valid verified substrings.
+
+        Returns
+        -------
+        Mapping from document id to output (as of :meth:`~nemex.nemex.Nemex.__call__`)
+        of the documents with matches.
+
+        """
+
+        self.check_corpus(corpus)
+
+        return self.search_corpus(corpus, valid_only=valid_only)
+
+    def delta(self, corpus: CorpusIndex, added=None, removed=None, valid_only: bool = True) -> dict:
+        """Updates the dictionary and re-extracts only the changed entities from an
+        indexed corpus.
+
+        The matches of removed entities are found before they are removed from the
+        index, and the matches of added entities after they are indexed. In both
+        cases, only documents sharing at least Tl tokens with a changed entity are
+        processed, so the cost follows the change instead of the corpus size. A
+        match found both before and after (e.g. of an entity changed under the
+        same uid) is no change and cancels out.
+
+        Parameters
+        ----------
+        corpus : :class:`~nemex.corpus.CorpusIndex`
+            Corpus index, tokenized like the dictionary.
+        added : {list, dict}, optional
+            Strings of added entities, or mapping from uid to string.
+        removed : iterable, optional
+            Uids of removed entities. To change an entity, remove and add its uid.
+        valid_only : bool
+            If true, return only as valid verified substrings.
+
+        Returns
+        -------
+        Dictionary with the inserted and the deleted matches, each a mapping from
+        document id to match list.
+
+        """
+
+        self.check_corpus(corpus)
+
+        removed = list(dict.fromkeys(removed or ()))
+        added = added.items() if isinstance(added, dict) else [(None, string) for string in added or ()]
+
+        for uid in removed:
+            if uid not in self.E.uid2idx:
+                raise ValueError("Unknown entity uid '{}'.".format(uid))
+
+        # matches of removed entities
+        entities = {self.E.uid2idx[uid] for uid in removed}
+        deletions = self.search_corpus(corpus, entities, set(removed), valid_only)
+
+        for uid in removed:
+            e = self.E.uid2idx[uid]
+
+            if len(self.E[e].uids) == 1:
+                self.faerie.remove_entities([e])
+                self.cache_ent_repr.pop(e, None)
+            else:
+                self.E.remove(uid)
+
+        # matches of added entities
+        uids = set()
+        entities = set()
+
+        for uid, string in added:
+            if uid is not None and uid in self.E.uid2idx:
+                raise ValueError("Entity uid '{}' already exists.".format(uid))
+
+            e = self.E.add(string, uid)
+            uids.add(self.E[e].uids[-1])
+            entities.add(e)
+
+        # new entities (not aliases of indexed ones) need indexing
+        self.faerie.add_entities(sorted(e for e in entities if set(self.E[e].uids) <= uids))
+        insertions = self.search_corpus(corpus, entities, uids, valid_only)
+
+        # unchanged matches
+        for doc_id in set(insertions) & set(deletions):
+            for match in list(insertions[doc_id]):
+                if match in deletions[doc_id]:
+                    insertions[doc_id].remove(match)
+                    deletions[doc_id].remove(match)
+
+        # the lookup index, the region filter, the workers and the cache keys follow the dictionary
+        self.lookup_postings = None
+        self.fingerprint = None
+        self.close()
+
+        if self.region_filter is not None:
+            self.region_filter = RegionFilter(self.faerie.entities_dict)
+
+        return {
+            "insertions": {doc_id: matches for doc_id, matches in insertions.items() if matches},
+            "deletions": {doc_id: matches for doc_id, matches in deletions.items() if matches}
+        }
+
+    def check_corpus(self, corpus: CorpusIndex):
+        """Checks whether the model can be applied to an indexed corpus.
+
+        Parameters
+        ----------
+        corpus : :class:`~nemex.corpus.CorpusIndex`
+            Corpus index.
+
+        """
+
+        if type(self.engine) is not Faerie or self.short_engine is not None or self.exact is not None:
+            raise ValueError("Reverse extraction requires the Faerie engine without shards, short or exact matching.")
+
+        if not self.same_tokenizer(corpus.tokenizer):
+            raise ValueError("Corpus and dictionary must be tokenized alike.")
+
+        # the corpus keeps the tokens of documents only
+        if self.spans == "original":
+            raise ValueError("Reverse extraction returns normalized spans, use spans='normalized'.")
+
+        return
+
+    def search_corpus(self, corpus: CorpusIndex, entities=None, uids: set = None, valid_only: bool = True) -> dict:
+        """Verifies the candidates of entities in an indexed corpus.
+
+        Parameters
+        ----------
+        corpus : :class:`~nemex.corpus.CorpusIndex`
+            Corpus index.
+        entities : iterable, optional
+            Entity ids. If none provided, all entities are searched.
+        uids : set, optional
+            If given, returns the match lists of these uids instead of outputs.
+        valid_only : bool
+            If true, return only as valid verified substrings.
+
+        Returns
+        -------
+        Mapping from document id to output, or to match list if uids are given.
+
+        """
+
+        doc2candidates = collections.defaultdict(list)
+
+        for doc_id, e, span in corpus.search(self.faerie, entities):
+            doc2candidates[doc_id].append((e, span, False))
+
+        outputs = dict()
+
+        for doc_id, candidates in doc2candidates.items():
+            output = self.output(corpus[doc_id], candidates, valid_only)
+
+            if uids is not None:
+                output = [match for match in output["matches"] if match["entity"][1] in uids]
+
+                if output:
+                    outputs[doc_id] = output
+
+            elif output["matches"]:
+                outputs[doc_id] = output
+
+        return outputs
+
+    def same_tokenizer(self, tokenizer: Tokenizer) -> bool:
+        """Checks whether a tokenizer tokenizes like the tokenizer of the dictionary.
+
+        Parameters
+        ----------
+        tokenizer : :class:`~nemex.utils.Tokenizer`
+            Tokenizer.
+
+        Returns
+        -------
+        True, if both tokenizers have the same settings.
+
+        """
+
+        settings = ("char", "q", "special_char", "unique", "lower", "strip_accents", "collapse_whitespace")
+
+        return all(getattr(self.tokenizer, key) == getattr(tokenizer, key) for key in settings)
@@ -0,0 +1,525 @@
+"""
+Runner module.
+
+Functions:
+    - list_inputs
+    - plan_shards
+    - read_lines
+    - read_documents
+    - prefetch
+    - run_shard
+    - run
+    - main
+
+"""
+
+import os
+import bz2
+import sys
+import gzip
+import json
+import lzma
+import mmap
+import time
+import queue
+import pickle
+import logging
+import argparse
+import threading
+import multiprocessing
+
+from nemex import Nemex, Default
+from nemex import shared
+
+
+logger = logging.getLogger(__name__)
+
+# streaming decompressors by file suffix (compressed files are one shard each)
+DECOMPRESSORS = {".gz": gzip.open, ".bz2": bz2.open, ".xz": lzma.open}
+
+JSON_SUFFIXES = (".jsonl", ".ndjson", ".json")
+
+MANIFEST = "manifest.json"
+
+# model of worker processes
+_nemex = None
+
+
+def list_inputs(paths: list) -> list:
+    """Lists the input files of a job, walking directories recursively.
+
+    Parameters
+    ----------
+    paths : list
+        Files and directories.
+
+    Returns
+    -------
+    Sorted list of file paths.
+
+    """
+
+    files = set()
+
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, names in os.walk(path):
+                files.update(os.path.join(root, name) for name in names if not name.startswith("."))
+        elif os.path.isfile(path):
+            files.add(path)
+        else:
+            raise FileNotFoundError(path)
+
+    return sorted(files)
+
+
+def plan_shards(files: list, shard_size: int = Default.RUN_SHARD_SIZE) -> list:
+    """Splits input files into shards. Uncompressed files are split into byte
+    ranges of about ``shard_size`` bytes (aligned to lines when read), and
+    compressed files are one shard each.
+
+    Parameters
+    ----------
+    files : list
+        File paths.
+    shard_size : int
+        Bytes per shard of uncompressed files.
+
+    Returns
+    -------
+    List of shards, dictionaries with path, start and end offset (None for
+    the end of a compressed file).
+
+    """
+
+    if shard_size < 1:
+        raise ValueError("Shard size must be at least 1 byte.")
+
+    shards = list()
+
+    for path in files:
+        if os.path.splitext(path)[1] in DECOMPRESSORS:
+            shards.append({"path": path, "start": 0, "end": None})
+            continue
+
+        size = os.path.getsize(path)
+
+        for start in range(0, max(size, 1), shard_size):
+            shards.append({"path": path, "start": start, "end": min(start + shard_size, size)})
+
+    return shards
+
+
+def read_lines(path: str, start: int = 0, end: int = None):
+    """Reads the lines of a shard.
+
+    Compressed files are read through streaming decompressors. Uncompressed
+    files are memory-mapped, and a byte range [start, end) holds the lines
+    starting in it.
+
+    Parameters
+    ----------
+    path : str
+        File path.
+    start : int
+        Start offset.
+    end : int, optional
+        End offset, or None for a compressed file.
+
+    Yields
+    -------
+    Offset (byte offset, or line number in compressed files) and line bytes.
+
+    """
+
+    suffix = os.path.splitext(path)[1]
+
+    if suffix in DECOMPRESSORS:
+        with DECOMPRESSORS[suffix](path, "rb") as rf:
+            for k, line in enumerate(rf):
+                yield k, line.rstrip(b"\r\n")
+        return
+
+    if end <= start:
+        return
+
+    with open(path, "rb") as rf, mmap.mmap(rf.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+
+        end = min(end, len(mm))
+
+        # the line running into the range belongs to the previous shard
+        position = 0 if start == 0 else mm.find(b"\n", start - 1) + 1
+
+        if start > 0 and position == 0:
+            return
+
+        while position < end:
+            newline = mm.find(b"\n", position)
+            newline = len(mm) if newline == -1 else newline
+
+            yield position, mm[position:newline].rstrip(b"\r")
+
+            position = newline + 1
+
+    return
+
+
+def read_documents(shard: dict, text_field: str = "text", id_field: str = "id"):
+    """Reads the documents of a shard, one per line, either as JSON objects
+    (files ending with .jsonl, .ndjson or .json before any compression suffix)
+    or as plain text.
+
+    Parameters
+    ----------
+    shard : dict
+        Shard (see :func:`plan_shards`).
+    text_field : str
+        Field with the document of JSON lines.
+    id_field : str
+        Field with the document id of JSON lines. Documents without it are
+        identified by file and offset.
+
+    Yields
+    -------
+    Document id and document.
+
+    """
+
+    path = shard["path"]
+    name = os.path.splitext(path)[0] if os.path.splitext(path)[1] in DECOMPRESSORS else path
+    is_json = name.endswith(JSON_SUFFIXES)
+
+    for offset, line in read_lines(path, shard["start"], shard["end"]):
+        if not line.strip():
+            continue
+
+        if is_json:
+            record = json.loads(line)
+            yield record.get(id_field, "{}:{}".format(path, offset)), record[text_field]
+        else:
+            yield "{}:{}".format(path, offset), line.decode("utf-8")
+
+    return
+
+
+def prefetch(iterable, size: int = Default.RUN_PREFETCH):
+    """Iterates in a background thread, so that reading and decompression
+    overlap with the consumer.
+
+    Parameters
+    ----------
+    iterable : iterable
+        Iterable.
+    size : int
+        Maximal number of prefetched items.
+
+    Yields
+    -------
+    Items of the iterable.
+
+    """
+
+    items = queue.Queue(size)
+    done = object()
+    stop = threading.Event()
+
+    def produce():
+        try:
+            for item in iterable:
+                if stop.is_set():
+                    return
+                items.put((item, None))
+        except Exception as err:
+            items.put((done, err))
+            return
+
+        items.put((done, None))
+
+    thread = threading.Thread(target=produce, daemon=True)
+    thread.start()
+
+    try:
+        while True:
+            item, err = items.get()
+
+            if err is not None:
+                raise err
+
+            if item is done:
+                break
+
+            yield item
+
+    finally:
+        stop.set()
+
+        # unblock the producer
+        while thread.is_alive():
+            try:
+                items.get_nowait()
+            except queue.Empty:
+                thread.join(0.01)
+
+    return
+
+
+def init_worker(handle: tuple, model: bytes):
+    """Sets the model of a worker process, on a shared index if a handle is given.
+
+    Parameters
+    ----------
+    handle : tuple
+        Shared index handle (see :attr:`~nemex.shared.SharedIndex.handle`), or None.
+    model : bytes
+        Pickled model.
+
+    """
+
+    global _nemex
+
+    shared.init_worker(handle, model)
+    _nemex = shared._nemex
+
+    return
+
+
+def write_jsonl(filename: str, records):
+    """Writes records as JSON lines."""
+
+    with open(filename, "w", encoding="utf-8") as wf:
+        for record in records:
+            wf.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    return
+
+
+def write_parquet(filename: str, records):
+    """Writes records as a Parquet table with id and (JSON-encoded) matches columns."""
+
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError("Parquet output requires pyarrow.")
+
+    ids, matches = list(), list()
+
+    for record in records:
+        ids.append(str(record["id"]))
+        matches.append(json.dumps(record["matches"], ensure_ascii=False))
+
+    table = pyarrow.table({"id": ids, "matches": matches})
+    pyarrow.parquet.write_table(table, filename)
+
+    return
+
+
+WRITERS = {"jsonl": write_jsonl, "parquet": write_parquet}
+
+
+def run_shard(task: tuple, nemex: Nemex = None) -> dict:
+    """Extracts the entities of the documents of a shard and writes them to file.
+
+    The output is written to a temporary file and moved into place when
+    complete, so that an output file always belongs to a completed shard.
+
+    Parameters
+    ----------
+    task : tuple
+        Shard number, shard, output filename and options (output format,
+        text field, id field, valid_only).
+    nemex : Nemex, optional
+        Model. The model of the worker process is used if none provided.
+
+    Returns
+    -------
+    Shard number and statistics.
+
+    """
+
+    number, shard, filename, options = task
+    nemex = _nemex if nemex is None else nemex
+
+    T = time.time()
+    stats = {"documents": 0, "matches": 0}
+
+    def records():
+        for doc_id, document in prefetch(read_documents(shard, options["text_field"], options["id_field"])):
+            matches = nemex(document, options["valid_only"])["matches"]
+
+            stats["documents"] += 1
+            stats["matches"] += len(matches)
+
+            yield {"id": doc_id, "matches": matches}
+
+    tmp_filename = filename + ".tmp"
+    WRITERS[options["output_format"]](tmp_filename, records())
+    os.replace(tmp_filename, filename)
+
+    stats["seconds"] = round(time.time() - T, 3)
+
+    return number, stats
+
+
+def load_manifest(out_dir: str) -> dict:
+    filename = os.path.join(out_dir, MANIFEST)
+
+    if not os.path.exists(filename):
+        return None
+
+    with open(filename, encoding="utf-8") as rf:
+        return json.load(rf)
+
+
+def save_manifest(out_dir: str, manifest: dict):
+    filename = os.path.join(out_dir, MANIFEST)
+
+    with open(filename + ".tmp", "w", encoding="utf-8") as wf:
+        json.dump(manifest, wf, indent=1)
+
+    os.replace(filename + ".tmp", filename)
+
+    return
+
+
+def run(nemex: Nemex,
+        inputs: list,
+        out_dir: str,
+        processes: int = None,
+        shard_size: int = Default.RUN_SHARD_SIZE,
+        output_format: str = "jsonl",
+        text_field: str = "text",
+        id_field: str = "id",
+        valid_only: bool = Default.VALID_ONLY
+        ) -> dict:
+    """Runs an extraction job over a corpus of files.
+
+    The input is split into shards (see :func:`plan_shards`), which a pool of
+    worker processes extracts into one output file each. The manifest in the
+    output directory lists the shards and is updated whenever a shard is
+    completed, so that a killed job resumes with the shards not completed yet
+    when run again with the same inputs and output directory.
+
+    Workers read the model from a shared index (see
+    :class:`~nemex.shared.SharedIndex`) if the model supports it, and receive
+    a copy otherwise.
+
+    Parameters
+    ----------
+    nemex : :class:`~nemex.nemex.Nemex`
+        Model.
+    inputs : list
+        Input files and directories (plain text or JSON lines, optionally
+        compressed with gzip, bz2 or xz).
+    out_dir : str
+        Output directory.
+    processes : int, optional
+        Number of worker processes. By default, one per CPU. If 0, shards
+        are extracted in this process.
+    shard_size : int
+        Bytes per shard of uncompressed files.
+    output_format : str
+        "jsonl" or "parquet" (requires pyarrow).
+    text_field : str
+        Field with the document of JSON lines.
+    id_field : str
+        Field with the document id of JSON lines.
+    valid_only : bool
+        If true, return only as valid verified substrings.
+
+    Returns
+    -------
+    Manifest.
+
+    """
+
+    if output_format not in WRITERS:
+        raise ValueError("Unknown output format '{}', use one of {}.".format(output_format, sorted(WRITERS)))
+
+    shards = plan_shards(list_inputs(inputs), shard_size)
+    os.makedirs(os.path.join(out_dir, "shards"), exist_ok=True)
+
+    manifest = load_manifest(out_dir)
+
+    if manifest is None:
+        manifest = {"output_format": output_format, "shards": shards, "completed": dict()}
+    elif manifest["shards"] != shards or manifest["output_format"] != output_format:
+        raise ValueError("Output directory '{}' holds a job with other shards or output format.".format(out_dir))
+
+    options = dict(output_format=output_format, text_field=text_field, id_field=id_field, valid_only=valid_only)
+    tasks = list()
+
+    for number, shard in enumerate(shards):
+        filename = os.path.join(out_dir, "shards", "{:06d}.{}".format(number, output_format))
+
+        if str(number) in manifest["completed"] and os.path.exists(filename):
+            continue
+
+        tasks.append((number, shard, filename, options))
+
+    logger.info("Running {} of {} shards".format(len(tasks), len(shards)))
+    save_manifest(out_dir, manifest)
+
+    def complete(number, stats):
+        manifest["completed"][str(number)] = stats
+        save_manifest(out_dir, manifest)
+
+        logger.info("Completed shard {} ({} documents, {} matches in {}s)".format(
+            number, stats["documents"], stats["matches"], stats["seconds"]
+        ))
+        return
+
+    processes = os.cpu_count() if processes is None else processes
+
+    if processes == 0 or not tasks:
+        for task in tasks:
+            complete(*run_shard(task, nemex))
+
+        return manifest
+
+    try:
+        index, model = shared.SharedIndex.from_nemex(nemex)
+        handle = index.handle
+    except ValueError:
+        index, handle, model = None, None, pickle.dumps(nemex)
+
+    try:
+        with multiprocessing.Pool(min(processes, len(tasks)), initializer=init_worker, initargs=(handle, model)) as pool:
+            for number, stats in pool.imap_unordered(run_shard, tasks):
+                complete(number, stats)
+    finally:
+        if index is not None:
+            index.close()
+
+    return manifest
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(prog="python -m nemex run", description="Runs an extraction job over a corpus.")
+    parser.add_argument("entities", help="File with entities (one per line, optionally 'id<TAB>entity').")
+    parser.add_argument("inputs", nargs="+", help="Input files or directories.")
+    parser.add_argument("--out", required=True, help="Output directory (resumed if it holds the same job).")
+    parser.add_argument("--token", action="store_true", help="Token-level instead of character-level similarity.")
+    parser.add_argument("--q", type=int, default=Default.TOKEN_THRESH)
+    parser.add_argument("--similarity", default=Default.SIMILARITY)
+    parser.add_argument("--t", type=float, default=Default.SIM_THRESH_CHAR)
+    parser.add_argument("--pruner", default=Default.PRUNER)
+    parser.add_argument("--processes", type=int, default=None)
+    parser.add_argument("--shard-size", type=int, default=Default.RUN_SHARD_SIZE)
+    parser.add_argument("--output-format", default="jsonl", choices=sorted(WRITERS))
+    parser.add_argument("--text-field", default="text")
+    parser.add_argument("--id-field", default="id")
+    parser.add_argument("--all", action="store_true", help="Also output invalid candidates.")
+    args = parser.parse_args(argv)
+
+    nemex = Nemex(
+        args.entities, char=not args.token, q=args.q, similarity=args.similarity, t=args.t, pruner=args.pruner
+    )
+    manifest = run(
+        nemex, args.inputs, args.out, args.processes, args.shard_size, args.output_format,
+        args.text_field, args.id_field, not args.all
+    )
+
+    print("{} of {} shards completed".format(len(manifest["completed"]), len(manifest["shards"])), file=sys.stderr)
+
+    return 0
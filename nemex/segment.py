@@ -0,0 +1,167 @@
+"""
+Segment module.
+
+Classes:
+    - SegmentIndex
+
+"""
+
+import logging
+import collections
+
+from nemex import EntitiesDictionary, Default
+from nemex.utils import Sim, qgrams_to_char
+
+
+logger = logging.getLogger(__name__)
+
+
+class SegmentIndex:
+    """Partition-based extraction for edit distance using Pass-Join.
+
+    Every entity string is split into τ + 1 disjoint segments [1]_. If the edit
+    distance of a substring and an entity is at most τ, at least one segment
+    of the entity occurs unchanged in the substring (pigeonhole principle).
+    Segments are indexed by their string, and all document positions are
+    probed for all segment lengths. A hit of segment i at document position x
+    generates the candidate substrings of lengths |e| - τ to |e| + τ that hold
+    the segment at a position allowed by the multi-match-aware selection of
+    Pass-Join, which are verified afterwards.
+
+    All substrings within τ of an entity are found, so the valid matches are
+    a superset of those of Faerie, whose q-gram count bounds miss some of them
+    (e.g. 'bab db' for the entity 'bcbdb' with τ = 2). Results may therefore
+    differ from ``engine="faerie"``.
+
+    Parameters
+    ----------
+    entities_dict : :class:`~nemex.data.EntitiesDictionary`
+        Instance of entities dictionary.
+
+    t : int, optional
+        Edit distance threshold τ.
+
+    q : int, optional
+        Value of q-gram of the tokens.
+
+    References
+    ----------
+    .. [1] Li, G., Deng, D., Wang, J., & Feng, J. (2011). Pass-join: A partition-based
+       method for similarity joins. Proceedings of the VLDB Endowment, 5(3), 253-264.
+
+    """
+
+    def __init__(self,
+                 entities_dict: EntitiesDictionary,
+                 t: int = Default.SIM_THRESH_CHAR,
+                 q: int = Default.TOKEN_THRESH
+                 ) -> None:
+
+        self.entities_dict = entities_dict
+        self.similarity = Sim.EDIT_DIST
+        self.t = int(t)
+        self.q = q
+
+        # segment -> list of (entity id, entity length, segment number, segment start)
+        index = collections.defaultdict(list)
+
+        for e_idx, entity in entities_dict.idx2ent.items():
+
+            # entities shorter than q have no tokens and cannot be located
+            if len(entity) == 0:
+                continue
+
+            string = qgrams_to_char(entity.tokens)
+
+            # each segment needs at least one character
+            if len(string) <= self.t:
+                continue
+
+            for i, (start, segment) in enumerate(self.segments(string, self.t + 1)):
+                index[segment].append((e_idx, len(string), i, start))
+
+        self.index = dict(index)
+        self.segment_lengths = sorted({len(segment) for segment in self.index})
+
+        logger.info("Indexed {} segments of {} entities".format(len(self.index), len(entities_dict)))
+
+        return
+
+    @staticmethod
+    def segments(string: str, n: int) -> list:
+        """Splits a string into n even segments, where the last ones are
+        longer by one character if the length is not divisible by n.
+
+        Parameters
+        ----------
+        string : str
+            Input string.
+        n : int
+            Number of segments.
+
+        Returns
+        -------
+        List of segment start positions and segments.
+
+        """
+
+        size, longer = divmod(len(string), n)
+        segments = list()
+        start = 0
+
+        for i in range(n):
+            length = size + 1 if i >= n - longer else size
+            segments.append((start, string[start:start+length]))
+            start += length
+
+        return segments
+
+    def __call__(self, doc_tokens):
+        """Probes the index with all document positions.
+
+        Yields
+        -------
+        Entity with its start and end position (in tokens).
+
+        """
+
+        if not self.index or not doc_tokens:
+            return
+
+        doc = qgrams_to_char(doc_tokens)
+        doc_len = len(doc)
+        tau = self.t
+        candidates = set()
+
+        for x in range(doc_len):
+            for segment_len in self.segment_lengths:
+                if x + segment_len > doc_len:
+                    break
+
+                inv_list = self.index.get(doc[x:x+segment_len])
+
+                if inv_list is None:
+                    continue
+
+                for e_idx, e_len, i, p_i in inv_list:
+                    for delta in range(-tau, tau + 1):
+                        length = e_len + delta
+
+                        if length < self.q:
+                            continue
+
+                        # positions of the segment in a substring of this length
+                        p_min = max(p_i - i, p_i + delta - (tau - i), 0)
+                        p_max = min(p_i + i, p_i + delta + (tau - i), length - segment_len)
+
+                        for p in range(p_min, p_max + 1):
+                            start = x - p
+
+                            if 0 <= start and start + length <= doc_len:
+                                candidates.add((e_idx, start, length))
+
+        # q-gram at position i starts at character i
+        for e_idx, start, length in sorted(candidates):
+            yield e_idx, (start, start + length - self.q)
+
+        return
@@ -0,0 +1,494 @@
+"""
+Server module.
+
+Classes:
+    - AsyncNemex
+
+Functions:
+    - extract_batch
+    - serve
+    - main
+
+"""
+
+import json
+import asyncio
+import logging
+import argparse
+import concurrent.futures
+
+from nemex import Nemex, Default
+
+
+logger = logging.getLogger(__name__)
+
+# model of worker processes
+_nemex = None
+
+
+def init_worker(nemex: Nemex):
+    """Sets the model of a worker process."""
+
+    global _nemex
+    _nemex = nemex
+
+    return
+
+
+def extract_batch(requests: list, nemex: Nemex = None) -> list:
+    """Executes Nemex on a batch of documents. Identical requests of a batch
+    are executed once. Each request is executed on its own, so that a failing
+    request does not fail the others of its batch.
+
+    Parameters
+    ----------
+    requests : list
+        List of (document, valid_only) pairs.
+    nemex : Nemex, optional
+        Model. The model of the worker process is used if none provided.
+
+    Returns
+    -------
+    List of outputs, or of the exceptions raised by their requests.
+
+    """
+
+    nemex = _nemex if nemex is None else nemex
+    outputs = dict()
+    results = list()
+
+    for request in requests:
+        try:
+            if request not in outputs:
+                outputs[request] = nemex(*request)
+
+            results.append(outputs[request])
+
+        except Exception as err:
+            results.append(err)
+
+    return results
+
+
+class AsyncNemex:
+    """Asyncio front end of Nemex with micro-batching.
+
+    Requests are queued and executed in batches off the event loop, either by
+    one thread (the model is not thread-safe) or by a pool of worker processes,
+    each with its own copy of the model. A batch is formed as soon as a worker
+    is free, from the requests arriving within ``batch_window`` seconds of the
+    first one, so that concurrent requests share the dispatch to the worker
+    (and identical documents are extracted once). Other documents of a batch
+    are still tokenized, looked up and extracted one by one, so batching saves
+    dispatch overhead, not index work. The queue holds at most
+    ``max_queue`` requests; further requests are rejected with
+    :class:`asyncio.QueueFull` instead of building up latency.
+
+    Parameters
+    ----------
+    nemex : :class:`~nemex.nemex.Nemex`
+        Model.
+    processes : int, optional
+        Number of worker processes. If 0, batches are executed by one thread.
+    batch_window : float, optional
+        Seconds to wait for further requests of a batch.
+    max_batch : int, optional
+        Maximal number of requests per batch.
+    max_queue : int, optional
+        Maximal number of queued requests.
+
+    """
+
+    def __init__(self,
+                 nemex: Nemex,
+                 processes: int = 0,
+                 batch_window: float = Default.BATCH_WINDOW,
+                 max_batch: int = Default.MAX_BATCH,
+                 max_queue: int = Default.MAX_QUEUE
+                 ) -> None:
+
+        self.nemex = nemex
+        self.processes = processes
+        self.batch_window = batch_window
+        self.max_batch = max_batch
+        self.max_queue = max_queue
+
+        # created in the running event loop
+        self.queue = None
+        self.slots = None
+        self.executor = None
+        self.batcher = None
+        self.tasks = set()
+
+        return
+
+    async def start(self):
+        """Starts the executor and the batching task."""
+
+        if self.queue is not None:
+            return
+
+        if self.processes > 0:
+            self.executor = concurrent.futures.ProcessPoolExecutor(
+                self.processes, initializer=init_worker, initargs=(self.nemex,)
+            )
+        else:
+            self.executor = concurrent.futures.ThreadPoolExecutor(1)
+
+        self.queue = asyncio.Queue(self.max_queue)
+        self.slots = asyncio.Semaphore(max(self.processes, 1))
+        self.batcher = asyncio.ensure_future(self.batch_loop())
+
+        return
+
+    async def close(self):
+        """Stops the batching task and the executor."""
+
+        if self.queue is None:
+            return
+
+        # cancels the requests of a batch still being collected
+        self.batcher.cancel()
+
+        try:
+            await self.batcher
+        except asyncio.CancelledError:
+            pass
+
+        for task in list(self.tasks):
+            await task
+
+        # requests which never made it into a batch
+        while not self.queue.empty():
+            _, _, future = self.queue.get_nowait()
+            future.cancel()
+
+        self.executor.shutdown()
+        self.queue = None
+
+        return
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+        return
+
+    async def aextract(self, document: str, valid_only: bool = Default.VALID_ONLY) -> dict:
+        """Executes Nemex without blocking the event loop.
+
+        Parameters
+        ----------
+        document : str
+            Text document.
+        valid_only : bool
+            If true, return only as valid verified substrings.
+
+        Returns
+        -------
+        Dictionary with document and match list.
+
+        Raises
+        ------
+        asyncio.QueueFull
+            If the queue is full.
+
+        """
+
+        assert isinstance(document, str), "Expected a string as document."
+
+        await self.start()
+
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((document, valid_only, future))
+
+        return await future
+
+    async def collect(self) -> list:
+        """Waits for a request and collects the requests of its batch.
+
+        Returns
+        -------
+        List of queued requests.
+
+        """
+
+        loop = asyncio.get_running_loop()
+
+        batch = [await self.queue.get()]
+        deadline = loop.time() + self.batch_window
+
+        try:
+            while len(batch) < self.max_batch:
+                if not self.queue.empty():
+                    batch.append(self.queue.get_nowait())
+                    continue
+
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+        # closed within the batch window: requests already taken off the queue
+        except asyncio.CancelledError:
+            for _, _, future in batch:
+                future.cancel()
+            raise
+
+        return batch
+
+    async def batch_loop(self):
+        """Forms a batch whenever a worker is free."""
+
+        while True:
+            await self.slots.acquire()
+
+            try:
+                batch = await self.collect()
+            except asyncio.CancelledError:
+                self.slots.release()
+                raise
+
+            task = asyncio.ensure_future(self.run_batch(batch))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def run_batch(self, batch: list):
+        """Executes a batch and resolves the futures of its requests.
+
+        Parameters
+        ----------
+        batch : list
+            List of (document, valid_only, future) requests.
+
+        """
+
+        loop = asyncio.get_running_loop()
+        requests = [(document, valid_only) for document, valid_only, _ in batch]
+
+        try:
+            if self.processes > 0:
+                outputs = await loop.run_in_executor(self.executor, extract_batch, requests)
+            else:
+                outputs = await loop.run_in_executor(self.executor, extract_batch, requests, self.nemex)
+
+        except Exception as err:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(err)
+
+        else:
+            for (_, _, future), output in zip(batch, outputs):
+                if future.done():
+                    continue
+
+                if isinstance(output, Exception):
+                    future.set_exception(output)
+                else:
+                    future.set_result(output)
+
+        finally:
+            self.slots.release()
+
+        return
+
+
+async def respond(async_nemex: AsyncNemex, method: str, target: str, body: bytes) -> (int, dict):
+    """Answers a request.
+
+    Parameters
+    ----------
+    async_nemex : AsyncNemex
+        Model.
+    method : str
+        Request method.
+    target : str
+        Request target.
+    body : bytes
+        Request body.
+
+    Returns
+    -------
+    Status code and JSON payload.
+
+    """
+
+    if target == "/health":
+        queued = 0 if async_nemex.queue is None else async_nemex.queue.qsize()
+        return 200, {"status": "ok", "queued": queued}
+
+    if target != "/extract":
+        return 404, {"error": "Not found."}
+
+    if method != "POST":
+        return 405, {"error": "Use POST."}
+
+    try:
+        request = json.loads(body)
+        document = request["document"]
+        valid_only = request.get("valid_only", Default.VALID_ONLY)
+        assert isinstance(document, str)
+
+    except (ValueError, KeyError, TypeError, AttributeError, AssertionError):
+        return 400, {"error": "Expected a JSON object with a 'document' string."}
+
+    if not isinstance(valid_only, bool):
+        return 400, {"error": "Expected a boolean 'valid_only'."}
+
+    try:
+        return 200, await async_nemex.aextract(document, valid_only)
+
+    except asyncio.QueueFull:
+        return 503, {"error": "Too many queued requests."}
+
+    except Exception as err:
+        logger.exception("Extraction failed")
+        return 500, {"error": "Extraction failed: {}".format(err)}
+
+
+async def handle_connection(async_nemex: AsyncNemex, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    """Serves the HTTP/1.1 requests of a (keep-alive) connection.
+
+    Parameters
+    ----------
+    async_nemex : AsyncNemex
+        Model.
+    reader : asyncio.StreamReader
+        Connection reader.
+    writer : asyncio.StreamWriter
+        Connection writer.
+
+    """
+
+    reasons = {
+        200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 500: "Internal Server Error",
+        503: "Service Unavailable"
+    }
+
+    try:
+        while True:
+            line = await reader.readline()
+
+            if not line.strip():
+                break
+
+            method, target, _ = line.decode("latin-1").split(" ", 2)
+            headers = dict()
+
+            while True:
+                line = await reader.readline()
+
+                if line in (b"\r\n", b"\n", b""):
+                    break
+
+                key, value = line.decode("latin-1").split(":", 1)
+                headers[key.strip().lower()] = value.strip()
+
+            body = await reader.readexactly(int(headers.get("content-length", 0)))
+            status, payload = await respond(async_nemex, method, target, body)
+
+            data = json.dumps(payload).encode("utf-8")
+            keep_alive = headers.get("connection", "").lower() != "close"
+
+            writer.write(
+                "HTTP/1.1 {} {}\r\nContent-Type: application/json\r\nContent-Length: {}\r\nConnection: {}\r\n\r\n".format(
+                    status, reasons[status], len(data), "keep-alive" if keep_alive else "close"
+                ).encode("latin-1") + data
+            )
+            await writer.drain()
+
+            if not keep_alive:
+                break
+
+    except (ValueError, asyncio.IncompleteReadError, ConnectionError):
+        pass
+
+    finally:
+        writer.close()
+
+    return
+
+
+async def serve(async_nemex: AsyncNemex, host: str = "127.0.0.1", port: int = 8000, path: str = None):
+    """Starts a local HTTP server, answering ``POST /extract`` with a JSON object
+    ``{"document": ..., "valid_only": ...}`` and ``GET /health``.
+
+    Parameters
+    ----------
+    async_nemex : AsyncNemex
+        Model.
+    host : str, optional
+        Host of TCP socket.
+    port : int, optional
+        Port of TCP socket.
+    path : str, optional
+        Path of Unix socket, used instead of the TCP socket if given.
+
+    Returns
+    -------
+    Server.
+
+    """
+
+    await async_nemex.start()
+
+    def handler(reader, writer):
+        return handle_connection(async_nemex, reader, writer)
+
+    if path is not None:
+        server = await asyncio.start_unix_server(handler, path)
+        logger.info("Serving on {}".format(path))
+    else:
+        server = await asyncio.start_server(handler, host, port)
+        logger.info("Serving on {}:{}".format(host, port))
+
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Nemex extraction server.")
+    parser.add_argument("entities", help="File with entities (one per line, optionally 'id<TAB>entity').")
+    parser.add_argument("--token", action="store_true", help="Token-level instead of character-level similarity.")
+    parser.add_argument("--q", type=int, default=Default.TOKEN_THRESH)
+    parser.add_argument("--similarity", default=Default.SIMILARITY)
+    parser.add_argument("--t", type=float, default=Default.SIM_THRESH_CHAR)
+    parser.add_argument("--pruner", default=Default.PRUNER)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--unix", default=None, help="Unix socket path (instead of TCP).")
+    parser.add_argument("--processes", type=int, default=0)
+    parser.add_argument("--batch-window", type=float, default=Default.BATCH_WINDOW)
+    parser.add_argument("--max-batch", type=int, default=Default.MAX_BATCH)
+    parser.add_argument("--max-queue", type=int, default=Default.MAX_QUEUE)
+    args = parser.parse_args()
+
+    nemex = Nemex(
+        args.entities, char=not args.token, q=args.q, similarity=args.similarity, t=args.t, pruner=args.pruner
+    )
+    async_nemex = AsyncNemex(nemex, args.processes, args.batch_window, args.max_batch, args.max_queue)
+
+    async def run():
+        server = await serve(async_nemex, args.host, args.port, args.unix)
+
+        async with server:
+            try:
+                await server.serve_forever()
+            finally:
+                await async_nemex.close()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+
+    return
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+"""
+Sharding module.
+
+Classes:
+    - ShardedFaerie
+
+"""
+
+import os
+import shutil
+import logging
+import tempfile
+import multiprocessing
+
+from nemex import EntitiesDictionary, Default
+from nemex.faerie import Faerie
+
+
+logger = logging.getLogger(__name__)
+
+
+def build_shard(entities_dict: EntitiesDictionary, filename: str, faerie_kwargs: dict) -> str:
+    """Builds the Faerie model of a shard and saves it to file.
+
+    Parameters
+    ----------
+    entities_dict : EntitiesDictionary
+        Entities dictionary of the shard.
+    filename : str
+        Filename for saving the model.
+    faerie_kwargs : dict
+        Keyword arguments of :class:`~nemex.faerie.Faerie`.
+
+    Returns
+    -------
+    Filename of saved model.
+
+    """
+
+    Faerie(entities_dict, **faerie_kwargs).save(filename)
+
+    return filename
+
+
+def serve_shard(filename: str, conn):
+    """Loads the Faerie model of a shard and answers queries received over a pipe.
+
+    The bounds of the shard are sent first. Then, each received token list is
+    answered with the list of its candidates, until None is received.
+
+    Parameters
+    ----------
+    filename : str
+        Filename of the saved model.
+    conn : multiprocessing.connection.Connection
+        Worker end of the pipe.
+
+    """
+
+    faerie = Faerie.load_from_file(filename)
+    conn.send((faerie.min_Le, faerie.max_Te, faerie.min_Tl))
+
+    while True:
+        doc_tokens = conn.recv()
+
+        if doc_tokens is None:
+            break
+
+        conn.send(list(faerie(doc_tokens)))
+
+    conn.close()
+
+    return
+
+
+class ShardedFaerie:
+    """Faerie over a dictionary sharded by entity id range.
+
+    Each shard has its own bounds and inverted index and is built, and
+    optionally queried, independently. Shards keep the global entity ids of
+    the dictionary, and since they are split by id range, the candidates of
+    the shards are merged by concatenating them in shard order.
+
+    Parameters
+    ----------
+    entities_dict : :class:`~nemex.data.EntitiesDictionary`
+        Instance of entities dictionary.
+
+    n_shards : int
+        Number of shards.
+
+    processes : bool, optional
+        If true, shards are built in parallel, saved to ``directory`` and
+        queried in one worker process per shard. Otherwise, shards are built
+        and queried in this process.
+
+    directory : str, optional
+        Directory for the saved shards. A temporary directory is used if none
+        provided, and removed by :meth:`close`.
+
+    faerie_kwargs :
+        Keyword arguments of :class:`~nemex.faerie.Faerie`.
+
+    """
+
+    def __init__(self,
+                 entities_dict: EntitiesDictionary,
+                 n_shards: int,
+                 processes: bool = False,
+                 directory: str = None,
+                 **faerie_kwargs
+                 ) -> None:
+
+        if n_shards < 1:
+            raise ValueError("Number of shards must be at least 1")
+
+        self.faerie_kwargs = faerie_kwargs
+        self.faeries = list()
+        self.workers = list()
+        self.conns = list()
+
+        # temporary directory of the saved shards, removed on close
+        self.directory = None
+
+        shards = entities_dict.shard(n_shards)
+
+        if processes:
+            if directory is None:
+                directory = self.directory = tempfile.mkdtemp(prefix="nemex-shards-")
+
+            filenames = [os.path.join(directory, "shard-{}.pkl".format(k)) for k in range(len(shards))]
+            args = [(shard, filename, faerie_kwargs) for shard, filename in zip(shards, filenames)]
+
+            with multiprocessing.Pool(len(shards)) as pool:
+                pool.starmap(build_shard, args)
+
+            self.start_workers(filenames)
+
+        else:
+            self.faeries = [Faerie(shard, **faerie_kwargs) for shard in shards]
+            self.min_Le = min((faerie.min_Le for faerie in self.faeries), default=0)
+            self.max_Te = max((faerie.max_Te for faerie in self.faeries), default=0)
+            self.min_Tl = min((faerie.min_Tl for faerie in self.faeries), default=0)
+
+        # similarity interface used for verification
+        self.similarity = faerie_kwargs.get("similarity", Default.SIMILARITY)
+        self.t = faerie_kwargs.get("t", Default.SIM_THRESH_TOKEN)
+        self.q = faerie_kwargs.get("q", Default.TOKEN_THRESH)
+
+        logger.info("Sharded dictionary into {} shards".format(len(shards)))
+
+        return
+
+    @classmethod
+    def from_files(cls, filenames: list):
+        """Creates a sharded model from saved shards, queried in worker processes.
+
+        Parameters
+        ----------
+        filenames : list
+            Filenames of saved shards, in ascending order of entity ids.
+
+        Returns
+        -------
+        Sharded model.
+
+        """
+
+        sharded = cls.__new__(cls)
+        sharded.faeries = list()
+        sharded.workers = list()
+        sharded.conns = list()
+        sharded.directory = None
+
+        # similarity interface used for verification
+        faerie = Faerie.load_from_file(filenames[0])
+        sharded.faerie_kwargs = dict(similarity=faerie.similarity, t=faerie.t, q=faerie.q, pruner=faerie.prune_method)
+        sharded.similarity, sharded.t, sharded.q = faerie.similarity, faerie.t, faerie.q
+        del faerie
+
+        sharded.start_workers(filenames)
+
+        return sharded
+
+    def start_workers(self, filenames: list):
+        """Starts one worker process per saved shard.
+
+        Parameters
+        ----------
+        filenames : list
+            Filenames of saved shards.
+
+        """
+
+        for filename in filenames:
+            conn, worker_conn = multiprocessing.Pipe()
+            worker = multiprocessing.Process(target=serve_shard, args=(filename, worker_conn), daemon=True)
+            worker.start()
+
+            self.workers.append(worker)
+            self.conns.append(conn)
+
+        bounds = [conn.recv() for conn in self.conns]
+        self.min_Le = min((min_Le for min_Le, max_Te, min_Tl in bounds), default=0)
+        self.max_Te = max((max_Te for min_Le, max_Te, min_Tl in bounds), default=0)
+        self.min_Tl = min((min_Tl for min_Le, max_Te, min_Tl in bounds), default=0)
+
+        return
+
+    def close(self):
+        """Stops the worker processes and removes the temporary directory of the
+        saved shards."""
+
+        for conn in self.conns:
+            conn.send(None)
+            conn.close()
+
+        for worker in self.workers:
+            worker.join()
+
+        self.conns = list()
+        self.workers = list()
+
+        if self.directory is not None:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self.directory = None
+
+        return
+
+    def __call__(self, doc_tokens):
+        """Runs Faerie on all shards.
+
+        Yields
+        -------
+        Minimal entity with its start and end position.
+
+        """
+
+        if self.conns:
+
+            # all shards work in parallel
+            for conn in self.conns:
+                conn.send(doc_tokens)
+
+            # receive all answers before yielding, so that pipes stay in sync
+            candidates = [conn.recv() for conn in self.conns]
+
+            for shard_candidates in candidates:
+                yield from shard_candidates
+
+        else:
+            for faerie in self.faeries:
+                yield from faerie(doc_tokens)
+
+        return
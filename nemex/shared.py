@@ -0,0 +1,531 @@
+"""
+Shared module.
+
+Classes:
+    - SharedIndex
+    - SharedEntities
+    - SharedEntity
+
+Functions:
+    - init_worker
+    - extract
+    - extract_entities
+
+"""
+
+import copy
+import json
+import zlib
+import array
+import pickle
+import logging
+import collections
+
+from multiprocessing import shared_memory
+
+from nemex import Nemex
+from nemex.data import FaerieDataStructure
+from nemex.faerie import Faerie
+
+
+logger = logging.getLogger(__name__)
+
+# model of worker processes
+_nemex = None
+
+# separator of entity tokens (tokens hold neither)
+SEP = "\x00"
+
+
+class SharedEntity:
+    """Entity of a shared dictionary, decoded on access.
+
+    Parameters
+    ----------
+    tokens : list
+        Token list.
+    uids : list
+        Unique identifiers of entity and its aliases.
+    Le : int
+        Lower bound ⊥e.
+    Te : int
+        Upper bound Te.
+    Tl : int
+        Overlap lower bound.
+
+    """
+
+    __slots__ = ("tokens", "uids", "Le", "Te", "Tl")
+
+    def __init__(self, tokens: list, uids: list, Le: int, Te: int, Tl: int):
+        self.tokens = tokens
+        self.uids = uids
+        self.Le = Le
+        self.Te = Te
+        self.Tl = Tl
+
+        return
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+
+class SharedEntities:
+    """Read-only entities dictionary on the arrays of a :class:`SharedIndex`.
+
+    Parameters
+    ----------
+    index : SharedIndex
+        Shared index.
+
+    """
+
+    def __init__(self, index):
+        self.index = index
+
+        return
+
+    def __len__(self) -> int:
+        return self.index.n_entities
+
+    def __contains__(self, idx) -> bool:
+        return 0 <= idx < len(self.index.Te) and self.index.Te[idx] >= 0
+
+    def __getitem__(self, idx) -> SharedEntity:
+        """Decodes the entity with the given entity id.
+
+        Parameters
+        ----------
+        idx : int
+            Entity id.
+
+        Returns
+        -------
+        Entity.
+
+        """
+
+        if idx not in self:
+            raise KeyError(idx)
+
+        index = self.index
+
+        return SharedEntity(
+            index.string(index.entity_offsets, index.entity_blob, idx).split(SEP),
+            json.loads(index.string(index.uid_offsets, index.uid_blob, idx)),
+            index.Le[idx], index.Te[idx], index.Tl[idx]
+        )
+
+    def __iter__(self):
+        for idx in range(len(self.index.Te)):
+            if self.index.Te[idx] >= 0:
+                yield idx
+
+
+class SharedIndex:
+    """Flat copy of a Faerie model in shared memory.
+
+    The inverted index and the entities of a model are compiled into flat
+    arrays in one :class:`multiprocessing.shared_memory.SharedMemory` segment:
+    an open-addressing hash table from token to token id, the token strings,
+    the inverted lists (postings with offsets per token id), the bounds
+    (⊥e, Te, Tl) per entity id and the token and uid strings of the entities.
+    Processes (also started with ``spawn`` or ``forkserver``) attach to the
+    segment by its name and read the arrays through read-only memory views,
+    so no Python objects of the index are created or copied per process and
+    the memory of the index is shared by all of them.
+
+    Inverted lists are served in the layout of
+    :meth:`~nemex.data.InvertedIndex.__getitem__` (without prefix filtering
+    and length partitions, which only filter), so the Faerie algorithm runs
+    unchanged on the views.
+
+    Parameters
+    ----------
+    shm : multiprocessing.shared_memory.SharedMemory
+        Shared memory segment.
+    layout : dict
+        Mapping from array name to (offset, typecode, length) in the segment.
+    owner : bool
+        If true, this process created the segment.
+
+    """
+
+    ARRAYS = ("slots", "token_offsets", "token_blob", "list_offsets", "postings",
+              "Le", "Te", "Tl", "entity_offsets", "entity_blob", "uid_offsets", "uid_blob")
+
+    def __init__(self, shm: shared_memory.SharedMemory, layout: dict, owner: bool = False):
+        self.shm = shm
+        self.layout = layout
+        self.owner = owner
+
+        buf = shm.buf.toreadonly()
+        self.views = [buf]
+
+        for name in self.ARRAYS:
+            offset, typecode, length = layout[name]
+            view = buf[offset:offset + length * array.array(typecode).itemsize].cast(typecode)
+            self.views.append(view)
+            setattr(self, name, view)
+
+        self.mask = len(self.slots) - 1
+        self.n_entities = sum(1 for Te in self.Te if Te >= 0)
+
+        # only full inverted lists
+        self.prefix_filter = False
+        self.token2partitions = dict()
+
+        return
+
+    @staticmethod
+    def hash(token: bytes) -> int:
+        return zlib.crc32(token)
+
+    @staticmethod
+    def string(offsets, blob, k: int) -> str:
+        return bytes(blob[offsets[k]:offsets[k+1]]).decode("utf-8")
+
+    @classmethod
+    def from_faerie(cls, faerie: Faerie):
+        """Compiles the inverted index and entities of a Faerie model into a new
+        shared memory segment.
+
+        Parameters
+        ----------
+        faerie : :class:`~nemex.faerie.Faerie`
+            Faerie model.
+
+        Returns
+        -------
+        Shared index (owner of the segment).
+
+        """
+
+        entities_dict = faerie.entities_dict
+        token2entities = faerie.inv_index.token2entities
+
+        # full inverted lists (prefix-filter mode indexes prefixes only)
+        if faerie.inv_index.prefix_filter:
+            token2entities = collections.defaultdict(list)
+
+            for eidx, entity in entities_dict.idx2ent.items():
+                for token in entity.tokens:
+                    token2entities[token].append(eidx)
+
+        tokens = [token.encode("utf-8") for token in token2entities]
+
+        # open addressing with linear probing, at most half full
+        n_slots = 1
+        while n_slots < 2 * len(tokens):
+            n_slots *= 2
+
+        slots = array.array("i", [-1]) * n_slots
+        token_offsets = array.array("q", [0])
+        list_offsets = array.array("q", [0])
+        postings = array.array("i")
+
+        for token_id, (token, inv_list) in enumerate(zip(tokens, token2entities.values())):
+            slot = cls.hash(token) & (n_slots - 1)
+
+            while slots[slot] != -1:
+                slot = (slot + 1) & (n_slots - 1)
+
+            slots[slot] = token_id
+            token_offsets.append(token_offsets[-1] + len(token))
+            postings.extend(inv_list)
+            list_offsets.append(len(postings))
+
+        # entities by entity id (missing ids have negative bounds)
+        n_ids = max(entities_dict.idx2ent, default=-1) + 1
+        Le, Te, Tl = array.array("i", [-1]) * n_ids, array.array("i", [-1]) * n_ids, array.array("i", [-1]) * n_ids
+        entity_offsets, uid_offsets = array.array("q", [0]), array.array("q", [0])
+        entity_blob, uid_blob = bytearray(), bytearray()
+
+        for eidx in range(n_ids):
+            entity = entities_dict.idx2ent.get(eidx)
+
+            if entity is not None:
+                Le[eidx], Te[eidx], Tl[eidx] = entity.Le, entity.Te, entity.Tl
+                entity_blob += SEP.join(entity.tokens).encode("utf-8")
+                uid_blob += json.dumps(entity.uids).encode("utf-8")
+
+            entity_offsets.append(len(entity_blob))
+            uid_offsets.append(len(uid_blob))
+
+        arrays = dict(
+            slots=slots, token_offsets=token_offsets, token_blob=array.array("B", b"".join(tokens)),
+            list_offsets=list_offsets, postings=postings, Le=Le, Te=Te, Tl=Tl,
+            entity_offsets=entity_offsets, entity_blob=array.array("B", entity_blob),
+            uid_offsets=uid_offsets, uid_blob=array.array("B", uid_blob)
+        )
+
+        # 8-byte aligned arrays
+        layout = dict()
+        size = 0
+
+        for name in cls.ARRAYS:
+            layout[name] = (size, arrays[name].typecode, len(arrays[name]))
+            size += -(-len(arrays[name]) * arrays[name].itemsize // 8) * 8
+
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+
+        for name in cls.ARRAYS:
+            data = arrays[name].tobytes()
+            shm.buf[layout[name][0]:layout[name][0] + len(data)] = data
+
+        logger.info("Shared index of {} tokens and {} entities in {} bytes ({})".format(
+            len(tokens), len(entities_dict), size, shm.name
+        ))
+
+        return cls(shm, layout, owner=True)
+
+    @property
+    def handle(self) -> tuple:
+        """Returns the (picklable) name and layout of the segment.
+
+        Returns
+        -------
+        Segment name and layout.
+
+        """
+
+        return self.shm.name, self.layout
+
+    @classmethod
+    def attach(cls, handle: tuple):
+        """Attaches to the segment of a shared index.
+
+        Parameters
+        ----------
+        handle : tuple
+            Segment name and layout (see :attr:`handle`).
+
+        Returns
+        -------
+        Shared index.
+
+        """
+
+        name, layout = handle
+
+        try:
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # before Python 3.13, attaching registers the segment with the resource
+            # tracker, which workers share with the process which created it
+            shm = shared_memory.SharedMemory(name=name)
+
+        return cls(shm, layout)
+
+    def close(self, unlink: bool = None):
+        """Releases the views and detaches from the segment.
+
+        Parameters
+        ----------
+        unlink : bool, optional
+            If true, destroys the segment. By default, the owner destroys it.
+
+        """
+
+        for view in reversed(self.views):
+            view.release()
+
+        self.views = list()
+        self.shm.close()
+
+        if self.owner if unlink is None else unlink:
+            self.shm.unlink()
+
+        return
+
+    def token_id(self, token: str) -> int:
+        """Looks a token up in the hash table.
+
+        Parameters
+        ----------
+        token : str
+            Token.
+
+        Returns
+        -------
+        Token id, or -1 if the token is not indexed.
+
+        """
+
+        key = token.encode("utf-8")
+        slot = self.hash(key) & self.mask
+
+        while True:
+            token_id = self.slots[slot]
+
+            if token_id == -1:
+                return -1
+
+            if self.token_blob[self.token_offsets[token_id]:self.token_offsets[token_id+1]] == key:
+                return token_id
+
+            slot = (slot + 1) & self.mask
+
+    def __getitem__(self, tokens: list) -> collections.OrderedDict:
+        """Returns the inverted lists for the given tokens, grouped by distinct token
+        (see :meth:`~nemex.data.InvertedIndex.__getitem__`). Inverted lists are
+        copied from the segment for the time of the call.
+
+        Parameters
+        ----------
+        tokens : list
+            Token list.
+
+        Returns
+        -------
+        Mapping from token to tuple of sorted positions and inverted list.
+
+        """
+
+        token2positions = collections.OrderedDict()
+        token2id = dict()
+
+        for position, token in enumerate(tokens):
+            if token not in token2id:
+                token2id[token] = self.token_id(token)
+
+            if token2id[token] >= 0:
+                token2positions.setdefault(token, list()).append(position)
+
+        inv_lists = collections.OrderedDict()
+
+        for token, positions in token2positions.items():
+            token_id = token2id[token]
+            inv_lists[token] = (positions, self.postings[self.list_offsets[token_id]:self.list_offsets[token_id+1]].tolist())
+
+        return inv_lists
+
+    @classmethod
+    def from_nemex(cls, nemex: Nemex):
+        """Compiles the model of a Nemex instance.
+
+        Parameters
+        ----------
+        nemex : :class:`~nemex.nemex.Nemex`
+            Model with the Faerie engine (without shards, short or exact matching).
+
+        Returns
+        -------
+        Shared index, and the model without its index and dictionary
+        (to be restored in workers by :meth:`nemex`).
+
+        """
+
+        if type(nemex.engine) is not Faerie or nemex.short_engine is not None or nemex.exact is not None:
+            raise ValueError("Shared indexes require the Faerie engine without shards, short or exact matching.")
+
+        index = cls.from_faerie(nemex.faerie)
+
+        faerie = copy.copy(nemex.faerie)
+        FaerieDataStructure.__init__(faerie, None)
+        faerie.inv_index = None
+        faerie.gate_tokens = None
+
+        model = copy.copy(nemex)
+        model.E = None
+        model.faerie = model.engine = faerie
+        model.region_filter = None
+        model.cache_ent_repr = dict()
+        model.lookup_postings = model.length2entities = model.lookup_sim = None
+
+        return index, pickle.dumps(model)
+
+    def nemex(self, model: bytes) -> Nemex:
+        """Restores a model on the views of this index.
+
+        Parameters
+        ----------
+        model : bytes
+            Pickled model without index and dictionary (see :meth:`from_nemex`).
+
+        Returns
+        -------
+        Nemex model.
+
+        """
+
+        nemex = pickle.loads(model)
+        entities = SharedEntities(self)
+
+        nemex.E = entities
+        nemex.faerie.entities_dict = entities
+        nemex.faerie.inv_index = self
+
+        return nemex
+
+
+def init_worker(handle: tuple, model: bytes):
+    """Attaches a worker process to a shared index and restores its model.
+
+    Parameters
+    ----------
+    handle : tuple
+        Segment name and layout (see :attr:`SharedIndex.handle`). If None, the
+        model is a complete pickled model.
+    model : bytes
+        Pickled model (see :meth:`SharedIndex.from_nemex`).
+
+    """
+
+    global _nemex
+
+    if handle is None:
+        _nemex = pickle.loads(model)
+    else:
+        _nemex = SharedIndex.attach(handle).nemex(model)
+
+    return
+
+
+def extract(document: str, valid_only: bool = True) -> dict:
+    """Executes the model of a worker process (see :func:`init_worker`).
+
+    Parameters
+    ----------
+    document : str
+        Text document.
+    valid_only : bool
+        If true, return only as valid verified substrings.
+
+    Returns
+    -------
+    Dictionary with document and match list.
+
+    """
+
+    return _nemex(document, valid_only)
+
+
+def extract_entities(doc_tokens: list, items: list, exact_hits: list, valid_only: bool = True) -> list:
+    """Runs the per-entity part of Faerie and the verification for a share of the
+    entities hitting a document in the model of a worker process (see
+    :meth:`~nemex.nemex.Nemex.__call__` with ``workers``).
+
+    Parameters
+    ----------
+    doc_tokens : list
+        Document tokens.
+    items : list
+        Pairs of entity id and sorted position list Pe.
+    exact_hits : list
+        Exact matches, whose candidates of the same entity within them are skipped.
+    valid_only : bool
+        If true, return only as valid verified substrings.
+
+    Returns
+    -------
+    Match list.
+
+    """
+
+    candidates = _nemex.faerie.process_entities(items)
+
+    if exact_hits:
+        candidates = _nemex.skip_covered(candidates, exact_hits, len(doc_tokens))
+
+    return _nemex.output(doc_tokens, ((e, span, False) for e, span in candidates), valid_only)["matches"]
@@ -0,0 +1,225 @@
+"""
+Stream module.
+
+Classes:
+    - NemexStream
+
+"""
+
+import logging
+
+from nemex import Nemex
+
+
+logger = logging.getLogger(__name__)
+
+
+class NemexStream:
+    """Incremental extraction over an append-only text stream.
+
+    Appended text is tokenized as the continuation of the stream: a q-gram
+    (character level) or word (token level) that the next text may still
+    extend is held back until it is complete. Only the last tokens that a new
+    match can reach back to are kept, i.e. the longest candidate window of the
+    model (⊤e of Faerie, the longest exact and short entity), doubled if an
+    exact pre-pass may cover candidates (which then also wait for the exact
+    matches that may still cover them). After an append, the engines of the
+    model run on these tokens and the new ones, so the cost follows the
+    appended text, and the candidates ending on a new token are verified.
+
+    A match is emitted once, as soon as its window lies within the stream, since
+    future text cannot change it then. Candidate windows running past the end
+    of the stream are emitted by :meth:`flush`. Spans refer to the whole stream
+    (as if it was one document), and only valid matches are emitted.
+
+    Parameters
+    ----------
+    nemex : :class:`~nemex.nemex.Nemex`
+        Model with the Faerie or the exact engine.
+
+    """
+
+    def __init__(self, nemex: Nemex) -> None:
+        if nemex.tokenizer.unique:
+            raise ValueError("Streams require a tokenizer without unique tokens.")
+
+        if nemex.faerie is not None:
+            window = nemex.faerie.max_Te
+        elif nemex.engine is None:
+            window = 0
+        else:
+            raise ValueError("Streams require the Faerie or the exact engine.")
+
+        q = nemex.tokenizer.q if nemex.char else 1
+
+        # exact matches have the length of their entity
+        delay = 0
+
+        if nemex.exact is not None:
+            delay = max([0] + [len(nemex.E[e]) for e in nemex.E]) + q - 1
+            window = max(window, delay)
+
+        if nemex.short_engine is not None:
+            window = max(window, max(nemex.short_engine.window2edits, default=q) - q + 1)
+
+        # candidates are skipped if they overlap an exact match, which starts before them
+        if nemex.exact is not None:
+            window *= 2
+
+        self.nemex = nemex
+        self.window = max(window, 1)
+        self.delay = delay
+
+        self.reset()
+
+        return
+
+    def reset(self):
+        """Starts a new (empty) stream."""
+
+        # raw text of the incomplete token
+        self.pending = ""
+
+        # kept tokens, global position of the first one and, at token level,
+        # its character offset in the stream of space-separated tokens
+        self.tokens = list()
+        self.base = 0
+        self.char_base = 0
+
+        # candidates ending before this position are emitted
+        self.emitted_end = 0
+
+        return
+
+    def __len__(self) -> int:
+        """Returns the number of (complete) tokens of the stream.
+
+        Returns
+        -------
+        Number of tokens.
+
+        """
+
+        return self.base + len(self.tokens)
+
+    def split(self, text: str, final: bool = False) -> list:
+        """Tokenizes appended text as the continuation of the stream.
+
+        Parameters
+        ----------
+        text : str
+            Appended text.
+        final : bool
+            If true, the stream ends with this text.
+
+        Returns
+        -------
+        New complete tokens.
+
+        """
+
+        text = self.pending + text
+        tokenizer = self.nemex.tokenizer
+
+        if self.nemex.char:
+            # the last q - 1 characters start q-grams not complete yet
+            keep = min(len(text), tokenizer.q - 1)
+            self.pending = "" if final else text[len(text) - keep:]
+
+            return tokenizer.tokenize(text)
+
+        # the last word may continue
+        if final or not text or text[-1].isspace():
+            self.pending = ""
+            return tokenizer.tokenize(text)
+
+        words = text.split()
+        self.pending = text[text.rfind(words[-1]):]
+
+        return tokenizer.tokenize(text[:len(text) - len(self.pending)])
+
+    def extract(self, final: bool = False) -> list:
+        """Verifies the candidates ending after the emitted part of the stream.
+
+        Parameters
+        ----------
+        final : bool
+            If true, candidates running past the end of the stream are included.
+
+        Returns
+        -------
+        Match list.
+
+        """
+
+        # candidates wait for the exact matches which may cover them
+        end = len(self) if final else max(self.emitted_end, len(self) - self.delay)
+        first = self.emitted_end - self.base
+
+        candidates = (
+            (e, (i, j), exact) for e, (i, j), exact in self.nemex.candidates(self.tokens)
+            if j >= first and (final or self.base + j < end)
+        )
+
+        matches = self.nemex.output(self.tokens, candidates, valid_only=True)["matches"]
+
+        # spans in the stream
+        offset = self.base if self.nemex.char else self.char_base
+
+        for match in matches:
+            match["span"] = [match["span"][0] + offset, match["span"][1] + offset]
+
+        self.emitted_end = end
+
+        # tokens out of reach of later matches
+        drop = max(0, self.emitted_end - self.window - self.base)
+
+        if drop > 0:
+            if not self.nemex.char:
+                self.char_base += sum(len(token) + 1 for token in self.tokens[:drop])
+
+            del self.tokens[:drop]
+            self.base += drop
+
+        return matches
+
+    def append(self, text: str) -> list:
+        """Appends text to the stream.
+
+        Parameters
+        ----------
+        text : str
+            Appended text.
+
+        Returns
+        -------
+        List of the new final matches.
+
+        """
+
+        assert isinstance(text, str), "Expected a string as text."
+
+        tokens = self.split(text)
+
+        if not tokens:
+            return list()
+
+        self.tokens.extend(tokens)
+
+        return self.extract()
+
+    def flush(self) -> list:
+        """Ends the stream, and starts a new one.
+
+        Returns
+        -------
+        List of the remaining matches.
+
+        """
+
+        self.tokens.extend(self.split("", final=True))
+
+        matches = self.extract(final=True) if self.tokens else list()
+        self.reset()
+
+        return matches
@@ -0,0 +1,175 @@
+"""
+Trie module.
+
+Classes:
+    - TrieIndex
+
+"""
+
+import logging
+
+from nemex import EntitiesDictionary, Default
+from nemex.utils import Sim, qgrams_to_char
+
+
+logger = logging.getLogger(__name__)
+
+
+class TrieIndex:
+    """Levenshtein automaton matching over a trie of entity strings.
+
+    Entity strings are compiled into a character trie. From each document
+    position, the trie is traversed depth-first while a Levenshtein automaton
+    of threshold τ runs over the document characters that follow. Its state
+    at a trie node is the band |j - depth| <= τ of the edit distance row of the
+    node's prefix against the next j document characters. Once no cell of the
+    band is within τ, the state is dead and the whole subtree is abandoned. At
+    the end of an entity, every substring length with a cell within τ is a
+    match, so no q-gram postings are needed.
+
+    As with :class:`~nemex.segment.SegmentIndex`, all substrings within τ of
+    an entity are found, so the valid matches are a superset of those of
+    Faerie, whose q-gram count bounds miss some of them. Results may
+    therefore differ from ``engine="faerie"``.
+
+    Parameters
+    ----------
+    entities_dict : :class:`~nemex.data.EntitiesDictionary`
+        Instance of entities dictionary.
+
+    t : int, optional
+        Edit distance threshold τ.
+
+    q : int, optional
+        Value of q-gram of the tokens.
+
+    """
+
+    # key of the entity ids of a trie node (no character is empty)
+    END = ""
+
+    def __init__(self,
+                 entities_dict: EntitiesDictionary,
+                 t: int = Default.SIM_THRESH_CHAR,
+                 q: int = Default.TOKEN_THRESH
+                 ) -> None:
+
+        self.entities_dict = entities_dict
+        self.similarity = Sim.EDIT_DIST
+        self.t = int(t)
+        self.q = q
+
+        self.root = dict()
+        self.max_len = 0
+        n_nodes = 1
+
+        for e_idx, entity in entities_dict.idx2ent.items():
+
+            # entities shorter than q have no tokens and cannot be located
+            if len(entity) == 0:
+                continue
+
+            string = qgrams_to_char(entity.tokens)
+
+            # entities up to τ characters would match any short substring
+            if len(string) <= self.t:
+                continue
+
+            node = self.root
+            for char in string:
+                if char not in node:
+                    node[char] = dict()
+                    n_nodes += 1
+                node = node[char]
+
+            node.setdefault(self.END, list()).append(e_idx)
+            self.max_len = max(self.max_len, len(string))
+
+        logger.info("Compiled {} entities into a trie of {} nodes".format(len(entities_dict), n_nodes))
+
+        return
+
+    def match_at(self, doc: str, start: int):
+        """Runs the automaton from a document position over the trie.
+
+        Parameters
+        ----------
+        doc : str
+            Document string.
+        start : int
+            Start position in the document.
+
+        Yields
+        -------
+        Entity with the length of the matching substring.
+
+        """
+
+        tau = self.t
+        text = doc[start:start+self.max_len+tau]
+        n = len(text)
+        inf = tau + 1
+
+        # edit distances of the empty prefix (only the band is kept)
+        stack = [(self.root, 0, [j if j <= tau else inf for j in range(n + 1)])]
+
+        while stack:
+            node, depth, row = stack.pop()
+
+            for char, child in node.items():
+                if char == self.END:
+                    for length in range(max(depth - tau, 0), min(depth + tau, n) + 1):
+                        if row[length] <= tau:
+                            for e_idx in child:
+                                yield e_idx, length
+                    continue
+
+                d = depth + 1
+                lo, hi = max(d - tau, 1), min(d + tau, n)
+
+                new_row = [inf] * (n + 1)
+                if d <= tau:
+                    new_row[0] = d
+
+                alive = d <= tau
+                for j in range(lo, hi + 1):
+                    cost = min(
+                        row[j-1] + (text[j-1] != char),
+                        row[j] + 1,
+                        new_row[j-1] + 1
+                    )
+                    if cost <= tau:
+                        new_row[j] = cost
+                        alive = True
+
+                # dead state: no prefix in the subtree can match
+                if alive:
+                    stack.append((child, d, new_row))
+
+        return
+
+    def __call__(self, doc_tokens):
+        """Runs the automaton from all document positions.
+
+        Yields
+        -------
+        Entity with its start and end position (in tokens).
+
+        """
+
+        if not self.root or not doc_tokens:
+            return
+
+        doc = qgrams_to_char(doc_tokens)
+        candidates = set()
+
+        for start in range(len(doc)):
+            for e_idx, length in self.match_at(doc, start):
+                if length >= self.q:
+                    candidates.add((e_idx, start, length))
+
+        # q-gram at position i starts at character i
+        for e_idx, start, length in sorted(candidates):
+            yield e_idx, (start, start + length - self.q)
+
+        return
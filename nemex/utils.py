@@ -5,18 +5,54 @@ Classes:
     - Tokenizer
     - Pruner
     - Sim
+    - Engine
 
 """
 
+import re
 import collections
 import logging
+import unicodedata
 
-from typing import List, Tuple
+from typing import List, Tuple, Sequence
 
 from nemex import Default
 
 logger = logging.getLogger(__name__)
 
+# words of token-level tokenization (as of str.split)
+WORD = re.compile(r"\S+")
+
+# runs of whitespace other than single spaces
+WHITESPACE = re.compile(r"\s\s+|[^\S ]")
+
+# runs of characters of accent stripping (see :func:`accent_table`)
+ACCENTED = re.compile("[\u00c0-\u036f]+")
+
+
+def accent_table() -> dict:
+    """Builds the translation table of accent stripping: precomposed Latin
+    letters map to their base letter, and combining marks are removed.
+
+    Returns
+    -------
+    Translation table.
+
+    """
+
+    table = dict.fromkeys(range(0x300, 0x370))
+
+    for c in map(chr, range(0xC0, 0x250)):
+        base = "".join(d for d in unicodedata.normalize("NFD", c) if not unicodedata.combining(d))
+
+        if len(base) == 1 and base != c:
+            table[ord(c)] = base
+
+    return table
+
+
+ACCENTS = accent_table()
+
 
 class Tokenizer:
     """Tokenizer class.
@@ -35,6 +71,10 @@ class Tokenizer:
         If true, preserves order with uniqueness.
     lower : bool
         If true, converts document to lower case.
+    strip_accents : bool
+        If true, strips the accents of Latin letters and removes combining marks.
+    collapse_whitespace : bool
+        If true, replaces runs of whitespace with one space.
 
     """
 
@@ -43,16 +83,119 @@ class Tokenizer:
                  q: int = Default.TOKEN_THRESH,
                  special_char: str = Default.SPECIAL_CHAR,
                  unique: bool = Default.UNIQUE,
-                 lower: bool = Default.LOWER
+                 lower: bool = Default.LOWER,
+                 strip_accents: bool = Default.STRIP_ACCENTS,
+                 collapse_whitespace: bool = Default.COLLAPSE_WHITESPACE
                  ) -> None:
         self.char = char
         self.q = q
         self.special_char = special_char
         self.unique = unique
         self.lower = lower
+        self.strip_accents = strip_accents
+        self.collapse_whitespace = collapse_whitespace
 
         return
     
+    def normalize(self, string: str) -> str:
+        """Normalizes the string before tokenization (lower case and, at character
+        level, special character for space).
+
+        Optionally, runs of whitespace are collapsed first, and accents of
+        (non-ASCII) strings are stripped with a translation table, applied only to
+        the runs of characters it covers.
+
+        Parameters
+        ----------
+        string : str
+            Document string.
+
+        Returns
+        -------
+        Normalized string.
+
+        """
+
+        # (whitespace other than space is not printable)
+        if self.collapse_whitespace and ("  " in string or not string.isprintable()):
+            string = WHITESPACE.sub(" ", string)
+
+        # lower
+        if self.lower:
+            string = string.lower()
+
+        if self.strip_accents and not string.isascii():
+            string = ACCENTED.sub(lambda run: run.group().translate(ACCENTS), string)
+
+        if self.char and self.special_char:
+            string = string.replace(" ", self.special_char)
+
+        return string
+
+    def qgrams(self, string: str) -> list:
+        """Returns the q-grams of a (normalized) string.
+
+        Parameters
+        ----------
+        string : str
+            Normalized string.
+
+        Returns
+        -------
+        A list of q-grams.
+
+        """
+
+        if self.q == 1:
+            return list(string)
+
+        # the k-th characters of all q-grams at once
+        return list(map("".join, zip(*[string[k:] for k in range(self.q)])))
+
+    def offsets_index(self, string: str) -> list:
+        """Maps the characters of the normalized string to their position in the
+        string, if normalization changes lengths (lower casing 'İ', collapsing
+        whitespace or removing combining marks).
+
+        Parameters
+        ----------
+        string : str
+            Document string.
+
+        Returns
+        -------
+        Position in the string of each character of the normalized string, and
+        the length of the string, or None if the normalization keeps positions.
+        A token ending before position p of the normalized string ends in the
+        string at index[p], covering removed characters, or after index[p - 1]
+        within the lower case of 'İ'.
+
+        """
+
+        patterns = list()
+
+        if self.collapse_whitespace:
+            patterns.append(r"\s\s+")
+        if self.lower:
+            patterns.append("\u0130")
+        if self.strip_accents:
+            patterns.append("[\u0300-\u036f]")
+
+        index = list()
+        k = 0
+
+        for change in re.finditer("|".join(patterns), string) if patterns else ():
+            index.extend(range(k, change.start()))
+            index.extend([change.start()] * len(self.normalize(change.group())))
+            k = change.end()
+
+        if not k:
+            return None
+
+        index.extend(range(k, len(string) + 1))
+
+        return index
+
     def tokenize(self, string: str) -> list:
         """Tokenizes the string and returns the tokens as list.
 
@@ -67,15 +210,11 @@ class Tokenizer:
 
         """
 
-        # lower
-        if self.lower:
-            string = string.lower()
+        string = self.normalize(string)
 
         # char
         if self.char:
-            if self.special_char:
-                string = string.replace(" ", self.special_char)
-            tokens = [string[i:i+self.q] for i in range(len(string) - self.q + 1)]
+            tokens = self.qgrams(string)
         else:
             tokens = string.split()
 
@@ -91,6 +230,65 @@ class Tokenizer:
 
         return tokens
 
+    def tokenize_offsets(self, string: str) -> Tuple[list, Sequence[int], Sequence[int]]:
+        """Tokenizes the string like :meth:`tokenize`, and returns the offsets of
+        the tokens in the (original) string.
+
+        Parameters
+        ----------
+        string : str
+            Document string which should be tokenized.
+
+        Returns
+        -------
+        Tokens, and start and end (exclusive) offsets of each token in the string
+        (ranges at character level, unless normalization changes lengths).
+
+        """
+
+        normalized = self.normalize(string)
+
+        # positions of the normalized string in the string, if normalization changes lengths
+        index = None
+
+        if len(normalized) != len(string) or self.strip_accents or self.collapse_whitespace:
+            index = self.offsets_index(string)
+
+        # char
+        if self.char:
+            tokens = self.qgrams(normalized)
+
+            if index is None:
+                starts, ends = range(len(tokens)), range(self.q, len(tokens) + self.q)
+            else:
+                starts = index[:len(tokens)]
+                ends = [max(index[i + self.q - 1] + 1, index[i + self.q]) for i in range(len(tokens))]
+
+        else:
+            tokens, starts, ends = list(), list(), list()
+
+            for word in WORD.finditer(normalized):
+                tokens.append(word.group())
+                starts.append(word.start())
+                ends.append(word.end())
+
+            if index is not None:
+                starts = [index[i] for i in starts]
+                ends = [max(index[i - 1] + 1, index[i]) for i in ends]
+
+        # unique (offsets of the first occurrence)
+        if self.unique:
+            first = dict()
+
+            for k, token in enumerate(tokens):
+                first.setdefault(token, k)
+
+            tokens = list(first)
+            starts = [starts[k] for k in first.values()]
+            ends = [ends[k] for k in first.values()]
+
+        return tokens, starts, ends
+
 
 class Pruner(object):
     """
@@ -117,6 +315,21 @@ class Sim(object):
     CHAR_BASED = (EDIT_DIST, EDIT_SIM)
 
 
+class Engine(object):
+    """
+    Extraction engine enum.
+    """
+
+    FAERIE: str = "faerie"
+    SEGMENT: str = "segment"
+    TRIE: str = "trie"
+    EXACT: str = "exact"
+    LSH: str = "lsh"
+
+    EDIT_DIST_BASED = (SEGMENT, TRIE)
+    TOKEN_BASED = (LSH,)
+
+
 def qgrams_to_char(s: list) -> str:
     """Converts a list of q-grams to a string.
 
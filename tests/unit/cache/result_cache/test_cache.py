@@ -0,0 +1,65 @@
+import unittest
+
+from nemex import ResultCache
+from nemex.cache import sentence_spans
+
+
+class TestResultCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.matches = [{"entity": ["chaudhuri", 2], "span": [1, 9], "match": "chadhuri", "score": 1, "valid": True}]
+        return None
+
+    def test_eviction(self):
+        for policy, kept in (("lru", {b"a", b"c"}), ("fifo", {b"b", b"c"})):
+            cache = ResultCache(max_entries=2, policy=policy)
+            cache.put(b"a", self.matches)
+            cache.put(b"b", self.matches)
+
+            self.assertIs(cache.get(b"a"), self.matches)
+            cache.put(b"c", self.matches)
+
+            self.assertEqual(set(cache.entries), kept)
+            self.assertEqual(cache.stats["evictions"], 1)
+        return
+
+    def test_memory(self):
+        size = ResultCache.sizeof(self.matches)
+        cache = ResultCache(max_bytes=3 * size)
+
+        for k in range(10):
+            cache.put(bytes([k]), self.matches)
+
+        self.assertLessEqual(cache.nbytes, 3 * size)
+        self.assertEqual(cache.nbytes, sum(size for _, size in cache.entries.values()))
+
+        cache.clear()
+        self.assertEqual((len(cache), cache.nbytes), (0, 0))
+        return
+
+    def test_stats(self):
+        cache = ResultCache()
+        cache.put(b"a", self.matches)
+
+        self.assertIsNone(cache.get(b"b"))
+        self.assertIsNotNone(cache.get(b"a"))
+        self.assertEqual(cache.stats["hits"], 1)
+        self.assertEqual(cache.stats["misses"], 1)
+        self.assertEqual(cache.hit_rate, 0.5)
+        return
+
+    def test_copy(self):
+        copied = ResultCache.copy(self.matches, 10)
+
+        self.assertEqual(copied[0]["span"], [11, 19])
+        self.assertEqual(self.matches[0]["span"], [1, 9])
+        return
+
+    def test_sentence_spans(self):
+        text = "First one. Second one!\nThird"
+        self.assertEqual([text[i:j] for i, j in sentence_spans(text)], ["First one.", "Second one!", "Third"])
+        return
+
+
+if __name__ == '__main__':
+    unittest.main()
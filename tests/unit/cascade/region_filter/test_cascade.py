@@ -0,0 +1,69 @@
+import random
+import unittest
+
+from nemex import Nemex, RegionFilter
+
+
+class TestRegionFilter(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.document = "Lorem ipsum dolor sit amet, consetetur sadipscing elitr, sed diam nonumy eirmod tempor " \
+                        "invidunt ut labore et dolore magna aliquyam erat, sed diam voluptua. At vero eos et " \
+                        "accusam et justo duo dolores et ea rebum. Stet clita kasd gubergren, no sea takimata."
+        self.entities = ["sadipscing", "gubergren", "takimata sanctus"]
+        return None
+
+    @staticmethod
+    def get_matches(output):
+        return sorted((m["entity"][1], m["span"][0], m["span"][1], m["score"]) for m in output["matches"])
+
+    def test_regions(self):
+        nemex = Nemex(self.entities, similarity="edit_sim", t=0.8, cascade=True)
+        self.assertIsInstance(nemex.region_filter, RegionFilter)
+
+        doc_tokens = nemex.tokenizer.tokenize(self.document)
+        regions = nemex.region_filter(doc_tokens)
+
+        # regions are disjoint and cover a small part of the document
+        self.assertTrue(all(end < start for (_, end), (start, _) in zip(regions, regions[1:])))
+        self.assertLess(sum(end - start for start, end in regions), len(doc_tokens) / 2)
+        return
+
+    def test_windows(self):
+        region_filter = Nemex(self.entities, cascade=True).region_filter
+        rng = random.Random(0)
+
+        for _ in range(500):
+            n = rng.randint(0, 40)
+            window, min_hits = rng.randint(1, 12), rng.randint(1, 5)
+            hits = sorted(rng.sample(range(n), rng.randint(0, n)))
+            prefix_hits = [position for position in hits if rng.random() < 0.3]
+
+            # all windows of max(n - window, 0) + 1 starts
+            expected = [
+                start for start in range(max(n - window, 0) + 1)
+                if sum(start <= p < start + window for p in hits) >= min_hits
+                and any(start <= p < start + window for p in prefix_hits)
+            ]
+            computed = [
+                start for first, final in region_filter.windows(hits, prefix_hits, window, min_hits, n)
+                for start in range(first, final + 1)
+            ]
+
+            self.assertEqual(expected, computed)
+        return
+
+    def test_same_matches(self):
+        for similarity, t in (("edit_sim", 0.8), ("edit_dist", 1)):
+            expected = self.get_matches(Nemex(self.entities, similarity=similarity, t=t)(self.document))
+            computed = self.get_matches(Nemex(self.entities, similarity=similarity, t=t, cascade=True)(self.document))
+
+            self.assertEqual(expected, computed)
+        return
+
+    def tearDown(self) -> None:
+        return None
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+
+from nemex import MatchColumns
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class TestMatchColumns(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.names = {0: "chaudhuri", 1: "venkatesh"}
+        self.columns = MatchColumns("dong xin, surauijt chadhurisigmod.", self.names.get)
+        self.columns.append(0, 3, 19, 27, 1, True)
+        self.columns.append(1, 4, 0, 4, None, None)
+        return None
+
+    def test_lazy(self):
+        self.assertEqual(len(self.columns), 2)
+        self.assertEqual(self.columns.match(0), "chadhuri")
+        self.assertEqual(self.columns.entity_text(1), "venkatesh")
+        self.assertEqual(self.columns[0], {
+            "entity": ["chaudhuri", 3], "span": [19, 27], "match": "chadhuri", "score": 1, "valid": True
+        })
+        return
+
+    def test_from_output(self):
+        output = self.columns.to_dict()
+        columns = MatchColumns.from_output(output, self.names.get, {3: 0, 4: 1})
+
+        self.assertEqual(columns.entity, [0, 1])
+        self.assertEqual(columns.to_dict(), output)
+        return
+
+    @unittest.skipIf(numpy is None, "requires numpy")
+    def test_to_numpy(self):
+        array = self.columns.to_numpy()
+
+        self.assertEqual(array["start"].tolist(), [19, 0])
+        self.assertEqual(array["valid"].tolist(), [1, -1])
+        self.assertTrue(numpy.isnan(array["score"][1]))
+        return
+
+
+if __name__ == '__main__':
+    unittest.main()
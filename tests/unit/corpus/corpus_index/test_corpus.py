@@ -0,0 +1,73 @@
+import os
+import tempfile
+import unittest
+
+from nemex import Nemex, CorpusIndex, Tokenizer
+
+
+class TestCorpusIndex(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.documents = {
+            "d1": "Lorem ipsum dolor sit amet, consetetur sadipscing elitr.",
+            "d2": "At vero eos et accusam et justo duo dolores et ea rebum.",
+            "d3": "Stet clita kasd gubergren, no sea takimata sanctus est.",
+        }
+        self.entities = ["sadipscing", "gubergren", "dolores", "takimata sanktus", "ipsum"]
+        return None
+
+    def test_postings(self):
+        corpus = CorpusIndex(["abcab", "bca"], Tokenizer(q=2))
+
+        self.assertEqual(len(corpus), 2)
+        self.assertEqual(corpus.token2postings["ab"], [(0, [0, 3])])
+        self.assertEqual(corpus.token2postings["bc"], [(0, [1]), (1, [0])])
+        self.assertEqual(corpus.position_lists(["ab", "ca", "ab"]), {0: [0, 0, 2, 3, 3], 1: [1]})
+
+        with self.assertRaises(ValueError):
+            corpus.add("ab", 1)
+        return
+
+    def test_same_as_forward(self):
+        for pruner in ("lazy_count", "batch_count", None):
+            nemex = Nemex(self.entities, similarity="edit_dist", t=2, pruner=pruner)
+            corpus = CorpusIndex(self.documents, nemex.tokenizer)
+
+            expected = {doc_id: nemex(document) for doc_id, document in self.documents.items()}
+            expected = {doc_id: output for doc_id, output in expected.items() if output["matches"]}
+
+            self.assertEqual(expected, nemex.extract_corpus(corpus))
+        return
+
+    def test_save_load(self):
+        nemex = Nemex(self.entities, similarity="edit_sim", t=0.8)
+        corpus = CorpusIndex(self.documents, nemex.tokenizer)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            filename = os.path.join(tmp, "corpus.pkl")
+            corpus.save(filename)
+            loaded = CorpusIndex.load_from_file(filename)
+
+        self.assertEqual(nemex.extract_corpus(corpus), nemex.extract_corpus(loaded))
+        return
+
+    def test_tokenizer_mismatch(self):
+        nemex = Nemex(self.entities, similarity="edit_dist", t=1)
+
+        with self.assertRaises(ValueError):
+            nemex.extract_corpus(CorpusIndex(self.documents, Tokenizer(q=3)))
+        return
+
+    def test_original_spans(self):
+        nemex = Nemex(self.entities, similarity="edit_dist", t=1, spans="original", collapse_whitespace=True)
+        corpus = CorpusIndex(self.documents, Tokenizer(collapse_whitespace=True))
+
+        with self.assertRaisesRegex(ValueError, "normalized spans"):
+            nemex.extract_corpus(corpus)
+
+        with self.assertRaisesRegex(ValueError, "normalized spans"):
+            nemex.delta(corpus, added=["consetetur"])
+        return
+
+    def tearDown(self) -> None:
+        return None
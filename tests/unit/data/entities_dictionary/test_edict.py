@@ -1,3 +1,5 @@
+import os
+import tempfile
 import unittest
 
 from nemex import EntitiesDictionary, Default
@@ -13,6 +15,62 @@ class TestEntitiesDictionary(unittest.TestCase):
     def test_example(self):
         return self.assertEqual("", "")
 
+    def test_collapse(self):
+        self.edict = EntitiesDictionary.from_list(["Dolor", "ipsum", "dolor"], Default.TOKENIZER, collapse=True)
+
+        self.assertEqual(len(self.edict), 2)
+        self.assertEqual(self.edict[0].uids, [0, 2])
+        self.assertEqual(self.edict.get_item_by_uid(2).id, 0)
+        return
+
+    def test_no_collapse(self):
+        self.edict = EntitiesDictionary.from_list(["Dolor", "ipsum", "dolor"], Default.TOKENIZER, collapse=False)
+
+        self.assertEqual(len(self.edict), 3)
+        self.assertEqual(self.edict[2].uids, [2])
+        return
+
+    def test_collapse_delete(self):
+        self.edict = EntitiesDictionary.from_list(["dolor", "ipsum", "dolor"], Default.TOKENIZER, collapse=True)
+        del self.edict[0]
+
+        self.assertEqual(len(self.edict), 1)
+        self.assertNotIn(0, self.edict.uid2idx)
+        self.assertNotIn(2, self.edict.uid2idx)
+        return
+
+    def test_remove(self):
+        self.edict = EntitiesDictionary.from_list(["dolor", "ipsum", "dolor"], Default.TOKENIZER, collapse=True)
+
+        # an alias is unregistered, the last one deletes the entity
+        self.assertFalse(self.edict.remove(2))
+        self.assertEqual(self.edict[0].uids, [0])
+        self.assertTrue(self.edict.remove(0))
+        self.assertEqual(len(self.edict), 1)
+
+        # ids of removed entities are not reused, nor uids in use
+        self.assertEqual(self.edict.add("amet"), 2)
+        self.assertEqual(self.edict[2].uids, [2])
+        self.assertEqual(self.edict.uid2idx, {1: 1, 2: 2})
+        return
+
+    def test_next_idx(self):
+        self.edict = EntitiesDictionary.from_list(["dolor", "ipsum", "amet"], Default.TOKENIZER)
+
+        # the id of the last entity is not reused either
+        self.edict.remove(2)
+        self.assertEqual(self.edict.next_idx, 3)
+
+        subset = self.edict.subset([0])
+        self.assertEqual(subset.add("sit"), 3)
+        self.assertEqual([shard.next_idx for shard in self.edict.shard(2)], [3, 3])
+
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "edict.pkl")
+            self.edict.save(filename)
+            self.assertEqual(EntitiesDictionary.load_from_file(filename).add("sit"), 3)
+        return
+
     def tearDown(self) -> None:
         return None
 
@@ -1,6 +1,6 @@
 import unittest
 
-from nemex import InvertedIndex
+from nemex import InvertedIndex, EntitiesDictionary, Default
 
 
 class TestInvertedIndex(unittest.TestCase):
@@ -13,6 +13,98 @@ class TestInvertedIndex(unittest.TestCase):
     def test_example(self):
         return self.assertEqual("", "")
 
+    def test_prefix_filter(self):
+        edict = EntitiesDictionary.from_list(["dolor", "dolores", "ipsum"], Default.TOKENIZER)
+
+        for eidx in edict:
+            edict[eidx].Tl = len(edict[eidx]) - 2
+
+        full_index = InvertedIndex.from_entities_dict(edict)
+        prefix_index = InvertedIndex.from_entities_dict(edict, prefix_filter=True)
+
+        # each entity is indexed by |e| - Tl + 1 = 3 tokens
+        self.assertEqual(sum(len(entities) for entities in prefix_index.token2entities.values()), 9)
+
+        doc_tokens = Default.TOKENIZER("lorem dolor sit")
+        self.assertEqual(prefix_index[doc_tokens], full_index[doc_tokens])
+
+        # "ipsum" does not share a prefix token and is filtered out
+        doc_tokens = Default.TOKENIZER("um")
+        self.assertEqual(len(prefix_index[doc_tokens]), 0)
+        self.assertEqual(len(full_index[doc_tokens]), 1)
+        return
+
+    def test_length_partition(self):
+        edict = EntitiesDictionary.from_list(["dolor", "dolor sit amet consetetur"], Default.TOKENIZER)
+
+        for eidx in edict:
+            edict[eidx].Le = len(edict[eidx]) - 1
+            edict[eidx].Te = len(edict[eidx]) + 1
+            edict[eidx].Tl = len(edict[eidx]) - 2
+
+        full_index = InvertedIndex.from_entities_dict(edict)
+        partitioned_index = InvertedIndex.from_entities_dict(edict, length_partition=True)
+
+        self.assertEqual(len(partitioned_index.token2partitions["do"]), 2)
+
+        # the long entity cannot fit the short document
+        doc_tokens = Default.TOKENIZER("a dolor")
+        inv_lists = partitioned_index[doc_tokens]
+        self.assertEqual([entities for positions, entities in inv_lists.values()], [[0]] * 4)
+
+        # both entities fit the long document
+        doc_tokens = Default.TOKENIZER("a dolor sit amet consetetur")
+        self.assertEqual(partitioned_index[doc_tokens], full_index[doc_tokens])
+        return
+
+    def test_max_window_hits(self):
+        for positions in ([], [3], [0, 1, 2, 3], range(10), [0, 2, 3, 9, 10, 11, 12, 20]):
+            for window in range(1, 25):
+                expected = max((sum(start <= p < start + window for p in positions) for start in range(25)), default=0)
+                self.assertEqual(InvertedIndex.max_window_hits(positions, window), expected)
+        return
+
+    def test_group_by_token(self):
+        edict = EntitiesDictionary.from_list(["abab", "ba"], Default.TOKENIZER)
+        inv_index = InvertedIndex.from_entities_dict(edict)
+
+        inv_lists = inv_index[Default.TOKENIZER("ababab")]
+
+        # one inverted list per distinct token, with all its positions
+        self.assertEqual(list(inv_lists.keys()), ["ab", "ba"])
+        self.assertEqual(inv_lists["ab"], ([0, 2, 4], [0, 0]))
+        self.assertEqual(inv_lists["ba"], ([1, 3], [0, 1]))
+        return
+
+    def test_add_remove(self):
+        edict = EntitiesDictionary.from_list(["dolor", "dolores", "dolor sit amet", "ipsum"], Default.TOKENIZER)
+
+        for eidx in edict:
+            edict[eidx].Le = len(edict[eidx]) - 1
+            edict[eidx].Te = len(edict[eidx]) + 1
+            edict[eidx].Tl = len(edict[eidx]) - 2
+
+        for kwargs in (dict(), dict(prefix_filter=True), dict(length_partition=True)):
+            full_index = InvertedIndex.from_entities_dict(edict, **kwargs)
+
+            # index built without an entity, to which it is added afterwards
+            inv_index = InvertedIndex.from_entities_dict(edict.subset([0, 2, 3]), **kwargs)
+            inv_index.token2freq = full_index.token2freq
+            inv_index.entities_dict = full_index.entities_dict
+            inv_index.add(1, edict)
+
+            self.assertEqual(dict(inv_index.token2entities), dict(full_index.token2entities))
+            self.assertEqual(inv_index.token2partitions, full_index.token2partitions)
+
+            # removing it restores the index without it
+            inv_index.remove(1, edict)
+            reduced_index = InvertedIndex.from_entities_dict(edict.subset([0, 2, 3]), **kwargs)
+            reduced_index.token2freq = full_index.token2freq
+
+            self.assertEqual(dict(inv_index.token2entities), dict(reduced_index.token2entities))
+            self.assertEqual(inv_index.token2partitions, reduced_index.token2partitions)
+        return
+
     def tearDown(self) -> None:
         return None
 
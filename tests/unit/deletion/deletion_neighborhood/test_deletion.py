@@ -0,0 +1,38 @@
+import unittest
+
+from nemex import Nemex, DeletionNeighborhood
+
+
+class TestDeletionNeighborhood(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.document = "Lorem ipsum dolor sit amet, IMB and SAP consetetur."
+        self.entities = ["IBM", "SAP", "dolor sit", "consetetur"]
+        return None
+
+    def test_deletions(self):
+        self.assertEqual(DeletionNeighborhood.deletions("abc", 1), {"abc", "bc", "ac", "ab"})
+        self.assertEqual(len(DeletionNeighborhood.deletions("abc", 5)), 8)
+        return
+
+    def test_short_entities(self):
+        # short entities are dropped by Faerie
+        nemex = Nemex(self.entities, t=2)
+        self.assertNotIn("ibm", [m["entity"][0] for m in nemex(self.document)["matches"]])
+
+        nemex = Nemex(self.entities, t=2, short_max_len=4)
+        self.assertEqual(sorted(nemex.short_engine.entities_dict), [0, 1])
+        self.assertEqual(sorted(nemex.faerie.entities_dict), [2, 3])
+
+        matches = [(m["entity"][0], m["match"], m["score"]) for m in nemex(self.document)["matches"]]
+        self.assertIn(("ibm", "imb", 2), matches)
+        self.assertIn(("sap", "sap", 0), matches)
+        self.assertIn(("dolor sit", "dolor sit", 0), matches)
+        return
+
+    def tearDown(self) -> None:
+        return None
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import unittest
+
+from nemex import Nemex, AhoCorasick, EntitiesDictionary, Tokenizer
+
+
+class TestAhoCorasick(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.document = "Lorem ipsum dolor sit amet, consetetur sadipscing elitr, ipsum dolr."
+        self.entities = ["dolor", "ipsum", "amet consetetur", "sadipscing", "elitr"]
+        return None
+
+    @staticmethod
+    def get_matches(output):
+        return [(m["entity"][0], m["match"], m["score"]) for m in output["matches"]]
+
+    def test_overlapping(self):
+        edict = EntitiesDictionary.from_list(["abab", "bab", "b"], Tokenizer(q=1).tokenize)
+        automaton = AhoCorasick(edict, q=1)
+
+        self.assertEqual(list(automaton(list("xababab"))), [
+            (0, (1, 4)), (0, (3, 6)), (1, (2, 4)), (1, (4, 6)), (2, (2, 2)), (2, (4, 4)), (2, (6, 6))
+        ])
+        return
+
+    def test_exact(self):
+        matches = self.get_matches(Nemex(self.entities, t=0)(self.document))
+
+        self.assertEqual(matches, [
+            ("dolor", "dolor", 0), ("ipsum", "ipsum", 0), ("ipsum", "ipsum", 0),
+            ("sadipscing", "sadipscing", 0), ("elitr", "elitr", 0)
+        ])
+        return
+
+    def test_exact_first(self):
+        matches = self.get_matches(Nemex(self.entities, t=1, engine="segment", exact_first=True)(self.document))
+
+        # approximate matches within exact ones of the same entity are skipped
+        self.assertEqual(matches[:5], [
+            ("dolor", "dolor", 0), ("ipsum", "ipsum", 0), ("ipsum", "ipsum", 0),
+            ("sadipscing", "sadipscing", 0), ("elitr", "elitr", 0)
+        ])
+        self.assertIn(("dolor", "dolr", 1), matches)
+        self.assertIn(("amet consetetur", "amet, consetetur", 1), matches)
+        self.assertEqual([m for m in matches[5:] if m[2] == 0], [])
+        return
+
+    def test_exact_first_other_entity(self):
+        entities = ["new york", "york city", "new yorker"]
+        document = "in new york city"
+
+        for engine in ("faerie", "segment", "trie"):
+            output = Nemex(entities, t=2, engine=engine, exact_first=True)(document)
+            expected = Nemex(entities, t=2, engine=engine)(document)
+
+            # matches of other entities overlapping an exact match are kept
+            spans = {(m["entity"][0], tuple(m["span"])) for m in output["matches"]}
+            self.assertIn(("york city", (7, 16)), spans)
+            self.assertIn(("new yorker", (3, 11)), spans)
+
+            # only matches within an exact match of the same entity are skipped
+            exact = [(m["entity"][0], m["span"]) for m in output["matches"] if m["score"] == 0]
+            for m in expected["matches"]:
+                within = any(entity == m["entity"][0] and start <= m["span"][0] and m["span"][1] <= end
+                             for entity, (start, end) in exact)
+                self.assertTrue(within or (m["entity"][0], tuple(m["span"])) in spans)
+        return
+
+    def tearDown(self) -> None:
+        return None
+
+
+if __name__ == '__main__':
+    unittest.main()
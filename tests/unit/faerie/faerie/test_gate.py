@@ -0,0 +1,41 @@
+import unittest
+
+from nemex import Faerie, EntitiesDictionary, Tokenizer
+
+
+class TestGate(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.tokenize = Tokenizer(char=True, q=2).tokenize
+        return None
+
+    def test_can_match(self):
+        edict = EntitiesDictionary.from_list(["chaudhuri", "venkatesh"], self.tokenize)
+        faerie = Faerie(edict, similarity="edit_dist", t=1, q=2)
+
+        self.assertFalse(faerie.can_match(self.tokenize("xyz 123")))
+        self.assertFalse(faerie.can_match(self.tokenize("chx")))
+        self.assertTrue(faerie.can_match(self.tokenize("chaudhury")))
+        return
+
+    def test_multiplicity(self):
+        edict = EntitiesDictionary.from_list(["aaaaaa"], self.tokenize)
+        faerie = Faerie(edict, similarity="edit_dist", t=1, q=2)
+
+        # one position of a token repeated in the entity may reach its overlap bound
+        self.assertEqual(faerie.gate_multiplicity, 5)
+        self.assertTrue(faerie.can_match(self.tokenize("aa")))
+        return
+
+    def test_add_entities(self):
+        edict = EntitiesDictionary.from_list(["chaudhuri"], self.tokenize)
+        faerie = Faerie(edict, similarity="edit_dist", t=1, q=2)
+
+        self.assertFalse(faerie.can_match(self.tokenize("venkatesh")))
+        faerie.add_entities([edict.add("venkatesh")])
+        self.assertTrue(faerie.can_match(self.tokenize("venkatesh")))
+        return
+
+
+if __name__ == '__main__':
+    unittest.main()
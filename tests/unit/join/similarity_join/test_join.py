@@ -0,0 +1,80 @@
+import itertools
+import unittest
+
+from nemex import EntitiesDictionary, Nemex, Tokenizer, Verify, similarity_join
+from nemex.utils import qgrams_to_char
+
+
+class TestSimilarityJoin(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.names = ["kaushik", "kaushuk", "chakrabarti", "chakraborti", "chaudhuri", "chaudhry",
+                      "venkatesh", "venkatesan", "ganti", "gandi", "surajit", "surajith", "kaushik"]
+        self.words = ["new york city", "new york", "york city new", "city of new york",
+                      "los angeles", "los angeles county", "san francisco bay", "san francisco"]
+        return None
+
+    @staticmethod
+    def brute_force(R, S, similarity, t, char):
+        pairs = list()
+
+        for r_idx, s_idx in itertools.product(R, S):
+            r, s = R[r_idx], S[s_idx]
+            if char:
+                valid, score = Verify.check(qgrams_to_char(r.tokens), qgrams_to_char(s.tokens), similarity, t)
+            else:
+                valid, score = Verify.check(r.tokens, s.tokens, similarity, t)
+            if valid:
+                pairs.extend((r_uid, s_uid, score) for r_uid in r.uids for s_uid in s.uids)
+
+        return sorted(pairs)
+
+    def test_char_join(self):
+        tokenizer = Tokenizer(char=True, q=2).tokenize
+        R = EntitiesDictionary.from_list(self.names[:6], tokenizer=tokenizer)
+        S = EntitiesDictionary.from_list(self.names[6:], tokenizer=tokenizer)
+
+        for similarity, t in (("edit_dist", 1), ("edit_dist", 2), ("edit_sim", 0.8)):
+            expected = self.brute_force(R, S, similarity, t, char=True)
+            self.assertEqual(expected, similarity_join(R, S, similarity=similarity, t=t, q=2))
+        return
+
+    def test_token_self_join(self):
+        R = EntitiesDictionary.from_list(self.words, tokenizer=Tokenizer(char=False).tokenize)
+
+        for similarity, t in (("jaccard", 0.6), ("cosine", 0.7), ("dice", 0.75)):
+            expected = [(r, s, score) for r, s, score in self.brute_force(R, R, similarity, t, char=False) if r < s]
+            self.assertEqual(expected, similarity_join(R, similarity=similarity, t=t))
+        return
+
+    def test_collapsed_aliases(self):
+        R = EntitiesDictionary.from_list(self.names, tokenizer=Tokenizer(char=True, q=2).tokenize, collapse=True)
+        pairs = similarity_join(R, similarity="edit_dist", t=1)
+
+        # both "kaushik" aliases match each other and "kaushuk"
+        self.assertIn((0, 12, 0), pairs)
+        self.assertIn((0, 1, 1), pairs)
+        self.assertIn((1, 12, 1), pairs)
+        return
+
+    def test_processes(self):
+        R = EntitiesDictionary.from_list(self.names, tokenizer=Tokenizer(char=True, q=2).tokenize)
+        expected = similarity_join(R, similarity="edit_sim", t=0.7, q=2)
+
+        self.assertEqual(expected, similarity_join(R, similarity="edit_sim", t=0.7, q=2, processes=2, chunk_size=3))
+        return
+
+    def test_model_bounds(self):
+        nemex = Nemex(self.names, similarity="edit_dist", t=2, q=2)
+        bounds = {e_idx: (e.Le, e.Te, e.Tl) for e_idx, e in nemex.E.idx2ent.items() if hasattr(e, "Tl")}
+        matches = nemex("chakrabarty and venkatesh")["matches"]
+
+        # a join with other bounds leaves the bounds of the model's dictionary unchanged
+        similarity_join(nemex.E, similarity="edit_sim", t=0.7, q=2)
+
+        self.assertEqual(bounds, {e_idx: (e.Le, e.Te, e.Tl) for e_idx, e in nemex.E.idx2ent.items() if hasattr(e, "Tl")})
+        self.assertEqual(matches, nemex("chakrabarty and venkatesh")["matches"])
+        return
+
+    def tearDown(self) -> None:
+        return None
@@ -0,0 +1,44 @@
+import unittest
+
+from nemex import Nemex, MinHashLSH, EntitiesDictionary, Tokenizer
+
+
+class TestMinHashLSH(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.document = "Lorem ipsum dolor sit amet consetetur sadipscing elitr sed diam nonumy"
+        self.entities = ["dolor sit amet", "sadipscing elitr sed", "ipsum"]
+        self.tokenize = Tokenizer(char=False).tokenize
+        return None
+
+    def test_sign(self):
+        edict = EntitiesDictionary.from_list(self.entities, self.tokenize)
+        lsh = MinHashLSH(edict, bands=4, rows=2)
+
+        signature = lsh.sign(["dolor", "sit", "dolor"])
+        self.assertEqual(len(signature), 8)
+        self.assertEqual(signature, lsh.sign(["sit", "dolor"]))
+        self.assertEqual(len(lsh.tables), 4)
+        return
+
+    def test_exact_matches(self):
+        nemex = Nemex(self.entities, char=False, similarity="jaccard", t=0.6, engine="lsh")
+        matches = [(m["entity"][0], m["match"]) for m in nemex(self.document)["matches"] if m["score"] == 1.0]
+
+        # identical token sets always collide
+        self.assertEqual(sorted(matches), [
+            ("dolor sit amet", "dolor sit amet"), ("ipsum", "ipsum"), ("sadipscing elitr sed", "sadipscing elitr sed")
+        ])
+        return
+
+    def test_similarity(self):
+        with self.assertRaises(ValueError):
+            Nemex(self.entities, t=2, engine="lsh")
+        return
+
+    def tearDown(self) -> None:
+        return None
+
+
+if __name__ == '__main__':
+    unittest.main()
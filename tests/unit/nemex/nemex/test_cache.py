@@ -0,0 +1,77 @@
+import unittest
+
+from nemex import Nemex, ResultCache
+
+
+class TestCache(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.entities = ["kaushik ch", "chakrabarti", "chaudhuri", "venkatesh", "surajit ch"]
+        self.documents = [
+            "An efficient filter for approximate membership checking. Venkaee shga kamunshik kabarati.",
+            "Dong xin, surauijt chadhurisigmod.",
+            "AN EFFICIENT FILTER FOR APPROXIMATE MEMBERSHIP CHECKING. VENKAEE SHGA KAMUNSHIK KABARATI.",
+        ]
+        return None
+
+    def test_document(self):
+        for kwargs in (dict(), dict(char=False, q=1, similarity="jaccard", t=0.5)):
+            nemex = Nemex(self.entities, **kwargs)
+            cached = Nemex(self.entities, cache=ResultCache(), **kwargs)
+
+            for document in self.documents * 2:
+                self.assertEqual(cached(document), nemex(document))
+                self.assertEqual(cached(document, False), nemex(document, False))
+
+            # documents equal after lower casing share entries
+            self.assertEqual(len(cached.cache), 4)
+            self.assertEqual(cached.cache.hits, 8)
+        return
+
+    def test_sentence(self):
+        nemex = Nemex(self.entities, cache=ResultCache(granularity="sentence"))
+        output = nemex(self.documents[0] + " " + self.documents[1])
+
+        # the sentence of the second document is cached
+        self.assertEqual(nemex(self.documents[1])["matches"], Nemex(self.entities)(self.documents[1])["matches"])
+        self.assertEqual(nemex.cache.hits, 1)
+
+        for match in output["matches"]:
+            self.assertEqual(output["document"][match["span"][0]:match["span"][1]], match["match"])
+        return
+
+    def test_sentence_normalized(self):
+        # lower casing 'İ' and collapsing whitespace change lengths
+        document = "İİ. Then   berlin.\n\nAnd  berlin again."
+
+        for kwargs in (dict(), dict(collapse_whitespace=True), dict(strip_accents=True, collapse_whitespace=True)):
+            output = Nemex(["berlin"], cache=ResultCache(granularity="sentence"), **kwargs)(document)
+            expected = Nemex(["berlin"], **kwargs)(document)
+
+            self.assertEqual(output["document"], expected["document"])
+            self.assertEqual(
+                [m["span"] for m in output["matches"] if m["match"] == "berlin"],
+                [m["span"] for m in expected["matches"] if m["match"] == "berlin"]
+            )
+
+            for match in output["matches"]:
+                self.assertEqual(output["document"][match["span"][0]:match["span"][1]], match["match"])
+                self.assertIn("rl", match["match"])
+        return
+
+    def test_fingerprint(self):
+        cache = ResultCache()
+        nemex = Nemex(self.entities, cache=cache)
+        other = Nemex(self.entities, cache=cache, t=1)
+
+        self.assertEqual(nemex.model_fingerprint(), Nemex(self.entities).model_fingerprint())
+        self.assertNotEqual(nemex.model_fingerprint(), other.model_fingerprint())
+
+        nemex(self.documents[1])
+        other(self.documents[1])
+        self.assertEqual(cache.misses, 2)
+        return
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+
+from nemex import Nemex, ResultCache
+
+
+class TestColumns(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.entities = ["kaushik ch", "chakrabarti", "chaudhuri", "venkatesh", "surajit ch"]
+        self.document = "An efficient filter for approximate membership checking. " \
+                        "Venkaee shga kamunshik kabarati, dong xin, surauijt chadhurisigmod."
+        return None
+
+    def test_output(self):
+        for kwargs in (dict(), dict(verify=False), dict(exact_first=True), dict(cache=ResultCache()),
+                       dict(char=False, q=1, similarity="jaccard", t=0.5)):
+            nemex = Nemex(self.entities, **kwargs)
+
+            for valid_only in (True, False):
+                columns = nemex(self.document, valid_only, output="columns")
+
+                self.assertEqual(columns.to_dict(), nemex(self.document, valid_only))
+        return
+
+    def test_empty(self):
+        nemex = Nemex(self.entities)
+        columns = nemex("nothing to see", output="columns")
+
+        self.assertEqual(len(columns), 0)
+        self.assertEqual(columns.to_dict(), nemex("nothing to see"))
+        return
+
+    def test_unknown(self):
+        with self.assertRaises(ValueError):
+            Nemex(self.entities)(self.document, output="rows")
+        return
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+
+from nemex import Nemex, CorpusIndex
+
+
+class TestDelta(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.documents = [
+            "Lorem ipsum dolor sit amet, consetetur sadipscing elitr.",
+            "At vero eos et accusam et justo duo dolores et ea rebum.",
+            "Stet clita kasd gubergren, no sea takimata sanctus est.",
+        ]
+        self.entities = ["sadipscing", "gubergren", "dolores", "takimata sanktus", "ipsum"]
+        return None
+
+    @staticmethod
+    def get_matches(outputs):
+        return sorted(
+            (doc_id, m["entity"][1], m["span"][0], m["span"][1], m["score"])
+            for doc_id, output in outputs.items()
+            for m in (output["matches"] if isinstance(output, dict) else output)
+        )
+
+    def test_delta(self):
+        nemex = Nemex(self.entities, similarity="edit_dist", t=2)
+        corpus = CorpusIndex(self.documents, nemex.tokenizer)
+        before = self.get_matches(nemex.extract_corpus(corpus))
+
+        # remove "gubergren", change "ipsum" (uid 4) and add "accusan"
+        delta = nemex.delta(corpus, added={4: "lorem", 5: "accusan"}, removed=[1, 4])
+        after = self.get_matches(nemex.extract_corpus(corpus))
+
+        self.assertEqual(self.get_matches(delta["insertions"]), sorted(set(after) - set(before)))
+        self.assertEqual(self.get_matches(delta["deletions"]), sorted(set(before) - set(after)))
+        self.assertEqual({m[1] for m in self.get_matches(delta["insertions"])}, {4, 5})
+        self.assertEqual({m[1] for m in self.get_matches(delta["deletions"])}, {1, 4})
+
+        # same as a model of the new dictionary
+        fresh = Nemex(["sadipscing", "dolores", "takimata sanktus", "lorem", "accusan"], similarity="edit_dist", t=2)
+        self.assertEqual(
+            sorted(m[2:] for m in after),
+            sorted(m[2:] for m in self.get_matches(fresh.extract_corpus(corpus)))
+        )
+        return
+
+    def test_unchanged(self):
+        nemex = Nemex(self.entities, similarity="edit_sim", t=0.8)
+        corpus = CorpusIndex(self.documents, nemex.tokenizer)
+
+        # same entity under the same uid
+        delta = nemex.delta(corpus, added={0: "sadipscing"}, removed=[0])
+
+        self.assertEqual(delta, {"insertions": {}, "deletions": {}})
+        return
+
+    def test_unknown_uid(self):
+        nemex = Nemex(self.entities, similarity="edit_dist", t=1)
+        corpus = CorpusIndex(self.documents, nemex.tokenizer)
+
+        with self.assertRaises(ValueError):
+            nemex.delta(corpus, removed=[42])
+
+        with self.assertRaises(ValueError):
+            nemex.delta(corpus, added={0: "lorem"})
+        return
+
+    def tearDown(self) -> None:
+        return None
@@ -0,0 +1,37 @@
+import unittest
+
+from nemex import Nemex
+
+
+class TestGate(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.entities = ["kaushik ch", "chakrabarti", "chaudhuri", "venkatesh", "surajit ch"]
+        self.documents = [
+            "an efficient filter for approximate membership checking. venkaee shga kamunshik kabarati",
+            "Nothing to see_here, 1234.",
+            "zzz",
+            "chaud",
+        ]
+        return None
+
+    def test_outputs(self):
+        for kwargs in (dict(), dict(similarity="edit_sim", t=0.8), dict(char=False, q=1, similarity="jaccard", t=0.5)):
+            nemex = Nemex(self.entities, **kwargs)
+            ungated = Nemex(self.entities, gate=False, **kwargs)
+
+            self.assertTrue(nemex.gate)
+
+            for document in self.documents:
+                self.assertEqual(nemex(document), ungated(document))
+                self.assertEqual(nemex(document, False), ungated(document, False))
+        return
+
+    def test_engines(self):
+        self.assertFalse(Nemex(self.entities, exact_first=True).gate)
+        self.assertFalse(Nemex(self.entities, short_max_len=5).gate)
+        return
+
+
+if __name__ == '__main__':
+    unittest.main()
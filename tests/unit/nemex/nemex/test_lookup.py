@@ -0,0 +1,70 @@
+import unittest
+
+from nemex import Nemex, Verify
+
+
+class TestLookup(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.entities = ["kaushik", "kaushuk", "chakrabarti", "chakraborti", "chaudhuri",
+                         "venkatesh", "venkatesan", "surajit", "kaushik"]
+        return None
+
+    def test_edit_dist(self):
+        nemex = Nemex(self.entities, similarity="edit_dist", t=2)
+        matches = nemex.lookup("kaushik")
+
+        # ranked by distance, then uid
+        self.assertEqual([(m["entity"][1], m["score"]) for m in matches], [(0, 0), (8, 0), (1, 1)])
+        return
+
+    def test_brute_force(self):
+        for similarity, t in (("edit_dist", 1), ("edit_dist", 3), ("edit_sim", 0.7)):
+            nemex = Nemex(self.entities, similarity=similarity, t=t)
+
+            for query in ("chakrabarty", "venkat", "suraj", "kausik", "xyz"):
+                expected = set()
+                for e in nemex.E:
+                    valid, score = Verify.check(query, nemex.entity_repr(e), similarity, t)
+                    if valid:
+                        expected.update((uid, score) for uid in nemex.E[e].uids)
+
+                computed = {(m["entity"][1], m["score"]) for m in nemex.lookup(query)}
+                self.assertEqual(expected, computed)
+        return
+
+    def test_top_k(self):
+        nemex = Nemex(self.entities, similarity="edit_dist", t=2)
+
+        self.assertEqual([m["entity"][1] for m in nemex.lookup("kaushik", k=2)], [0, 8])
+        self.assertEqual([m["entity"][1] for m in nemex.lookup("kaushuk", k=1)], [1])
+        return
+
+    def test_short_query(self):
+        for similarity, t in (("edit_dist", 1), ("edit_dist", 3), ("edit_sim", 0.7)):
+            nemex = Nemex(self.entities, similarity=similarity, t=t)
+
+            # queries without a q-gram
+            for query in ("a", "", " "):
+                expected = set()
+                for e in nemex.E:
+                    valid, score = Verify.check(query, nemex.entity_repr(e), similarity, t)
+                    if valid:
+                        expected.update((uid, score) for uid in nemex.E[e].uids)
+
+                computed = {(m["entity"][1], m["score"]) for m in nemex.lookup(query)}
+                self.assertEqual(expected, computed)
+
+        nemex = Nemex(["new york"], char=False, similarity="jaccard", t=0.6)
+        self.assertEqual(nemex.lookup(""), [])
+        return
+
+    def test_token_based(self):
+        nemex = Nemex(["new york city", "new york", "los angeles"], char=False, similarity="jaccard", t=0.6)
+        matches = nemex.lookup("york new city")
+
+        self.assertEqual([(m["entity"][0], m["score"]) for m in matches], [("new york city", 1.0), ("new york", 2 / 3)])
+        return
+
+    def tearDown(self) -> None:
+        return None
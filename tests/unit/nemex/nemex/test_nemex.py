@@ -316,6 +316,18 @@ class TestNemex(unittest.TestCase):
         self.assertEqual(expected, computed)
         return
 
+    def test_length_partition(self):
+        entities = ["dolor", "ipsum", "amet consetetur sadipscing", "sadipscing elitr sed diam nonumy"]
+        document = "Lorem ipsum dolo sit amet, consetetur sadipscing elitr, sed diam nonumy eirmod."
+
+        self.assertFalse(Nemex(entities).faerie.length_partition)
+
+        nemex = Nemex(entities, t=2, length_partition=True)
+        self.assertTrue(nemex.faerie.inv_index.token2partitions)
+        self.assertEqual(nemex(document), Nemex(entities, t=2)(document))
+        self.assertEqual(nemex(document[:12]), Nemex(entities, t=2)(document[:12]))
+        return
+
     def tearDown(self) -> None:
         return None
 
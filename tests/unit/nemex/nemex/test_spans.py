@@ -0,0 +1,74 @@
+import unittest
+
+from nemex import Nemex, ResultCache
+
+
+class TestSpans(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.entities = ["kaushik ch", "chakrabarti", "chaudhuri", "venkatesh", "surajit ch"]
+        self.document = "An efficient filter for approximate membership checking.\n" \
+                        "Venkaee  shga Kamunshik kabarati,\tdong xin, SURAUIJT chadhurisigmod."
+        return None
+
+    def test_char(self):
+        nemex = Nemex(self.entities)
+        original = Nemex(self.entities, spans="original")
+        output = original(self.document)
+
+        # lower casing keeps the positions of the characters
+        self.assertEqual(output["document"], self.document)
+        self.assertEqual(
+            [(m["entity"], m["span"], m["score"]) for m in output["matches"]],
+            [(m["entity"], m["span"], m["score"]) for m in nemex(self.document)["matches"]]
+        )
+
+        for match in output["matches"]:
+            self.assertEqual(self.document[match["span"][0]:match["span"][1]], match["match"])
+        return
+
+    def test_token(self):
+        kwargs = dict(char=False, q=1, similarity="jaccard", t=0.5)
+        nemex = Nemex(self.entities, **kwargs)
+        output = Nemex(self.entities, spans="original", **kwargs)(self.document)
+        matches = nemex(self.document)["matches"]
+
+        self.assertEqual(len(output["matches"]), len(matches))
+
+        for match, normalized in zip(output["matches"], matches):
+            self.assertEqual(match["match"], self.document[match["span"][0]:match["span"][1]])
+            self.assertEqual(" ".join(match["match"].lower().split()), normalized["match"])
+        return
+
+    def test_cache(self):
+        for granularity in ("document", "sentence"):
+            nemex = Nemex(self.entities, spans="original", cache=ResultCache(granularity=granularity))
+
+            for document in (self.document, self.document.upper(), self.document):
+                output = nemex(document)
+
+                for match in output["matches"]:
+                    self.assertEqual(document[match["span"][0]:match["span"][1]], match["match"])
+
+            self.assertEqual(nemex.cache.hits, 1 if granularity == "document" else 2)
+        return
+
+    def test_folding(self):
+        document = "Venkaee  shga KAUSHİK   Chakrabärti,\tdong xin."
+        nemex = Nemex(self.entities, spans="original", strip_accents=True, collapse_whitespace=True)
+        output = nemex(document)
+
+        self.assertIn("kaushik ch", [match["entity"][0] for match in output["matches"]])
+
+        for match in output["matches"]:
+            self.assertEqual(document[match["span"][0]:match["span"][1]], match["match"])
+        return
+
+    def test_unknown(self):
+        with self.assertRaises(ValueError):
+            Nemex(self.entities, spans="joined")
+        return
+
+
+if __name__ == '__main__':
+    unittest.main()
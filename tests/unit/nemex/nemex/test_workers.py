@@ -0,0 +1,49 @@
+import pickle
+import unittest
+
+from nemex import Nemex
+
+
+class TestWorkers(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.document = (
+            "an efficient filter for approximate membership checking. venkaee shga kamunshik kabarati, "
+            "dong xin, surauijt chadhurisigmod."
+        )
+        self.entities = ["kaushik ch", "chakrabarti", "chaudhuri", "venkatesh", "surajit ch"]
+        return None
+
+    def test_partitioned_call(self):
+        models = [
+            Nemex(self.entities),
+            Nemex(self.entities, similarity="edit_sim", t=0.6, prefix_filter=True),
+            Nemex(self.entities, exact_first=True),
+            Nemex(self.entities, char=False, q=1, similarity="jaccard", t=0.3, pruner="lazy_count"),
+        ]
+
+        for nemex in models:
+            expected = nemex(self.document)
+
+            self.assertEqual(nemex(self.document, workers=2), expected)
+            self.assertEqual(nemex(self.document, False, workers=3), nemex(self.document, False))
+
+            # the model pickles without its workers
+            self.assertIsNone(pickle.loads(pickle.dumps(nemex)).entity_pool)
+
+            nemex.close()
+            self.assertIsNone(nemex.entity_pool)
+        return
+
+    def test_partition(self):
+        position_lists = {0: [1, 2, 3, 4], 1: [5], 2: [6], 3: [7, 8], 4: [9, 10]}
+        shares = Nemex.partition(position_lists, 3)
+
+        self.assertEqual(len(shares), 3)
+        self.assertEqual([e for share in shares for e, _ in share], [0, 1, 2, 3, 4])
+        self.assertEqual(Nemex.partition(dict(), 2), [])
+        return
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import os
+import gzip
+import json
+import tempfile
+import unittest
+
+from nemex import Nemex
+from nemex.runner import list_inputs, plan_shards, read_documents, run
+
+
+class TestRun(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.documents = [
+            "an efficient filter for approximate membership checking. venkaee shga kamunshik kabarati",
+            "dong xin, surauijt chadhurisigmod.",
+            "nothing to see here",
+        ] * 10
+        self.nemex = Nemex(["kaushik ch", "chakrabarti", "chaudhuri", "venkatesh", "surajit ch"])
+
+        self.tmp = tempfile.TemporaryDirectory()
+        self.inputs = os.path.join(self.tmp.name, "in")
+        os.makedirs(os.path.join(self.inputs, "sub"))
+
+        with open(os.path.join(self.inputs, "a.txt"), "w") as wf:
+            wf.write("\n".join(self.documents) + "\n")
+
+        with gzip.open(os.path.join(self.inputs, "sub", "b.jsonl.gz"), "wt") as wf:
+            for k, document in enumerate(self.documents):
+                wf.write(json.dumps({"id": "b{}".format(k), "text": document}) + "\n")
+
+        return None
+
+    def tearDown(self) -> None:
+        self.tmp.cleanup()
+        return None
+
+    def read_outputs(self, out_dir: str) -> dict:
+        outputs = dict()
+
+        for name in sorted(os.listdir(os.path.join(out_dir, "shards"))):
+            with open(os.path.join(out_dir, "shards", name)) as rf:
+                for line in rf:
+                    record = json.loads(line)
+                    outputs[record["id"]] = record["matches"]
+
+        return outputs
+
+    def test_shards(self):
+        files = list_inputs([self.inputs])
+        shards = plan_shards(files, shard_size=100)
+
+        self.assertEqual(len([shard for shard in shards if shard["end"] is None]), 1)
+
+        documents = [document for shard in shards for _, document in read_documents(shard)]
+
+        # each line is read by exactly one shard
+        self.assertEqual(sorted(documents), sorted(self.documents * 2))
+        return
+
+    def test_run(self):
+        out_dir = os.path.join(self.tmp.name, "out")
+        manifest = run(self.nemex, [self.inputs], out_dir, processes=0, shard_size=500)
+
+        self.assertEqual(len(manifest["completed"]), len(manifest["shards"]))
+
+        outputs = self.read_outputs(out_dir)
+        expected = [self.nemex(document)["matches"] for document in self.documents]
+
+        self.assertEqual([outputs["b{}".format(k)] for k in range(len(self.documents))], expected)
+        self.assertEqual(len(outputs), 2 * len(self.documents))
+
+        # same outputs with worker processes
+        out_dir_pool = os.path.join(self.tmp.name, "out_pool")
+        run(self.nemex, [self.inputs], out_dir_pool, processes=2, shard_size=500)
+
+        self.assertEqual(self.read_outputs(out_dir_pool), outputs)
+        return
+
+    def test_resume(self):
+        out_dir = os.path.join(self.tmp.name, "out")
+        manifest = run(self.nemex, [self.inputs], out_dir, processes=0, shard_size=500)
+
+        # a job killed before completing the last shard
+        last = str(len(manifest["shards"]) - 1)
+        del manifest["completed"][last]
+
+        with open(os.path.join(out_dir, "manifest.json"), "w") as wf:
+            json.dump(manifest, wf)
+
+        mtimes = {name: os.stat(os.path.join(out_dir, "shards", name)).st_mtime_ns
+                  for name in os.listdir(os.path.join(out_dir, "shards"))}
+        os.remove(os.path.join(out_dir, "shards", "{:06d}.jsonl".format(int(last))))
+
+        manifest = run(self.nemex, [self.inputs], out_dir, processes=0, shard_size=500)
+
+        self.assertIn(last, manifest["completed"])
+        for name, mtime in mtimes.items():
+            if name != "{:06d}.jsonl".format(int(last)):
+                self.assertEqual(os.stat(os.path.join(out_dir, "shards", name)).st_mtime_ns, mtime)
+
+        self.assertEqual(len(self.read_outputs(out_dir)), 2 * len(self.documents))
+
+        # other shards in the same directory
+        with self.assertRaises(ValueError):
+            run(self.nemex, [self.inputs], out_dir, processes=0, shard_size=100)
+        return
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+
+from nemex import Nemex, SegmentIndex
+
+
+class TestSegmentIndex(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.document = "Lorem ipsum dolo sit amet, consetetur sadipscing elitr."
+        self.entities = ["dolor", "ipsum", "amet consetetur", "sadipscing", "elitr"]
+        return None
+
+    @staticmethod
+    def get_matches(output):
+        return sorted((m["entity"][1], m["span"][0], m["span"][1], m["score"]) for m in output["matches"])
+
+    def test_segments(self):
+        self.assertEqual(SegmentIndex.segments("consetetur", 3), [(0, "con"), (3, "set"), (6, "etur")])
+        self.assertEqual(SegmentIndex.segments("ab", 2), [(0, "a"), (1, "b")])
+        return
+
+    def test_same_matches(self):
+        for t in (1, 2):
+            expected = set(self.get_matches(Nemex(self.entities, t=t, pruner="lazy_count")(self.document)))
+            computed = self.get_matches(Nemex(self.entities, t=t, engine="segment")(self.document))
+
+            self.assertEqual(sorted(expected), computed)
+        return
+
+    def test_similarity(self):
+        with self.assertRaises(ValueError):
+            Nemex(self.entities, similarity="edit_sim", t=0.8, engine="segment")
+        return
+
+    def tearDown(self) -> None:
+        return None
+
+
+if __name__ == '__main__':
+    unittest.main()
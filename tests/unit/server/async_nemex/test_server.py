@@ -0,0 +1,110 @@
+import json
+import asyncio
+import unittest
+
+from nemex import Nemex
+from nemex.server import AsyncNemex, serve
+
+
+class TestAsyncNemex(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.documents = [
+            "an efficient filter for approximate membership checking. venkaee shga kamunshik kabarati",
+            "dong xin, surauijt chadhurisigmod.",
+            "an efficient filter for approximate membership checking. venkaee shga kamunshik kabarati",
+        ]
+        self.nemex = Nemex(["kaushik ch", "chakrabarti", "chaudhuri", "venkatesh", "surajit ch"])
+        return None
+
+    def test_aextract(self):
+        async def run(async_nemex):
+            async with async_nemex:
+                return await asyncio.gather(*(async_nemex.aextract(document) for document in self.documents))
+
+        expected = [self.nemex(document) for document in self.documents]
+
+        self.assertEqual(asyncio.run(run(AsyncNemex(self.nemex))), expected)
+        self.assertEqual(asyncio.run(run(AsyncNemex(self.nemex, processes=2))), expected)
+        return
+
+    def test_backpressure(self):
+        async def run():
+            async with AsyncNemex(self.nemex, max_queue=2) as async_nemex:
+                results = await asyncio.gather(
+                    *(async_nemex.aextract(self.documents[0]) for _ in range(10)), return_exceptions=True
+                )
+            return results
+
+        results = asyncio.run(run())
+
+        self.assertTrue(any(isinstance(result, asyncio.QueueFull) for result in results))
+        self.assertTrue(any(isinstance(result, dict) for result in results))
+        return
+
+    def test_failing_request(self):
+        async def run():
+            async with AsyncNemex(self.nemex, batch_window=0.1) as async_nemex:
+                return await asyncio.gather(
+                    async_nemex.aextract(self.documents[0], {}), async_nemex.aextract(self.documents[1]),
+                    return_exceptions=True
+                )
+
+        results = asyncio.run(run())
+
+        # the unhashable request fails alone
+        self.assertIsInstance(results[0], TypeError)
+        self.assertEqual(results[1], self.nemex(self.documents[1]))
+        return
+
+    def test_close_in_batch_window(self):
+        async def run():
+            async_nemex = AsyncNemex(self.nemex, batch_window=10)
+            await async_nemex.start()
+
+            task = asyncio.ensure_future(async_nemex.aextract(self.documents[0]))
+            await asyncio.sleep(0.05)
+
+            await async_nemex.close()
+            await asyncio.wait([task], timeout=1)
+
+            # (asyncio.run cancels pending tasks on exit)
+            return task.done(), task.done() and task.cancelled()
+
+        self.assertEqual(asyncio.run(run()), (True, True))
+        return
+
+    def test_http(self):
+        async def request(port, method, target, body=b""):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write("{} {} HTTP/1.1\r\nContent-Length: {}\r\nConnection: close\r\n\r\n".format(
+                method, target, len(body)).encode() + body)
+            response = await reader.read()
+            writer.close()
+
+            head, payload = response.split(b"\r\n\r\n", 1)
+            return int(head.split()[1]), json.loads(payload)
+
+        async def run():
+            async with AsyncNemex(self.nemex) as async_nemex:
+                server = await serve(async_nemex, port=0)
+                port = server.sockets[0].getsockname()[1]
+
+                async with server:
+                    return [
+                        await request(port, "POST", "/extract", json.dumps({"document": self.documents[1]}).encode()),
+                        await request(port, "POST", "/extract", b"{}"),
+                        await request(port, "POST", "/extract", b'{"document": "x", "valid_only": {}}'),
+                        await request(port, "POST", "/extract", b"[]"),
+                        await request(port, "GET", "/health"),
+                        await request(port, "GET", "/other"),
+                    ]
+
+        responses = asyncio.run(run())
+
+        self.assertEqual(responses[0], (200, json.loads(json.dumps(self.nemex(self.documents[1])))))
+        self.assertEqual([status for status, _ in responses[1:]], [400, 400, 400, 200, 404])
+        return
+
+    def tearDown(self) -> None:
+        return None
@@ -0,0 +1,55 @@
+import os
+import unittest
+
+from nemex import Nemex, ShardedFaerie, EntitiesDictionary, Default
+
+
+class TestShardedFaerie(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.document = "Lorem ipsum dolo sit amet, consetetur sadipscing elitr."
+        self.entities = ["dolor", "ipsum", "amet consetetur", "sadipscing", "elitr"]
+        return None
+
+    @staticmethod
+    def get_matches(output):
+        return [(m["entity"][1], m["span"][0], m["span"][1], m["score"]) for m in output["matches"]]
+
+    def test_shard_ids(self):
+        edict = EntitiesDictionary.from_list(self.entities, Default.TOKENIZER)
+        shards = edict.shard(2)
+
+        self.assertEqual([list(shard) for shard in shards], [[0, 1, 2], [3, 4]])
+        self.assertEqual(shards[1].get_item_by_uid(4).entity, "elitr")
+        return
+
+    def test_same_matches(self):
+        expected = self.get_matches(Nemex(self.entities, t=1)(self.document))
+        computed = self.get_matches(Nemex(self.entities, t=1, shards=3)(self.document))
+
+        self.assertEqual(expected, computed)
+        return
+
+    def test_processes(self):
+        expected = self.get_matches(Nemex(self.entities, t=1)(self.document))
+
+        nemex = Nemex(self.entities, t=1, shards=2, shard_processes=True)
+        self.assertIsInstance(nemex.faerie, ShardedFaerie)
+
+        computed = self.get_matches(nemex(self.document))
+        directory = nemex.faerie.directory
+        self.assertTrue(os.path.isdir(directory))
+
+        nemex.close()
+        self.assertFalse(nemex.faerie.workers)
+        self.assertFalse(os.path.exists(directory))
+
+        self.assertEqual(expected, computed)
+        return
+
+    def tearDown(self) -> None:
+        return None
+
+
+if __name__ == '__main__':
+    unittest.main()
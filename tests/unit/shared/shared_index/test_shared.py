@@ -0,0 +1,70 @@
+import unittest
+import multiprocessing
+
+from multiprocessing import shared_memory
+
+from nemex import Nemex
+from nemex.shared import SharedIndex, init_worker, extract
+
+
+class TestSharedIndex(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.documents = [
+            "an efficient filter for approximate membership checking. venkaee shga kamunshik kabarati",
+            "dong xin, surauijt chadhurisigmod.",
+        ]
+        self.entities = ["kaushik ch", "chakrabarti", "chaudhuri", "venkatesh", "surajit ch"]
+        return None
+
+    def test_outputs(self):
+        models = [
+            Nemex(self.entities),
+            Nemex(self.entities, similarity="edit_sim", t=0.6, prefix_filter=True),
+            Nemex(self.entities, char=False, q=1, similarity="jaccard", t=0.5, pruner="lazy_count"),
+        ]
+
+        for nemex in models:
+            index, model = SharedIndex.from_nemex(nemex)
+            shared_nemex = index.nemex(model)
+
+            for document in self.documents:
+                self.assertEqual(shared_nemex(document), nemex(document))
+
+            del shared_nemex
+            index.close()
+        return
+
+    def test_token_id(self):
+        nemex = Nemex(self.entities)
+        index, model = SharedIndex.from_nemex(nemex)
+
+        for token, inv_list in nemex.faerie.inv_index.token2entities.items():
+            token_id = index.token_id(token)
+            self.assertEqual(index.postings[index.list_offsets[token_id]:index.list_offsets[token_id+1]].tolist(), inv_list)
+
+        self.assertEqual(index.token_id("xyz"), -1)
+        self.assertEqual(sorted(index.nemex(model).E), sorted(nemex.E))
+
+        index.close()
+        return
+
+    def test_workers(self):
+        nemex = Nemex(self.entities)
+        index, model = SharedIndex.from_nemex(nemex)
+
+        with multiprocessing.get_context("spawn").Pool(2, initializer=init_worker, initargs=(index.handle, model)) as pool:
+            outputs = pool.map(extract, self.documents)
+
+        self.assertEqual(outputs, [nemex(document) for document in self.documents])
+
+        name = index.shm.name
+        index.close()
+
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+        return
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import json
+import random
+import unittest
+
+from nemex import Nemex, NemexStream
+
+
+class TestNemexStream(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.entities = ["kaushik ch", "chakrabarti", "chaudhuri", "venkatesh", "surajit ch", "xin", "dong xin"]
+        self.parts = [
+            "an efficient filter for approximate membership checking. venkaee shga kamunshik kabarati, ",
+            "dong xin, surauijt chadhurisigmod. ", "Dong  Xin ", "chaudhuri", "surajitch ",
+        ]
+        return None
+
+    def stream(self, stream: NemexStream, document: str, rng: random.Random) -> list:
+        matches = list()
+        k = 0
+
+        while k < len(document):
+            step = rng.randint(1, 15)
+            matches += stream.append(document[k:k+step])
+            k += step
+
+        return matches + stream.flush()
+
+    def test_batch_parity(self):
+        models = [
+            Nemex(self.entities, pruner="lazy_count"),
+            Nemex(self.entities, similarity="edit_sim", t=0.7, pruner="lazy_count"),
+            Nemex(self.entities, exact_first=True, pruner="lazy_count"),
+            Nemex(self.entities, t=0),
+            Nemex(self.entities, char=False, q=1, similarity="jaccard", t=0.4, pruner="lazy_count"),
+        ]
+        rng = random.Random(5)
+
+        def key(match):
+            return json.dumps(match, sort_keys=True)
+
+        for nemex in models:
+            stream = NemexStream(nemex)
+
+            for _ in range(5):
+                document = "".join(rng.choice(self.parts) for _ in range(rng.randint(2, 6)))
+
+                expected = sorted(map(key, nemex(document)["matches"]))
+                self.assertEqual(sorted(map(key, self.stream(stream, document, rng))), expected)
+        return
+
+    def test_bounded_state(self):
+        stream = NemexStream(Nemex(self.entities))
+        n_matches = 0
+
+        for _ in range(100):
+            matches = stream.append(self.parts[1])
+            n_matches += len(matches)
+
+            for match in matches:
+                self.assertEqual(match["match"], "".join(self.parts[1] * 100)[match["span"][0]:match["span"][1]])
+
+        self.assertGreater(n_matches, 0)
+        self.assertLessEqual(len(stream.tokens), stream.window + len(self.parts[1]))
+        self.assertEqual(len(stream), len("".join(self.parts[1] * 100)) - 1)
+        return
+
+    def test_engine(self):
+        with self.assertRaises(ValueError):
+            NemexStream(Nemex(self.entities, t=1, engine="segment"))
+        return
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import unittest
+
+from nemex import Nemex, TrieIndex, EntitiesDictionary, Default
+
+
+class TestTrieIndex(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.document = "Lorem ipsum dolo sit amet, consetetur sadipscing elitr."
+        self.entities = ["dolor", "ipsum", "amet consetetur", "sadipscing", "elitr"]
+        return None
+
+    @staticmethod
+    def get_matches(output):
+        return sorted((m["entity"][1], m["span"][0], m["span"][1], m["score"]) for m in output["matches"])
+
+    def test_match_at(self):
+        edict = EntitiesDictionary.from_list(["dolor", "dolores", "sit"], Default.TOKENIZER)
+        trie = TrieIndex(edict, t=1)
+
+        self.assertEqual(sorted(trie.match_at("dolo_sit", 0)), [(0, 4), (0, 5)])
+        self.assertEqual(sorted(trie.match_at("dolo_sit", 5)), [(2, 2), (2, 3)])
+        return
+
+    def test_same_matches(self):
+        for t in (1, 2):
+            expected = self.get_matches(Nemex(self.entities, t=t, engine="segment")(self.document))
+            computed = self.get_matches(Nemex(self.entities, t=t, engine="trie")(self.document))
+
+            self.assertEqual(expected, computed)
+        return
+
+    def tearDown(self) -> None:
+        return None
+
+
+if __name__ == '__main__':
+    unittest.main()
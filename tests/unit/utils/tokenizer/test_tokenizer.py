@@ -49,6 +49,40 @@ class TestTokenizer(unittest.TestCase):
         tokens = self.tokenizer.tokenize(self.doc)
         self.assertEqual(tokens, ["lorem", "orem_", "rem_i", "em_ip", "m_ips", "_ipsu", "ipsum", "psum."])
 
+    def test_tokenize_offsets(self):
+        doc = "  Lorem\tİpsum  dolor."
+
+        for char, q in ((True, 2), (True, 3), (False, 1)):
+            self.tokenizer.char, self.tokenizer.q = char, q
+            tokens, starts, ends = self.tokenizer.tokenize_offsets(self.doc)
+
+            self.assertEqual(tokens, self.tokenizer.tokenize(self.doc))
+            self.assertEqual([self.tokenizer.tokenize(self.doc[i:j]) for i, j in zip(starts, ends)],
+                             [[token] for token in tokens])
+
+            # lower casing 'İ' gives two characters
+            tokens, starts, ends = self.tokenizer.tokenize_offsets(doc)
+
+            self.assertEqual(tokens, self.tokenizer.tokenize(doc))
+            self.assertEqual((len(starts), len(ends)), (len(tokens), len(tokens)))
+
+        self.assertEqual([doc[i:j] for i, j in zip(starts, ends)], ["Lorem", "İpsum", "dolor."])
+
+    def test_folding(self):
+        doc = "Ångström  naïve\tcafe\u0301 Ok"
+        self.tokenizer.strip_accents, self.tokenizer.collapse_whitespace = True, True
+
+        self.assertEqual(self.tokenizer.normalize(doc), "angstrom_naive_cafe_ok")
+
+        for char in (True, False):
+            self.tokenizer.char = char
+            tokens, starts, ends = self.tokenizer.tokenize_offsets(doc)
+
+            self.assertEqual(tokens, self.tokenizer.tokenize(doc))
+            self.assertEqual([self.tokenizer.normalize(doc[i:j]) for i, j in zip(starts, ends)], tokens)
+
+        self.assertEqual([doc[i:j] for i, j in zip(starts, ends)], ["Ångström", "naïve", "cafe\u0301", "Ok"])
+
     def tearDown(self) -> None:
         return None
 